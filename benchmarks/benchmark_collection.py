@@ -0,0 +1,276 @@
+"""
+Benchmarks AstronomyDataset collection end to end against a local stand-in for the cutout servers.
+
+For each dataset type and target count, writes a synthetic target list, then collects it into a manifest with the
+dataset type while the cutout stand-in serves its queries. Reports the targets collected per second, the requests of
+each stage (MJD metadata, brightness clipping, WiseView frames, and Legacy Survey cutouts) with the time the stand-in
+spent serving them and the time the collection processes spent waiting for them, the peak resident memory of the
+benchmark and of the collection processes, and the functions with the highest cumulative time.
+
+The collection runs in forked processes (the collection process, its query and data processes, and the query pool),
+so each of them is profiled on its own and their profiles are merged with the profile of the benchmark process.
+
+Usage:
+    python benchmarks/benchmark_collection.py [target_count ...] [--datasets name ...] [--latency seconds]
+                                              [--jitter seconds] [--fixed-brightness] [--profile-output filename]
+
+By default, the target counts are 1000, 10000, and 100000, every dataset type is benchmarked, and the stand-in
+delays each request by 50 +/- 20 ms.
+
+The collection processes are forked, so that they inherit the stand-in queries, which limits the benchmark to
+platforms whose default start method is fork, such as Linux.
+"""
+
+import argparse
+import contextlib
+import cProfile
+import functools
+import glob
+import io
+import json
+import multiprocessing
+import multiprocessing.util
+import os
+import pstats
+import resource
+import sys
+import tempfile
+import time
+
+repository_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repository_directory)
+sys.path.insert(0, os.path.join(repository_directory, "unWISE_verse"))
+
+import cutout_stand_in
+from cutout_stand_in import CutoutStandIn, installStandInQueries, generateTargetList
+
+dataset_names = ["CoolNeighbors", "Exoasteroids", "LegacySurvey"]
+
+# The methods of AstronomyDataset which run as, or in, the collection processes.
+profiled_methods = ["collectDataFromTargetList", "requestQueries", "requestQuery", "generateDataList", "periodicSaving"]
+
+
+class ProcessProfiler:
+    def __init__(self, directory):
+        """
+        Profiles the benchmark process and the collection processes forked from it.
+
+        Parameters
+        ----------
+            directory : str
+                The directory the profile and client-side request statistics of each collection process are written
+                to when it exits.
+
+        Notes
+        -----
+        A forked process inherits the enabled profiler of its parent, so the first profiled call in each process
+        replaces it with a profiler of its own, which is written out by a multiprocessing finalizer when the process
+        exits. The client-side request statistics of cutout_stand_in are reset and written out the same way.
+        """
+
+        self.directory = directory
+        self.pid = os.getpid()
+        self.profile = cProfile.Profile()
+        self.depth = 0
+
+    def enable(self):
+        if(self.pid != os.getpid()):
+            self.profile.disable()
+            self.pid = os.getpid()
+            self.profile = cProfile.Profile()
+            self.depth = 0
+            cutout_stand_in.resetClientRequestStatistics()
+            multiprocessing.util.Finalize(None, self.dump, exitpriority=100)
+
+        if(self.depth == 0):
+            self.profile.enable()
+        self.depth += 1
+
+    def disable(self):
+        self.depth -= 1
+        if(self.depth == 0):
+            self.profile.disable()
+
+    def dump(self):
+        """
+        Writes the profile and client-side request statistics of this process to the directory.
+        """
+
+        self.profile.disable()
+        self.profile.dump_stats(os.path.join(self.directory, f"{self.pid}.prof"))
+        with open(os.path.join(self.directory, f"{self.pid}.json"), "w") as statistics_file:
+            json.dump(cutout_stand_in.getClientRequestStatistics(), statistics_file)
+
+    def wrap(self, function):
+        """
+        Returns a function which calls the given function with this process profiled.
+        """
+
+        @functools.wraps(function)
+        def run(*args, **kwargs):
+            self.enable()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.disable()
+        return run
+
+    @contextlib.contextmanager
+    def profileMethods(self, cls, names):
+        """
+        Profiles the methods of a class, which the forked processes inherit, until the context exits.
+        """
+
+        original_methods = {name: cls.__dict__[name] for name in names if name in cls.__dict__}
+        for name in names:
+            setattr(cls, name, self.wrap(getattr(cls, name)))
+        try:
+            yield
+        finally:
+            for name in names:
+                if(name in original_methods):
+                    setattr(cls, name, original_methods[name])
+                else:
+                    delattr(cls, name)
+
+    def getStatistics(self, stream):
+        """
+        Returns the profile of this process merged with the profiles the collection processes wrote.
+        """
+
+        statistics = pstats.Stats(self.profile, stream=stream)
+        for filename in sorted(glob.glob(os.path.join(self.directory, "*.prof"))):
+            statistics.add(filename)
+        return statistics
+
+    def getClientRequestStatistics(self):
+        """
+        Returns the client-side request statistics of every process, summed by endpoint.
+
+        Returns
+        -------
+            dict
+                A dictionary of the form {endpoint: (request_count, total_seconds)}.
+        """
+
+        request_statistics = dict(cutout_stand_in.getClientRequestStatistics())
+        for filename in glob.glob(os.path.join(self.directory, "*.json")):
+            with open(filename, "r") as statistics_file:
+                for endpoint, (request_count, total_time) in json.load(statistics_file).items():
+                    previous_count, previous_time = request_statistics.get(endpoint, (0, 0.0))
+                    request_statistics[endpoint] = (previous_count + request_count, previous_time + total_time)
+        return request_statistics
+
+
+def getPeakMemory(who):
+    """
+    Returns the peak resident memory, in megabytes, of the benchmark process or of its largest finished child process.
+
+    Parameters
+    ----------
+        who : int
+            resource.RUSAGE_SELF or resource.RUSAGE_CHILDREN.
+
+    Returns
+    -------
+        float
+            The peak resident memory in megabytes.
+    """
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    peak_memory = resource.getrusage(who).ru_maxrss
+    if(sys.platform == "darwin"):
+        return peak_memory / 1024 ** 2
+    return peak_memory / 1024
+
+def runBenchmark(dataset_name, target_count, stand_in, arguments):
+    """
+    Collects a synthetic target list with a dataset type and prints its throughput, stage times, and peak memory.
+
+    Parameters
+    ----------
+        dataset_name : str
+            The name of the dataset type, one of dataset_names.
+        target_count : int
+            The number of targets.
+        stand_in : CutoutStandIn
+            The cutout stand-in, whose request statistics are reset before the collection.
+        arguments : argparse.Namespace
+            The command line arguments of the benchmark.
+    """
+
+    from unWISE_verse import Dataset
+
+    dataset_type = getattr(Dataset, f"{dataset_name}Dataset")
+
+    # The save state of the collection is written to the working directory, so every run gets its own.
+    working_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            target_filename = os.path.join(directory, "targets.csv")
+            manifest_filename = os.path.join(directory, "manifest.csv")
+            generateTargetList(target_filename, target_count, dataset_type, os.path.join(directory, "pngs"), fixed_brightness=arguments.fixed_brightness)
+
+            profile_directory = os.path.join(directory, "profiles")
+            os.makedirs(profile_directory)
+            profiler = ProcessProfiler(profile_directory)
+
+            stand_in.resetRequestStatistics()
+            cutout_stand_in.resetClientRequestStatistics()
+            start_time = time.perf_counter()
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), profiler.profileMethods(dataset_type, profiled_methods):
+                profiler.enable()
+                dataset_type(target_filename, manifest_filename, termination_event=multiprocessing.Event())
+                profiler.disable()
+            elapsed_time = time.perf_counter() - start_time
+
+            with open(manifest_filename, "r") as manifest_file:
+                row_count = max(0, sum(1 for _ in manifest_file) - 1)
+
+            statistics_stream = io.StringIO()
+            statistics = profiler.getStatistics(statistics_stream).sort_stats(pstats.SortKey.CUMULATIVE)
+            client_statistics = profiler.getClientRequestStatistics()
+        finally:
+            os.chdir(working_directory)
+
+    print(f"--- {dataset_name}, {target_count} targets ---")
+    print(f"Collection: {row_count} rows in {elapsed_time:.2f} s ({row_count / elapsed_time:,.1f} rows/s)")
+    for endpoint, (request_count, total_time) in sorted(stand_in.getRequestStatistics().items()):
+        client_count, client_time = client_statistics.get(endpoint, (0, 0.0))
+        print(f"  {endpoint}: {request_count} requests, {total_time:.2f} s served, {client_time:.2f} s waited by the "
+              f"client over {client_count} requests, {request_count / max(row_count, 1):.2f} requests/row")
+    print(f"Peak memory: {getPeakMemory(resource.RUSAGE_SELF):.1f} MB (benchmark), {getPeakMemory(resource.RUSAGE_CHILDREN):.1f} MB (largest collection process)")
+
+    # The cumulative times are summed over the processes, which run concurrently.
+    statistics.print_stats(15)
+    print(statistics_stream.getvalue())
+
+    if(arguments.profile_output is not None):
+        statistics.dump_stats(f"{arguments.profile_output}_{dataset_name}_{target_count}.prof")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks AstronomyDataset collection against a local cutout stand-in.")
+    parser.add_argument("target_counts", type=int, nargs="*", default=[1000, 10000, 100000])
+    parser.add_argument("--datasets", nargs="+", choices=dataset_names, default=dataset_names)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--fixed-brightness", action="store_true", help="Give the brightness limits in the target lists, skipping brightness clipping.")
+    parser.add_argument("--profile-output", default=None, help="The prefix of the pstats files the profiles are saved to.")
+    arguments = parser.parse_args()
+
+    if(multiprocessing.get_start_method() != "fork"):
+        raise RuntimeError("The collection processes must be forked to inherit the cutout stand-in queries.")
+
+    stand_in = CutoutStandIn(latency=arguments.latency, jitter=arguments.jitter)
+    installStandInQueries(stand_in.start())
+
+    try:
+        for dataset_name in arguments.datasets:
+            for target_count in arguments.target_counts:
+                runBenchmark(dataset_name, target_count, stand_in, arguments)
+    finally:
+        stand_in.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmarks the write and load throughput of CSV manifests against binary manifests.
+
+Writes the same data list with ZooniverseDataset.generateManifest as a CSV manifest and as a binary manifest (a NumPy
+structured array with a typed schema), then loads each one with ZooniverseDataset.iterateManifest.
+
+Usage:
+    python benchmarks/benchmark_manifests.py [row_count]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+repository_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repository_directory)
+sys.path.insert(0, os.path.join(repository_directory, "unWISE_verse"))
+
+# Dataset.py imports Data as a top-level module, so the benchmark's Data objects must come from the same module.
+from Data import Data
+from unWISE_verse.Dataset import ZooniverseDataset, BinaryManifest
+
+
+def generateData(index):
+    """
+    Generates a Data object shaped like a row of a Cool Neighbors manifest.
+
+    Parameters
+    ----------
+        index : int
+            The index of the row.
+
+    Returns
+    -------
+        Data
+            The generated Data object.
+    """
+
+    data = {f"f{i + 1}": f"pngs/Chunk_0/00/unWISE_{index}_{i}.png" for i in range(4)}
+    metadata = {"TARGET ID": index, "RA": 120.0 + index * 1e-4, "DEC": -30.0 + index * 1e-4, "#SCALE": 22,
+                "#ADDGRID": True, "#GRIDTYPE": "Solid", "Galactic Coordinates": "250.1 -0.2",
+                "SIMBAD": f"[SIMBAD](+tab+https://simbad.u-strasbg.fr/simbad/sim-coo?Coord={index})"}
+    return Data(data, metadata)
+
+def timeFunction(label, row_count, function):
+    """
+    Times a function and prints its throughput.
+
+    Parameters
+    ----------
+        label : str
+            The label of the benchmark.
+        row_count : int
+            The number of rows processed by the function.
+        function : function
+            The function to time.
+    """
+
+    start_time = time.perf_counter()
+    function()
+    elapsed_time = time.perf_counter() - start_time
+    print(f"{label}: {row_count} rows in {elapsed_time:.2f} s ({row_count / elapsed_time:,.0f} rows/s)")
+
+def main(row_count=100000):
+    data_list = [generateData(i) for i in range(row_count)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_filename = os.path.join(directory, "manifest.csv")
+        binary_filename = os.path.join(directory, "manifest" + BinaryManifest.file_extension)
+
+        def writeCSVManifest():
+            ZooniverseDataset.generateManifest(csv_filename, data_list)
+
+        def writeBothManifests():
+            ZooniverseDataset.generateManifest(csv_filename, data_list, binary=True)
+
+        def loadManifest(filename):
+            for data in ZooniverseDataset.iterateManifest(filename):
+                pass
+
+        timeFunction("Write CSV manifest", row_count, writeCSVManifest)
+        timeFunction("Write CSV and binary manifests", row_count, writeBothManifests)
+        timeFunction("Load CSV manifest", row_count, lambda: loadManifest(csv_filename))
+        timeFunction("Load binary manifest", row_count, lambda: loadManifest(binary_filename))
+
+        start_time = time.perf_counter()
+        lazy_dataset = ZooniverseDataset(binary_filename, lazy=True)
+        lazy_dataset[row_count // 2]
+        print(f"Open binary manifest lazily and read one row: {(time.perf_counter() - start_time) * 1e3:.1f} ms")
+        lazy_dataset.close()
+
+        print(f"CSV manifest size: {os.path.getsize(csv_filename) / 1e6:.1f} MB")
+        print(f"Binary manifest size: {os.path.getsize(binary_filename) / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,93 @@
+"""
+Benchmarks the decoding throughput of manifest records.
+
+Compares the legacy per-field record strings (parsed by Data.createFromRecord) against the typed record format of
+RecordSchema, where each column's type is written once in the header.
+
+Usage:
+    python benchmarks/benchmark_records.py [row_count]
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unWISE_verse.Data import Data, RecordSchema
+
+
+def generateData(index):
+    """
+    Generates a Data object shaped like a row of a Cool Neighbors manifest.
+
+    Parameters
+    ----------
+        index : int
+            The index of the row.
+
+    Returns
+    -------
+        Data
+            The generated Data object.
+    """
+
+    data = {f"f{i + 1}": f"pngs/Chunk_0/00/unWISE_{index}_{i}.png" for i in range(4)}
+    metadata = {"TARGET ID": index, "RA": 120.0 + index * 1e-4, "DEC": -30.0 + index * 1e-4, "#SCALE": 22,
+                "#ADDGRID": True, "#GRIDCOLOR": (128, 0, 0), "#GRIDTYPE": "Solid", "Galactic Coordinates": "250.1 -0.2",
+                "SIMBAD": f"[SIMBAD](+tab+https://simbad.u-strasbg.fr/simbad/sim-coo?Coord={index})"}
+    return Data(data, metadata)
+
+def timeDecoding(label, row_count, function):
+    """
+    Times a decoding function and prints its throughput.
+
+    Parameters
+    ----------
+        label : str
+            The label of the benchmark.
+        row_count : int
+            The number of rows decoded by the function.
+        function : function
+            The function which decodes all the rows.
+    """
+
+    start_time = time.perf_counter()
+    function()
+    elapsed_time = time.perf_counter() - start_time
+    print(f"{label}: {row_count} rows in {elapsed_time:.2f} s ({row_count / elapsed_time:,.0f} rows/s)")
+
+def main(row_count=100000):
+    data_list = [generateData(i) for i in range(row_count)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        legacy_filename = os.path.join(directory, "legacy_records.csv")
+        typed_filename = os.path.join(directory, "typed_records.csv")
+
+        records = [data.convertToRecord() for data in data_list]
+        with open(legacy_filename, "w", newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=list(records[0].keys()))
+            writer.writeheader()
+            writer.writerows(records)
+
+        RecordSchema.writeRecords(typed_filename, data_list)
+
+        def decodeLegacyRecords():
+            with open(legacy_filename, "r", newline='') as file:
+                for row in csv.DictReader(file):
+                    Data.createFromRecord(row)
+
+        def decodeTypedRecords():
+            for data in RecordSchema.readRecords(typed_filename):
+                pass
+
+        timeDecoding("Legacy records (Data.createFromRecord)", row_count, decodeLegacyRecords)
+        timeDecoding("Typed records (RecordSchema.readRecords)", row_count, decodeTypedRecords)
+
+        print(f"Legacy record file size: {os.path.getsize(legacy_filename) / 1e6:.1f} MB")
+        print(f"Typed record file size: {os.path.getsize(typed_filename) / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
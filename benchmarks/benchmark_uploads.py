@@ -0,0 +1,189 @@
+"""
+Benchmarks the Spout upload paths against a local stand-in for the Panoptes API.
+
+For each subject count, writes a manifest, then times Spout.generateSubjects, Spout.updateSubjects (creating the
+subjects and stamping their IDs), Spout.uploadSubjects (linking them to a subject set), Spout.editSubjectMetadata
+(renaming a metadata field), and Spout.streamManifest (creating and linking the subjects of the manifest again, in
+one overlapped pass). The outcome of each stage is checked against the stand-in, and the benchmark stops at the first
+stage which failed, so that throughput is only reported for stages which did their work. Reports subjects per second,
+API calls per subject, and API calls without a login for each stage.
+
+Usage:
+    python benchmarks/benchmark_uploads.py [subject_count ...] [--latency seconds] [--error-rate rate] [--throttle-rate rate]
+
+By default, the subject counts are 1000, 10000, and 100000 and the stand-in has no latency, errors, or throttling.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+repository_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repository_directory)
+sys.path.insert(0, os.path.join(repository_directory, "unWISE_verse"))
+
+from panoptes_stand_in import PanoptesStandIn
+
+# A 1x1 PNG, which every subject of the benchmark uses as its image.
+png_bytes = bytes.fromhex("89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+                          "1f15c4890000000d49444154789c6360000002000001e221bc330000000049454e44ae426082")
+
+
+def writeManifest(manifest_filename, png_filename, subject_count):
+    """
+    Writes a manifest of subjects shaped like the subjects of a Cool Neighbors manifest.
+
+    Parameters
+    ----------
+        manifest_filename : str
+            The filename of the manifest.
+        png_filename : str
+            The filename of the image of every subject.
+        subject_count : int
+            The number of subjects.
+    """
+
+    # Dataset.py imports Data as a top-level module, so the benchmark's Data objects must come from the same module.
+    from Data import Data
+    from Dataset import ZooniverseDataset
+
+    data_list = [Data({"f1": png_filename}, {"TARGET ID": index, "RA": 120.0 + index * 1e-4, "DEC": -30.0 + index * 1e-4, "#SCALE": 22})
+                 for index in range(subject_count)]
+    ZooniverseDataset.generateManifest(manifest_filename, data_list)
+
+def timeStage(label, subject_count, stand_in, function, check):
+    """
+    Times a stage of the upload, checks its outcome, and prints its throughput and API calls.
+
+    Parameters
+    ----------
+        label : str
+            The label of the stage.
+        subject_count : int
+            The number of subjects processed by the stage.
+        stand_in : PanoptesStandIn
+            The stand-in, whose request counters are reset before the stage.
+        function : function
+            The function to time.
+        check : function
+            A function which takes in the return value of the function and returns a description of how the stage
+            failed, or None if it succeeded.
+
+    Returns
+    -------
+        object
+            The return value of the function.
+    """
+
+    stand_in.resetRequestCounts()
+    start_time = time.perf_counter()
+    result = function()
+    elapsed_time = time.perf_counter() - start_time
+
+    failure = check(result)
+    if(failure is not None):
+        raise RuntimeError(f"{label} failed: {failure}")
+
+    api_calls = stand_in.getAPIRequestCount()
+    media_uploads = stand_in.getMediaUploadCount()
+    unauthenticated_calls = stand_in.getUnauthenticatedRequestCount()
+    print(f"{label}: {subject_count} subjects in {elapsed_time:.2f} s ({subject_count / elapsed_time:,.1f} subjects/s), "
+          f"{api_calls / subject_count:.2f} API calls/subject, {media_uploads / subject_count:.2f} media uploads/subject, "
+          f"{unauthenticated_calls} API calls without a login")
+    return result
+
+def checkLinkedSubjects(stand_in, subject_set_id, subject_count):
+    """
+    Returns a description of how the subject set's links differ from subject_count linked subjects, or None if they don't.
+    """
+
+    linked_ids = stand_in.resources["subject_sets"][subject_set_id]["links"]["subjects"]
+    if(len(linked_ids) != subject_count or len(set(linked_ids)) != subject_count):
+        return f"the subject set has {len(linked_ids)} links to {len(set(linked_ids))} subjects, instead of {subject_count} subjects"
+    return None
+
+def runBenchmark(subject_count, stand_in, directory):
+    """
+    Runs every stage of the benchmark for a number of subjects.
+    """
+
+    from unWISE_verse.Login import Login
+    from unWISE_verse.Spout import Spout
+
+    project = stand_in.createProject()
+    subject_set = stand_in.createSubjectSet(project["id"])
+    streamed_subject_set = stand_in.createSubjectSet(project["id"], display_name="Benchmark Streamed Subject Set")
+
+    png_filename = os.path.join(directory, "subject.png")
+    with open(png_filename, "wb") as png_file:
+        png_file.write(png_bytes)
+
+    manifest_filename = os.path.join(directory, f"manifest_{subject_count}.csv")
+    writeManifest(manifest_filename, png_filename, subject_count)
+
+    spout = Spout(login=Login("benchmark", "benchmark"), display_printouts=False)
+    zooniverse_project = spout.findProject(project["id"])
+
+    print(f"--- {subject_count} subjects ---")
+    def checkGenerated(subjects):
+        if(len(subjects) != subject_count):
+            return f"{len(subjects)} subjects were generated"
+        return None
+
+    def checkCreated(succeeded):
+        created_count = sum(subject.id is not None for subject in subjects)
+        if(not succeeded or created_count != subject_count):
+            return f"{created_count} subjects were created"
+        return None
+
+    def checkUploaded(succeeded):
+        if(not succeeded):
+            return "Spout.uploadSubjects returned False"
+        return checkLinkedSubjects(stand_in, subject_set["id"], subject_count)
+
+    def checkEdited(report):
+        modified_count = sum(row["status"] == "modified" for row in report)
+        renamed_count = sum("#ZOOM" in stand_in.resources["subjects"][subject.id]["metadata"] for subject in subjects)
+        if(modified_count != subject_count or renamed_count != subject_count):
+            return f"{modified_count} subjects were reported modified and {renamed_count} subjects were renamed"
+        return None
+
+    def checkStreamed(succeeded):
+        if(not succeeded):
+            return "Spout.streamManifest returned False"
+        return checkLinkedSubjects(stand_in, streamed_subject_set["id"], subject_count)
+
+    subjects = timeStage("generateSubjects", subject_count, stand_in, lambda: spout.generateSubjects(manifest_filename), checkGenerated)
+    timeStage("updateSubjects", subject_count, stand_in, lambda: spout.updateSubjects(subjects, zooniverse_project), checkCreated)
+    timeStage("uploadSubjects", subject_count, stand_in, lambda: spout.uploadSubjects(subject_set["id"], subjects), checkUploaded)
+    timeStage("editSubjectMetadata", subject_count, stand_in, lambda: spout.editSubjectMetadata(subjects, renames={"#SCALE": "#ZOOM"}), checkEdited)
+
+    # Spout.streamManifest reports and resets the statistics of the governor itself, so they are reported before it.
+    statistics = Spout.request_governor.getStatistics()
+    print(f"Request governor: {statistics['retries']} retries, {statistics['throttles']} throttled, {statistics['requests_per_second']:.1f} requests/s")
+    Spout.request_governor.resetStatistics()
+
+    timeStage("streamManifest", subject_count, stand_in, lambda: spout.streamManifest(manifest_filename, zooniverse_project, streamed_subject_set["id"]), checkStreamed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the Spout upload paths against a local Panoptes API stand-in.")
+    parser.add_argument("subject_counts", type=int, nargs="*", default=[1000, 10000, 100000])
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    arguments = parser.parse_args()
+
+    stand_in = PanoptesStandIn(latency=arguments.latency, error_rate=arguments.error_rate, throttle_rate=arguments.throttle_rate)
+    os.environ["PANOPTES_ENDPOINT"] = stand_in.start()
+
+    try:
+        for subject_count in arguments.subject_counts:
+            with tempfile.TemporaryDirectory() as directory:
+                runBenchmark(subject_count, stand_in, directory)
+    finally:
+        stand_in.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,443 @@
+"""
+A local stand-in for the WiseView, unWISE, and Legacy Survey servers, for benchmarking AstronomyDataset collection
+without touching the live servers.
+
+CutoutStandIn serves, on localhost, synthetic cutout frames, WiseView MJD metadata, unWISE pixel brightnesses, and
+Legacy Survey cutouts, each delayed by a tunable latency and jitter. The stand-in query classes in this module have the
+interface of the flipbooks queries which unWISE_verse.Dataset uses, but request their data from the stand-in.
+installStandInQueries points unWISE_verse.Dataset at them.
+
+The collection processes of AstronomyDataset inherit the installed queries when they are forked, which is the default
+start method on Linux. The stand-in queries time their requests on the client side, per process, which
+getClientRequestStatistics returns.
+
+Usage:
+    stand_in = CutoutStandIn(latency=0.05, jitter=0.02)
+    installStandInQueries(stand_in.start())
+    dataset = CoolNeighborsDataset(target_filename, manifest_filename)
+    stand_in.stop()
+"""
+
+import csv
+import json
+import os
+import random
+import struct
+import threading
+import time
+import types
+import urllib.request
+import zlib
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+# The pixel scale of unWISE images, in arcseconds per pixel.
+unWISE_pixel_scale = 2.75
+
+# The number of requests the stand-in queries of this process sent, and the seconds they waited for them, by endpoint.
+client_request_counts = defaultdict(int)
+client_request_times = defaultdict(float)
+
+
+def encodePNG(pixels, width, height):
+    """
+    Encodes 8-bit grayscale pixels as a PNG.
+
+    Parameters
+    ----------
+        pixels : bytes
+            The pixels, row by row.
+        width : int
+            The width of the image.
+        height : int
+            The height of the image.
+
+    Returns
+    -------
+        bytes
+            The PNG.
+    """
+
+    def chunk(chunk_type, data):
+        return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data) & 0xFFFFFFFF)
+
+    # Every row starts with the filter type, which is 0 (no filter).
+    rows = b"".join(b"\x00" + pixels[row * width:(row + 1) * width] for row in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows, 1)) + chunk(b"IEND", b"")
+
+class CutoutStandIn:
+    def __init__(self, latency=0.05, jitter=0.02, frame_count=8, seed=0):
+        """
+        Initializes the stand-in.
+
+        Parameters
+        ----------
+            latency : float, optional
+                The mean number of seconds every request is delayed by.
+            jitter : float, optional
+                The delay of every request is drawn uniformly from latency - jitter to latency + jitter seconds.
+            frame_count : int, optional
+                The number of WiseView frames of every target.
+            seed : int, optional
+                The seed of the random number generator of the delays.
+        """
+
+        self.latency = latency
+        self.jitter = jitter
+        self.frame_count = frame_count
+        self.random = random.Random(seed)
+
+        self.lock = threading.Lock()
+        self.request_counts = defaultdict(int)
+        self.request_times = defaultdict(float)
+
+        self.server = None
+
+    @property
+    def url(self):
+        """
+        The URL of the stand-in.
+        """
+
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """
+        Starts serving the stand-in on a free localhost port in a background thread.
+
+        Returns
+        -------
+            str
+                The URL of the stand-in.
+        """
+
+        class Handler(StandInRequestHandler):
+            pass
+        Handler.stand_in = self
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="Cutout Stand-In", daemon=True).start()
+        return self.url
+
+    def stop(self):
+        """
+        Stops serving the stand-in.
+        """
+
+        if(self.server is not None):
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def getRequestStatistics(self):
+        """
+        Returns the number of requests and the total time spent serving them, by endpoint.
+
+        Returns
+        -------
+            dict
+                A dictionary of the form {endpoint: (request_count, total_seconds)}.
+        """
+
+        with self.lock:
+            return {endpoint: (self.request_counts[endpoint], self.request_times[endpoint]) for endpoint in self.request_counts}
+
+    def resetRequestStatistics(self):
+        """
+        Resets the request statistics.
+        """
+
+        with self.lock:
+            self.request_counts.clear()
+            self.request_times.clear()
+
+    def handle(self, path, query):
+        """
+        Answers a request.
+
+        Parameters
+        ----------
+            path : str
+                The path of the request, without its query.
+            query : dict
+                The query parameters of the request, with one value per parameter.
+
+        Returns
+        -------
+            tuple
+                A tuple of the form (status_code, content_type, body).
+        """
+
+        start_time = time.perf_counter()
+        with self.lock:
+            delay = max(0.0, self.random.uniform(self.latency - self.jitter, self.latency + self.jitter))
+        time.sleep(delay)
+
+        ra = float(query.get("ra", 0))
+        dec = float(query.get("dec", 0))
+        size = int(query.get("size", 64))
+
+        # The synthetic data of a target is the same on every request.
+        target_random = random.Random(f"{ra:.6f},{dec:.6f},{path},{query.get('frame', '')},{query.get('diff', '')}")
+
+        if(path == "/wiseview/mjds"):
+            start_mjd = 55200 + target_random.random() * 10
+            mjds = [[start_mjd + 182.6 * frame, start_mjd + 182.6 * frame + 1.5] for frame in range(self.frame_count)]
+            response = (200, "application/json", json.dumps(mjds).encode("utf-8"))
+        elif(path == "/wiseview/frame" or path == "/legacysurvey/cutout"):
+            pixels = bytes(target_random.getrandbits(8) for _ in range(size * size))
+            response = (200, "image/png", encodePNG(pixels, size, size))
+        elif(path == "/unwise/pixels"):
+            brightness = [target_random.gauss(50, 30) for _ in range(size * size)]
+            response = (200, "application/json", json.dumps(brightness).encode("utf-8"))
+        else:
+            response = (404, "text/plain", f"No route for {path}.".encode("utf-8"))
+
+        with self.lock:
+            self.request_counts[path] += 1
+            self.request_times[path] += time.perf_counter() - start_time
+        return response
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    stand_in = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        """
+        Passes the request to the stand-in and writes its response.
+        """
+
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        status_code, content_type, body = self.stand_in.handle(url.path, query)
+
+        self.send_response(status_code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def requestStandIn(endpoint, path, **parameters):
+    """
+    Requests data from the stand-in.
+
+    Returns
+    -------
+        bytes
+            The body of the response.
+    """
+
+    start_time = time.perf_counter()
+    with urllib.request.urlopen(f"{endpoint}{path}?{urlencode(parameters)}") as response:
+        body = response.read()
+
+    client_request_counts[path] += 1
+    client_request_times[path] += time.perf_counter() - start_time
+    return body
+
+def getClientRequestStatistics():
+    """
+    Returns the number of requests the stand-in queries of this process sent and the total time they waited for them,
+    by endpoint.
+
+    Returns
+    -------
+        dict
+            A dictionary of the form {endpoint: (request_count, total_seconds)}.
+    """
+
+    return {endpoint: (client_request_counts[endpoint], client_request_times[endpoint]) for endpoint in client_request_counts}
+
+def resetClientRequestStatistics():
+    """
+    Resets the client-side request statistics of this process.
+    """
+
+    client_request_counts.clear()
+    client_request_times.clear()
+
+def writeStandInImage(endpoint, path, filepath, **parameters):
+    """
+    Downloads an image from the stand-in to a file.
+
+    Returns
+    -------
+        tuple
+            The width and height of the image.
+    """
+
+    png = requestStandIn(endpoint, path, **parameters)
+    with open(filepath, "wb") as image_file:
+        image_file.write(png)
+    return struct.unpack(">II", png[16:24])
+
+class StandInWiseViewQuery:
+    endpoint = None
+
+    def __init__(self, RA, DEC, size, minbright=None, maxbright=None, window=1.5, diff=0):
+        """
+        Stand-in for flipbooks.WiseViewQuery.WiseViewQuery, which requests its data from a CutoutStandIn.
+        """
+
+        self.RA = RA
+        self.DEC = DEC
+        self.size = size
+        self.minbright = minbright
+        self.maxbright = maxbright
+        self.window = window
+        self.diff = diff
+
+    @staticmethod
+    def FOVToPixelSize(FOV):
+        return max(1, int(round(float(FOV) / unWISE_pixel_scale)))
+
+    @staticmethod
+    def PixelSizeToFOV(size):
+        return size * unWISE_pixel_scale
+
+    def requestMetadata(self, key):
+        if(key != "mjds"):
+            raise KeyError(f"The stand-in has no '{key}' metadata.")
+        return json.loads(requestStandIn(self.endpoint, "/wiseview/mjds", ra=self.RA, dec=self.DEC))
+
+    def generateWiseViewURL(self):
+        return f"{self.endpoint}/wiseview?" + urlencode({"ra": self.RA, "dec": self.DEC, "size": self.size, "diff": self.diff})
+
+    def downloadModifiedWiseViewData(self, directory, scale_factor=1, addGrid=False, gridCount=1, gridType="Solid", gridColor=(0, 0, 0)):
+        # The frames aren't scaled or gridded, but their sizes are reported as if they were.
+        flist = []
+        size_list = []
+        frame_count = len(self.requestMetadata("mjds"))
+        for frame in range(frame_count):
+            filepath = os.path.join(directory, f"unWISE_{self.RA}_{self.DEC}_{self.diff}_{frame}.png")
+            width, height = writeStandInImage(self.endpoint, "/wiseview/frame", filepath, ra=self.RA, dec=self.DEC, size=self.size, frame=frame, diff=self.diff)
+            flist.append(filepath)
+            size_list.append((int(width * scale_factor), int(height * scale_factor)))
+        return flist, size_list
+
+class StandInunWISEQuery:
+    endpoint = None
+
+    def __init__(self, ra, dec, size, bands=12):
+        """
+        Stand-in for flipbooks.unWISEQuery.unWISEQuery, which requests its pixel brightnesses from a CutoutStandIn.
+        """
+
+        self.ra = ra
+        self.dec = dec
+        self.size = size
+        self.bands = bands
+        self.brightness = None
+
+    def calculateBrightnessClip(self, mode="percentile", percentile=97.5):
+        if(self.brightness is None):
+            self.brightness = sorted(json.loads(requestStandIn(self.endpoint, "/unwise/pixels", ra=self.ra, dec=self.dec, size=self.size)))
+
+        def getPercentile(value):
+            return self.brightness[min(len(self.brightness) - 1, int(len(self.brightness) * value / 100))]
+
+        return getPercentile(100 - percentile), getPercentile(percentile)
+
+class StandInLegacySurveyQuery:
+    endpoint = None
+
+    def __init__(self, RA, DEC, zoom=13, layer="ls-dr10", blink=None, fov=120, bands="grz"):
+        """
+        Stand-in for flipbooks.LegacySurveyQuery.LegacySurveyQuery, which requests its cutouts from a CutoutStandIn.
+        """
+
+        self.legacy_survey_parameters = {"ra": RA, "dec": DEC, "zoom": zoom, "layer": layer,
+                                         "blink": blink if blink not in ("", None) else None, "fov": fov, "bands": bands}
+
+    def getViewerURL(self):
+        return f"{self.endpoint}/legacysurvey?" + urlencode({key: value for key, value in self.legacy_survey_parameters.items() if value is not None})
+
+    def getImage(self, directory, layer=None):
+        parameters = self.legacy_survey_parameters
+        layer = parameters["layer"] if layer is None else layer
+        filepath = os.path.join(directory, f"legacy_survey_{parameters['ra']}_{parameters['dec']}_{layer}.png")
+        size = StandInWiseViewQuery.FOVToPixelSize(parameters["fov"])
+        image_size = writeStandInImage(self.endpoint, "/legacysurvey/cutout", filepath, ra=parameters["ra"], dec=parameters["dec"], size=size, layer=layer)
+        return filepath, image_size
+
+    def getBlinkImages(self, directory):
+        flist = []
+        size_list = []
+        for layer in [self.legacy_survey_parameters["layer"], self.legacy_survey_parameters["blink"]]:
+            filepath, image_size = self.getImage(directory, layer)
+            flist.append(filepath)
+            size_list.append(image_size)
+        return flist, size_list
+
+def installStandInQueries(endpoint):
+    """
+    Points the queries of unWISE_verse.Dataset at a CutoutStandIn.
+
+    Parameters
+    ----------
+        endpoint : str
+            The URL of the stand-in.
+    """
+
+    from unWISE_verse import Dataset
+
+    StandInWiseViewQuery.endpoint = endpoint
+    StandInunWISEQuery.endpoint = endpoint
+    StandInLegacySurveyQuery.endpoint = endpoint
+
+    Dataset.WiseViewQuery = types.SimpleNamespace(WiseViewQuery=StandInWiseViewQuery, unWISE_pixel_scale=unWISE_pixel_scale)
+    Dataset.unWISEQuery = types.SimpleNamespace(unWISEQuery=StandInunWISEQuery)
+    Dataset.LegacySurveyQuery = StandInLegacySurveyQuery
+
+def generateTargetList(target_filename, row_count, dataset_type, png_directory, fixed_brightness=False, seed=0):
+    """
+    Writes a synthetic target list with every column a dataset type requires.
+
+    Parameters
+    ----------
+        target_filename : str
+            The filename of the target list.
+        row_count : int
+            The number of targets.
+        dataset_type : class
+            The AstronomyDataset subclass the target list is for.
+        png_directory : str
+            The directory the images of the targets are downloaded to.
+        fixed_brightness : bool, optional
+            If True, the brightness limits are given, otherwise they are left empty so that they are calculated from
+            the unWISE pixel brightnesses of every target.
+        seed : int, optional
+            The seed of the random number generator of the target coordinates.
+    """
+
+    from Data import Data
+
+    default_values = {"bitmask": 0, "addgrid": True, "scale": 8, "fov": 120, "png_directory": png_directory,
+                      "minbright": -50 if fixed_brightness else "", "maxbright": 500 if fixed_brightness else "",
+                      "gridcount": 10, "gridtype": "Solid", "gridcolor": "(128,0,0)", "ignore_partial_cutouts": False,
+                      "image_type": "Regular Image", "zoom": 13, "layer": "ls-dr10", "blink": "unwise-neo7"}
+
+    columns = {}
+    for column in dataset_type.required_target_columns:
+        if(column in ("ra", "dec", "target_id")):
+            continue
+        key = dataset_type.mutable_columns_keys_dict.get(column, column.upper().replace("_", " "))
+        if(column in dataset_type.required_private_columns):
+            key = Data.privatization_symbol + key
+        columns[key] = default_values[column]
+
+    target_random = random.Random(seed)
+    with open(target_filename, "w", newline="") as target_file:
+        writer = csv.writer(target_file)
+        writer.writerow(["RA", "DEC", "TARGET ID"] + list(columns.keys()))
+        for index in range(row_count):
+            ra = round(target_random.uniform(0, 360), 6)
+            dec = round(target_random.uniform(-90, 90), 6)
+            writer.writerow([ra, dec, index] + list(columns.values()))
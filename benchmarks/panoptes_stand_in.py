@@ -0,0 +1,492 @@
+"""
+A local stand-in for the Zooniverse Panoptes API, for benchmarking Spout without touching production Zooniverse.
+
+PanoptesStandIn serves, on localhost, the subset of the API which panoptes_client uses for Spout: signing in,
+projects, project roles, users, subjects, subject sets and their subject links, the set member subjects which
+membership checks of subject set links query, and media uploads. Each request can be
+delayed, and a fraction of the API requests can be answered with a server error or throttled with HTTP 429 and a
+Retry-After header. Every request is counted, so benchmarks can report the number of API calls per subject, and the
+API requests sent without an Authorization header are counted separately.
+
+Usage:
+    stand_in = PanoptesStandIn(latency=0.02, throttle_rate=0.01)
+    stand_in.start()
+    os.environ["PANOPTES_ENDPOINT"] = stand_in.url
+    ...
+    stand_in.stop()
+"""
+
+import itertools
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+
+class PanoptesStandIn:
+    collections = ("projects", "project_roles", "users", "subjects", "subject_sets")
+
+    # Collections which are derived from the links of the other collections and can only be read.
+    derived_collections = ("set_member_subjects",)
+
+    def __init__(self, latency=0.0, error_rate=0.0, throttle_rate=0.0, retry_after=1, seed=0):
+        """
+        Initializes the stand-in with an empty database.
+
+        Parameters
+        ----------
+            latency : float, optional
+                The number of seconds every request is delayed by.
+            error_rate : float, optional
+                The fraction of API requests answered with HTTP 502, before they are processed.
+            throttle_rate : float, optional
+                The fraction of API requests answered with HTTP 429, before they are processed.
+            retry_after : int, optional
+                The Retry-After header, in seconds, of throttled responses.
+            seed : int, optional
+                The seed of the random number generator which picks the failed requests.
+        """
+
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.resources = {collection: {} for collection in self.collections}
+        self.media_bytes = 0
+        self.request_counts = Counter()
+        self.unauthenticated_request_count = 0
+
+        self.server = None
+        self.thread = None
+
+    @property
+    def url(self):
+        """
+        The URL of the stand-in, which is used as the Panoptes endpoint.
+        """
+
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """
+        Starts serving the stand-in on a free localhost port in a background thread.
+
+        Returns
+        -------
+            str
+                The URL of the stand-in, which is used as the Panoptes endpoint.
+        """
+
+        stand_in = self
+
+        class Handler(StandInRequestHandler):
+            pass
+        Handler.stand_in = stand_in
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="Panoptes Stand-In", daemon=True)
+        self.thread.start()
+        return self.url
+
+    def stop(self):
+        """
+        Stops serving the stand-in.
+        """
+
+        if(self.server is not None):
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def resetRequestCounts(self):
+        """
+        Resets the request counters.
+        """
+
+        with self.lock:
+            self.request_counts = Counter()
+            self.unauthenticated_request_count = 0
+
+    def getAPIRequestCount(self):
+        """
+        Returns the number of API requests since the counters were last reset, excluding sign-in and media uploads.
+        """
+
+        with self.lock:
+            return sum(count for (method, collection), count in self.request_counts.items() if collection in self.collections or collection in self.derived_collections)
+
+    def getUnauthenticatedRequestCount(self):
+        """
+        Returns the number of API requests without an Authorization header since the counters were last reset.
+        """
+
+        with self.lock:
+            return self.unauthenticated_request_count
+
+    def getMediaUploadCount(self):
+        """
+        Returns the number of media uploads since the counters were last reset.
+        """
+
+        with self.lock:
+            return self.request_counts[("PUT", "media")]
+
+    def createResource(self, collection, attributes):
+        """
+        Adds a resource to the database.
+
+        Parameters
+        ----------
+            collection : str
+                The collection of the resource, such as "projects".
+            attributes : dict
+                The attributes of the resource, without its ID.
+
+        Returns
+        -------
+            dict
+                The raw resource, with its ID.
+        """
+
+        with self.lock:
+            resource_id = str(next(self.ids))
+            resource = dict(attributes, id=resource_id)
+            resource.setdefault("links", {})
+            self.resources[collection][resource_id] = resource
+            return resource
+
+    def createProject(self, display_name="Benchmark Project", owner="benchmark"):
+        """
+        Adds a project to the database and returns it.
+        """
+
+        return self.createResource("projects", {"display_name": display_name, "links": {"owner": {"display_name": owner}, "project_roles": [], "subject_sets": []}})
+
+    def createSubjectSet(self, project_id, display_name="Benchmark Subject Set"):
+        """
+        Adds a subject set of a project to the database and returns it.
+        """
+
+        subject_set = self.createResource("subject_sets", {"display_name": display_name, "set_member_subjects_count": 0, "links": {"project": str(project_id), "subjects": []}})
+        self.resources["projects"][str(project_id)]["links"]["subject_sets"].append(subject_set["id"])
+        return subject_set
+
+    def handle(self, method, path, query, body, headers=None):
+        """
+        Answers a request.
+
+        Parameters
+        ----------
+            method : str
+                The HTTP method of the request.
+            path : str
+                The path of the request, without its query.
+            query : dict
+                The query parameters of the request.
+            body : bytes
+                The body of the request.
+            headers : Mapping, optional
+                The headers of the request.
+
+        Returns
+        -------
+            tuple
+                A tuple of the form (status_code, headers, body).
+        """
+
+        if(self.latency > 0):
+            time.sleep(self.latency)
+
+        parts = [part for part in path.split("/") if part != ""]
+
+        if(len(parts) > 0 and parts[0] == "media"):
+            with self.lock:
+                self.request_counts[("PUT", "media")] += 1
+                self.media_bytes += len(body)
+            return 200, {}, b""
+
+        if(parts[:2] == ["users", "sign_in"]):
+            if(method == "GET"):
+                return 200, {"Content-Type": "text/html", "X-CSRF-Token": "stand-in"}, b'<html><head><meta name="csrf-token" content="stand-in"></head></html>'
+            return 200, {}, json.dumps({"users": [{"id": "1", "login": "benchmark"}]}).encode("utf-8")
+
+        if(parts[:2] == ["oauth", "token"]):
+            token = {"access_token": "stand-in", "token_type": "Bearer", "expires_in": 7200, "refresh_token": "stand-in", "created_at": int(time.time())}
+            return 200, {}, json.dumps(token).encode("utf-8")
+
+        if(len(parts) > 0 and parts[0] == "api"):
+            parts = parts[1:]
+
+        # Pagination links can repeat the collection, as in /subjects//subjects?page=2.
+        if(len(parts) > 1 and parts[0] == parts[1]):
+            parts = parts[1:]
+
+        if(len(parts) == 0 or (parts[0] not in self.collections and parts[0] not in self.derived_collections and parts[0] != "me")):
+            return 404, {}, json.dumps({"errors": [{"message": f"No route for {path}."}]}).encode("utf-8")
+        collection = parts[0]
+
+        with self.lock:
+            self.request_counts[(method, collection)] += 1
+            if(headers is None or headers.get("Authorization") is None):
+                self.unauthenticated_request_count += 1
+            roll = self.random.random()
+
+        if(roll < self.throttle_rate):
+            return 429, {"Retry-After": str(self.retry_after)}, json.dumps({"errors": [{"message": "Too many requests."}]}).encode("utf-8")
+        if(roll < self.throttle_rate + self.error_rate):
+            return 502, {}, b"Bad gateway"
+
+        if(collection == "me"):
+            return self.respond("users", [{"id": "1", "login": "benchmark", "display_name": "benchmark", "links": {}}])
+
+        if(collection == "set_member_subjects"):
+            if(method != "GET"):
+                return 405, {}, json.dumps({"errors": [{"message": f"{method} {path} is not supported."}]}).encode("utf-8")
+            return self.listSetMemberSubjects(query)
+
+        try:
+            payload = json.loads(body) if len(body) > 0 else {}
+        except json.JSONDecodeError:
+            payload = {}
+
+        if(method == "GET"):
+            if(len(parts) > 1):
+                query = dict(query, id=parts[1])
+            return self.listResources(collection, query)
+        elif(method == "POST" and len(parts) == 1):
+            return self.createFromPayload(collection, payload)
+        elif(method == "POST" and len(parts) == 4 and parts[2] == "links"):
+            return self.addLinks(collection, parts[1], parts[3], payload)
+        elif(method == "PUT" and len(parts) == 2):
+            return self.updateFromPayload(collection, parts[1], payload)
+        elif(method == "DELETE" and len(parts) == 2):
+            return self.deleteResource(collection, parts[1])
+        elif(method == "DELETE" and len(parts) == 5 and parts[2] == "links"):
+            return self.removeLinks(collection, parts[1], parts[3], parts[4].split(","))
+
+        return 405, {}, json.dumps({"errors": [{"message": f"{method} {path} is not supported."}]}).encode("utf-8")
+
+    @staticmethod
+    def getQueryValues(query):
+        """
+        Returns the last value of each query parameter.
+        """
+
+        return {key: values[-1] if isinstance(values, list) else values for key, values in query.items()}
+
+    def respond(self, collection, resources, status_code=200, meta=None):
+        """
+        Returns a response with a page of resources of a collection.
+        """
+
+        response = {collection: resources, "links": {}, "meta": {collection: meta if meta is not None else {}}}
+        return status_code, {"ETag": f'"{time.monotonic_ns()}"'}, json.dumps(response).encode("utf-8")
+
+    def listResources(self, collection, query):
+        """
+        Answers GET requests of a collection, filtered and paginated like the Panoptes API.
+        """
+
+        with self.lock:
+            resources = list(self.resources[collection].values())
+
+        filters = self.getQueryValues(query)
+
+        if("id" in filters):
+            ids = set(filters.pop("id").split(","))
+            resources = [resource for resource in resources if resource["id"] in ids]
+        if("login" in filters):
+            login = filters.pop("login")
+            resources = [resource for resource in resources if resource.get("login") == login]
+        if("project_id" in filters):
+            project_id = filters.pop("project_id")
+            resources = [resource for resource in resources if resource["links"].get("project") == project_id]
+        if("subject_set_id" in filters):
+            subject_set_id = filters.pop("subject_set_id")
+            resources = [resource for resource in resources if subject_set_id in resource["links"].get("subject_sets", [])]
+
+        return self.respondPage(collection, resources, query)
+
+    def listSetMemberSubjects(self, query):
+        """
+        Answers GET requests of set member subjects, the links between subject sets and subjects, which can be filtered
+        by subject_set_id and subject_id.
+        """
+
+        filters = self.getQueryValues(query)
+        subject_set_id = filters.get("subject_set_id", None)
+        subject_id = filters.get("subject_id", None)
+
+        with self.lock:
+            set_member_subjects = []
+            for subject_set in self.resources["subject_sets"].values():
+                if(subject_set_id is not None and subject_set["id"] != subject_set_id):
+                    continue
+                for linked_id in subject_set["links"].get("subjects", []):
+                    if(subject_id is None or linked_id == subject_id):
+                        set_member_subjects.append({"id": f"{subject_set['id']}-{linked_id}", "links": {"subject_set": subject_set["id"], "subject": linked_id}})
+
+        return self.respondPage("set_member_subjects", set_member_subjects, query)
+
+    def respondPage(self, collection, resources, query):
+        """
+        Returns a response with the page of the resources of a collection which the page and page_size query
+        parameters select, linked to the next page like the Panoptes API.
+        """
+
+        filters = self.getQueryValues(query)
+        page = int(filters.pop("page", 1))
+        page_size = int(filters.pop("page_size", 20))
+        next_filters = filters
+
+        count = len(resources)
+        page_count = max(1, -(-count // page_size))
+        page_resources = resources[(page - 1) * page_size:page * page_size]
+
+        next_href = None
+        if(page < page_count):
+            next_query = "&".join(f"{key}={value}" for key, value in dict(next_filters, page=page + 1, page_size=page_size).items())
+            next_href = f"/{collection}?{next_query}"
+
+        meta = {"page": page, "page_size": page_size, "count": count, "page_count": page_count,
+                "next_page": page + 1 if page < page_count else None, "next_href": next_href}
+        return self.respond(collection, page_resources, meta=meta)
+
+    def createFromPayload(self, collection, payload):
+        """
+        Answers POST requests which create a resource. Created subjects get a media upload URL per location.
+        """
+
+        attributes = payload.get(collection, {})
+        if(isinstance(attributes, list)):
+            attributes = attributes[0]
+
+        links = {key: value for key, value in attributes.pop("links", {}).items()}
+        if(collection == "subjects"):
+            links.setdefault("subject_sets", [])
+            media_types = attributes.get("locations", [])
+            resource = self.createResource(collection, dict(attributes, links=links))
+            resource["locations"] = [{media_type if isinstance(media_type, str) else list(media_type)[0]: f"{self.url}/media/{resource['id']}/{index}"}
+                                     for index, media_type in enumerate(media_types)]
+        else:
+            resource = self.createResource(collection, dict(attributes, links=links))
+        return self.respond(collection, [resource], status_code=201)
+
+    def updateFromPayload(self, collection, resource_id, payload):
+        """
+        Answers PUT requests which update a resource.
+        """
+
+        attributes = payload.get(collection, {})
+        with self.lock:
+            resource = self.resources[collection].get(resource_id, None)
+            if(resource is None):
+                return 404, {}, json.dumps({"errors": [{"message": f"Could not find {collection} with id='{resource_id}'"}]}).encode("utf-8")
+            links = attributes.pop("links", None)
+            resource.update({key: value for key, value in attributes.items() if key != "locations"})
+            if(links is not None):
+                resource["links"].update(links)
+        return self.respond(collection, [resource])
+
+    def deleteResource(self, collection, resource_id):
+        """
+        Answers DELETE requests of a resource, unlinking deleted subjects from their subject sets.
+        """
+
+        with self.lock:
+            resource = self.resources[collection].pop(resource_id, None)
+            if(collection == "subjects" and resource is not None):
+                for subject_set_id in resource["links"].get("subject_sets", []):
+                    subject_set = self.resources["subject_sets"].get(subject_set_id, None)
+                    if(subject_set is not None and resource_id in subject_set["links"]["subjects"]):
+                        subject_set["links"]["subjects"].remove(resource_id)
+                        subject_set["set_member_subjects_count"] -= 1
+        return 204, {}, b""
+
+    def addLinks(self, collection, resource_id, link_name, payload):
+        """
+        Answers POST requests which link resources, such as subjects, to a resource, such as a subject set.
+        """
+
+        linked_ids = [str(linked_id) for linked_id in payload.get(link_name, [])]
+        with self.lock:
+            subject_set = self.resources[collection].get(resource_id, None)
+            if(subject_set is None):
+                return 404, {}, json.dumps({"errors": [{"message": f"Could not find {collection} with id='{resource_id}'"}]}).encode("utf-8")
+            linked = subject_set["links"].setdefault(link_name, [])
+            linked_set = set(linked)
+            for linked_id in linked_ids:
+                if(linked_id not in linked_set):
+                    linked.append(linked_id)
+                    linked_set.add(linked_id)
+                    subject = self.resources["subjects"].get(linked_id, None)
+                    if(subject is not None):
+                        subject["links"].setdefault("subject_sets", []).append(resource_id)
+            subject_set["set_member_subjects_count"] = len(linked)
+        return self.respond(collection, [subject_set])
+
+    def removeLinks(self, collection, resource_id, link_name, linked_ids):
+        """
+        Answers DELETE requests which unlink resources from a resource.
+        """
+
+        with self.lock:
+            subject_set = self.resources[collection].get(resource_id, None)
+            if(subject_set is None):
+                return 404, {}, json.dumps({"errors": [{"message": f"Could not find {collection} with id='{resource_id}'"}]}).encode("utf-8")
+            removed_ids = set(linked_ids)
+            subject_set["links"][link_name] = [linked_id for linked_id in subject_set["links"].get(link_name, []) if linked_id not in removed_ids]
+            for linked_id in removed_ids:
+                subject = self.resources["subjects"].get(linked_id, None)
+                if(subject is not None and resource_id in subject["links"].get("subject_sets", [])):
+                    subject["links"]["subject_sets"].remove(resource_id)
+            subject_set["set_member_subjects_count"] = len(subject_set["links"][link_name])
+        return 204, {}, b""
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    stand_in = None
+    protocol_version = "HTTP/1.1"
+
+    # Each response is written in one piece, without Nagle's algorithm, since writing its headers and body separately
+    # on a kept-alive connection delays every response by the client's delayed acknowledgement (about 40 ms).
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def handleRequest(self):
+        """
+        Passes the request to the stand-in and writes its response.
+        """
+
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length > 0 else b""
+
+        try:
+            status_code, headers, response_body = self.stand_in.handle(self.command, url.path, parse_qs(url.query), body, self.headers)
+        except Exception as e:
+            status_code, headers, response_body = 500, {}, json.dumps({"errors": [{"message": repr(e)}]}).encode("utf-8")
+
+        self.send_response(status_code)
+        headers.setdefault("Content-Type", "application/json")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(response_body)))
+        self.end_headers()
+        self.wfile.write(response_body)
+
+    do_GET = handleRequest
+    do_POST = handleRequest
+    do_PUT = handleRequest
+    do_DELETE = handleRequest
@@ -0,0 +1,34 @@
+import os
+import sys
+
+import pytest
+
+repository_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repository_directory)
+sys.path.insert(0, os.path.join(repository_directory, "unWISE_verse"))
+sys.path.insert(0, os.path.join(repository_directory, "benchmarks"))
+
+@pytest.fixture
+def stand_in(monkeypatch):
+    """
+    A local Panoptes API stand-in, which every Panoptes client created during the test connects to.
+    """
+
+    from panoptes_stand_in import PanoptesStandIn
+
+    stand_in = PanoptesStandIn()
+    monkeypatch.setenv("PANOPTES_ENDPOINT", stand_in.start())
+    yield stand_in
+    stand_in.stop()
+
+@pytest.fixture
+def spout(stand_in):
+    """
+    A Spout logged into the stand-in, with an empty resource cache.
+    """
+
+    from unWISE_verse.Login import Login
+    from unWISE_verse.Spout import Spout
+
+    Spout.invalidateCache()
+    return Spout(login=Login("benchmark", "benchmark"), display_printouts=False)
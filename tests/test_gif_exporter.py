@@ -0,0 +1,26 @@
+import pytest
+
+pytest.importorskip("PIL")
+
+from unWISE_verse import GIFExporter
+from unWISE_verse.Spout import Spout
+
+def test_frames_whose_files_are_gone_are_downloaded(tmp_path, monkeypatch):
+    cached_filepath = tmp_path / "1_image_0.png"
+    cached_filepath.write_bytes(b"cached frame")
+    evicted_filepath = tmp_path / "1_image_1.png"
+
+    downloaded_locations = []
+
+    def downloadToMemory(location):
+        downloaded_locations.append(location)
+        return f"downloaded {location['image/png']}".encode("utf-8")
+
+    monkeypatch.setattr(Spout, "downloadToMemory", staticmethod(downloadToMemory))
+
+    frames = [(str(cached_filepath), {"image/png": "frame_0"}),
+              (str(evicted_filepath), {"image/png": "frame_1"}),
+              (None, {"image/png": "frame_2"})]
+
+    assert GIFExporter.readFrames(frames) == [b"cached frame", b"downloaded frame_1", b"downloaded frame_2"]
+    assert downloaded_locations == [{"image/png": "frame_1"}, {"image/png": "frame_2"}]
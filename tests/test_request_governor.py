@@ -0,0 +1,133 @@
+import io
+
+import pytest
+
+pytest.importorskip("requests")
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from unWISE_verse import RequestGovernor as request_governor_module
+from unWISE_verse.RequestGovernor import RequestGovernor, GovernedHTTPAdapter
+
+def makeResponse(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response.raw = io.BytesIO(b"")
+    return response
+
+@pytest.fixture
+def sent(monkeypatch):
+    """
+    Replaces the transport under GovernedHTTPAdapter with one which returns queued responses, and records the delays
+    slept between retries.
+    """
+
+    class Transport:
+        responses = []
+        methods = []
+        delays = []
+
+    def send(adapter, request, **kwargs):
+        Transport.methods.append(request.method)
+        return Transport.responses.pop(0)
+
+    monkeypatch.setattr(HTTPAdapter, "send", send)
+    monkeypatch.setattr(request_governor_module.time, "sleep", Transport.delays.append)
+    return Transport
+
+def sendRequest(governor, method):
+    request = requests.Request(method, "https://panoptes.example/api/subjects").prepare()
+    return GovernedHTTPAdapter(governor).send(request)
+
+def test_throttled_requests_are_retried_after_retry_after(sent):
+    governor = RequestGovernor()
+    sent.responses = [makeResponse(429, {"Retry-After": "0.1"}), makeResponse(200)]
+
+    response = sendRequest(governor, "POST")
+
+    assert response.status_code == 200
+    assert sent.methods == ["POST", "POST"]
+    assert sent.delays == [0.1]
+
+    statistics = governor.getStatistics()
+    assert (statistics["requests"], statistics["retries"], statistics["throttles"]) == (2, 1, 1)
+
+def test_posts_are_not_retried_after_server_errors(sent):
+    governor = RequestGovernor()
+    sent.responses = [makeResponse(500), makeResponse(200)]
+
+    response = sendRequest(governor, "POST")
+
+    assert response.status_code == 500
+    assert sent.methods == ["POST"]
+    assert governor.getStatistics()["retries"] == 0
+
+def test_idempotent_requests_are_retried_after_server_errors(sent):
+    governor = RequestGovernor(base_delay=0.01)
+    sent.responses = [makeResponse(500), makeResponse(502), makeResponse(200)]
+
+    response = sendRequest(governor, "PUT")
+
+    assert response.status_code == 200
+    assert sent.methods == ["PUT", "PUT", "PUT"]
+    assert governor.getStatistics()["throttles"] == 0
+
+def test_retries_stop_at_max_retries(sent):
+    governor = RequestGovernor(max_retries=2, base_delay=0.01)
+    sent.responses = [makeResponse(503) for retry in range(3)]
+
+    response = sendRequest(governor, "GET")
+
+    assert response.status_code == 503
+    assert len(sent.methods) == 3
+
+def test_concurrency_ceiling_halves_when_throttled_and_recovers(monkeypatch):
+    current_time = [100.0]
+    monkeypatch.setattr(request_governor_module.time, "monotonic", lambda: current_time[0])
+
+    governor = RequestGovernor(requests_per_second=20.0, max_requests_per_second=40.0, max_concurrency=8)
+
+    # Requests throttled together only reduce the ceiling once.
+    for throttled_count in range(3):
+        governor.acquire()
+        governor.release(throttled=True)
+    assert (governor.concurrency_limit, governor.rate) == (4, 10.0)
+
+    current_time[0] += 1.0
+    governor.acquire()
+    governor.release(throttled=True)
+    assert (governor.concurrency_limit, governor.rate) == (2, 5.0)
+
+    # Each ceiling's worth of successful requests raises the ceiling by one, up to max_concurrency.
+    for success_count in range(2):
+        governor.tokens = governor.burst
+        governor.acquire()
+        governor.release()
+    assert governor.concurrency_limit == 3
+
+    for success_count in range(100):
+        governor.tokens = governor.burst
+        governor.acquire()
+        governor.release()
+    assert governor.concurrency_limit == 8
+    assert governor.rate == pytest.approx(5.0 * 1.1 ** 15)
+
+    # The rate keeps rising past the initial rate while requests succeed, up to max_requests_per_second.
+    for success_count in range(100):
+        governor.tokens = governor.burst
+        governor.acquire()
+        governor.release()
+    assert governor.rate == pytest.approx(40.0)
+
+def test_install_is_idempotent():
+    governor = RequestGovernor()
+    session = requests.Session()
+
+    governor.install(session)
+    adapter = session.get_adapter("https://")
+    governor.install(session)
+
+    assert isinstance(adapter, GovernedHTTPAdapter)
+    assert session.get_adapter("https://") is adapter
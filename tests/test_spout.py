@@ -0,0 +1,216 @@
+import threading
+
+import pytest
+
+pytest.importorskip("panoptes_client")
+
+from panoptes_client import Project, Subject, SubjectSet
+from panoptes_client.panoptes import PanoptesAPIException
+
+from Data import Data
+from unWISE_verse import Spout as spout_module
+from unWISE_verse.Spout import Spout
+from unWISE_verse.UploadJournal import UploadJournal
+
+def test_worker_requests_carry_the_callers_login(stand_in, spout):
+    project = stand_in.createProject()
+    stand_in.resetRequestCounts()
+
+    results = list(Spout.mapConcurrently(lambda project_id: Project.find(project_id).id, [project["id"]] * 8, max_workers=4))
+
+    assert [exception for index, item, result, exception in results] == [None] * 8
+    assert stand_in.getAPIRequestCount() == 8
+    assert stand_in.getUnauthenticatedRequestCount() == 0
+
+def test_bound_thread_requests_carry_the_callers_login(stand_in, spout):
+    project = stand_in.createProject()
+    stand_in.resetRequestCounts()
+
+    thread = threading.Thread(target=Spout.bindClient(lambda: Project.find(project["id"])))
+    thread.start()
+    thread.join()
+
+    assert stand_in.getAPIRequestCount() == 1
+    assert stand_in.getUnauthenticatedRequestCount() == 0
+
+def test_worker_requests_are_governed(stand_in, spout):
+    project = stand_in.createProject()
+    Spout.request_governor.resetStatistics()
+
+    # Even a thread which never logged in has its client's requests paced by the governor when it binds its client.
+    def mapInThread():
+        results.extend(Spout.mapConcurrently(lambda project_id: Project.find(project_id).id, [project["id"]] * 8, max_workers=4))
+
+    results = []
+    thread = threading.Thread(target=mapInThread)
+    thread.start()
+    thread.join()
+
+    assert [exception for index, item, result, exception in results] == [None] * 8
+    assert Spout.request_governor.getStatistics()["requests"] == 8
+
+def createSubjects(stand_in, project_id, subject_set_id, subject_count):
+    # Adds subjects to the stand-in, linked to a subject set if one is given.
+    subject_ids = []
+    for index in range(subject_count):
+        subject_sets = [] if subject_set_id is None else [subject_set_id]
+        subject = stand_in.createResource("subjects", {"metadata": {"index": index}, "locations": [], "links": {"project": project_id, "subject_sets": subject_sets}})
+        if(subject_set_id is not None):
+            stand_in.resources["subject_sets"][subject_set_id]["links"]["subjects"].append(subject["id"])
+        subject_ids.append(subject["id"])
+    return subject_ids
+
+def test_fetched_pages_hold_resource_objects(stand_in, spout):
+    project = stand_in.createProject()
+    subject_set = stand_in.createSubjectSet(project["id"])
+    linked_ids = createSubjects(stand_in, project["id"], subject_set["id"], 150)
+    orphan_ids = createSubjects(stand_in, project["id"], None, 120)
+
+    subjects = spout.getSubjectsFromProject(project["id"])
+    assert all(isinstance(subject, Subject) for subject in subjects)
+    assert [subject.id for subject in subjects] == linked_ids + orphan_ids
+    assert all(Spout.isSubjectFresh(subject, 60) for subject in subjects)
+
+    orphans = spout.getSubjectsFromProject(project["id"], only_orphans=True)
+    assert [subject.id for subject in orphans] == orphan_ids
+
+    subject_set_subjects = spout.getSubjectsFromSubjectSet(subject_set["id"])
+    assert all(isinstance(subject, Subject) for subject in subject_set_subjects)
+    assert [subject.id for subject in subject_set_subjects] == linked_ids
+
+    subject_sets = spout.getSubjectSetsFromProject(project["id"])
+    assert all(isinstance(subject_set, SubjectSet) for subject_set in subject_sets)
+    assert [subject_set.id for subject_set in subject_sets] == [subject_set["id"]]
+
+def test_editing_fresh_subjects_only_saves_them(stand_in, spout):
+    project = stand_in.createProject()
+    subject_ids = createSubjects(stand_in, project["id"], None, 20)
+    subjects = spout.findSubjects(subject_ids)
+
+    stand_in.resetRequestCounts()
+    report = spout.editSubjectMetadata(subjects, renames={"index": "position"})
+    assert [entry["status"] for entry in report] == ["modified"] * 20
+    assert stand_in.request_counts == {("PUT", "subjects"): 20}
+
+    # The saved subjects are still fresh, so a second edit doesn't reload them either.
+    stand_in.resetRequestCounts()
+    report = spout.editSubjectMetadata(subjects, patch={int(subject_id): {"position": -1} for subject_id in subject_ids})
+    assert [entry["status"] for entry in report] == ["modified"] * 20
+    assert stand_in.request_counts == {("PUT", "subjects"): 20}
+    assert all(stand_in.resources["subjects"][subject_id]["metadata"] == {"position": -1} for subject_id in subject_ids)
+
+def test_created_subjects_are_fresh(stand_in, spout):
+    project = spout.findProject(stand_in.createProject()["id"])
+    subjects = [Subject() for index in range(5)]
+    for index, subject in enumerate(subjects):
+        subject.metadata.update({"index": index})
+
+    stand_in.resetRequestCounts()
+    assert spout.updateSubjects(subjects, project)
+    assert stand_in.request_counts == {("POST", "subjects"): 5, ("PUT", "subjects"): 5}
+    assert all(Spout.isSubjectFresh(subject, 60) for subject in subjects)
+
+    stand_in.resetRequestCounts()
+    spout.editSubjectMetadata(subjects, renames={"index": "position"})
+    assert stand_in.request_counts == {("PUT", "subjects"): 5}
+
+def test_subjects_created_from_data_have_string_metadata(spout):
+    data = Data({"f1": ""}, {"TARGET ID": 7, "RA": 120.5, "#SCALE": None})
+
+    subject = spout.createSubjectFromData(data)
+
+    # The metadata matches the metadata of the same row read back from a manifest CSV.
+    assert subject.metadata == {"TARGET ID": "7", "RA": "120.5", "#SCALE": ""}
+
+def test_adaptive_batches_are_sent_as_single_requests(spout):
+    batches = []
+
+    def operation(batch, batch_size=100):
+        batches.append((len(batch), batch_size))
+
+    completed_count, failed_items = spout.runAdaptiveBatches(list(range(300)), operation)
+
+    # The first batch is a quarter of Spout.max_batch_size, and the second batch holds the rest.
+    assert (completed_count, failed_items) == (300, [])
+    assert batches == [(250, 250), (50, 50)]
+
+def test_adaptive_batches_do_not_grow_past_a_failed_batch(spout, monkeypatch):
+    monkeypatch.setattr(spout_module.time, "sleep", lambda delay: None)
+    batch_sizes = []
+
+    def operation(batch, batch_size=100):
+        batch_sizes.append(batch_size)
+        if(batch_size > 150):
+            raise PanoptesAPIException("Request-URI Too Long")
+
+    completed_count, failed_items = spout.runAdaptiveBatches(list(range(1000)), operation, max_batch_size=400)
+
+    # The first batch is a quarter of the largest batch size, and after the failed batch, the batch size stays at the
+    # halved size it was retried with.
+    assert (completed_count, failed_items) == (1000, [])
+    assert batch_sizes[:4] == [100, 200, 100, 100]
+    assert max(batch_sizes[2:]) == 100
+
+def test_logging_in_clears_the_resource_cache(stand_in, spout):
+    project = stand_in.createProject()
+    spout.findProject(project["id"])
+    stand_in.resetRequestCounts()
+
+    spout.findProject(project["id"])
+    assert stand_in.getAPIRequestCount() == 0
+
+    assert Spout.verifyLogin(spout.login)
+    stand_in.resetRequestCounts()
+    spout.findProject(project["id"])
+    assert stand_in.request_counts == {("GET", "projects"): 1}
+
+    Spout.loginToZooniverse(spout.login)
+    stand_in.resetRequestCounts()
+    spout.findProject(project["id"])
+    assert stand_in.request_counts == {("GET", "projects"): 1}
+
+def test_uploaded_subjects_are_linked_in_adaptive_batches(stand_in, spout, monkeypatch):
+    # Every subject's link is checked with its own request, so the governor is lifted to keep the test fast.
+    for name in ("rate", "max_rate", "burst", "tokens"):
+        monkeypatch.setattr(Spout.request_governor, name, 10000.0)
+
+    project = stand_in.createProject()
+    subject_set = stand_in.createSubjectSet(project["id"])
+    subject_ids = createSubjects(stand_in, project["id"], None, 300)
+    linked_ids = createSubjects(stand_in, project["id"], subject_set["id"], 5)
+
+    stand_in.resetRequestCounts()
+    assert spout.uploadSubjects(subject_set["id"], subject_ids + linked_ids)
+
+    # Subjects which are already linked are skipped, and each batch of the rest is linked with a single request.
+    assert stand_in.request_counts[("POST", "subject_sets")] == 2
+    assert stand_in.resources["subject_sets"][subject_set["id"]]["links"]["subjects"] == linked_ids + subject_ids
+
+def test_journal_subjects_which_cannot_be_stamped_are_not_linked(tmp_path, stand_in, spout):
+    project = stand_in.createProject()
+    subject_set = stand_in.createSubjectSet(project["id"])
+    subject_ids = createSubjects(stand_in, project["id"], None, 2)
+
+    # The subject of the second row was deleted, so its ID can't be stamped.
+    journal = UploadJournal(str(tmp_path / "manifest.csv"), project["id"], subject_set["id"])
+    for row_hash, subject_id in [("row_1", subject_ids[0]), ("row_2", "999999"), ("row_3", subject_ids[1])]:
+        journal.recordCreated(row_hash, subject_id)
+
+    linked_count, failed_count = spout.finishJournalSubjects(spout.findSubjectSet(subject_set["id"]), journal)
+
+    assert (linked_count, failed_count) == (2, 1)
+    assert not journal.isLinked("row_2")
+    assert stand_in.resources["subject_sets"][subject_set["id"]]["links"]["subjects"] == subject_ids
+    journal.close()
+
+def test_streamed_subjects_are_linked_without_membership_checks(stand_in, spout):
+    project = spout.findProject(stand_in.createProject()["id"])
+    subject_set = spout.findSubjectSet(stand_in.createSubjectSet(project.id)["id"])
+    rows = spout.iterateSubjectsFromData(Data({"f1": ""}, {"TARGET ID": index}) for index in range(30))
+
+    stand_in.resetRequestCounts()
+    assert spout.streamSubjects(rows, project, subject_set, batch_size=10) == (30, 0)
+
+    assert stand_in.request_counts[("POST", "subject_sets")] == 3
+    assert ("GET", "set_member_subjects") not in stand_in.request_counts
+    assert len(stand_in.resources["subject_sets"][subject_set.id]["links"]["subjects"]) == 30
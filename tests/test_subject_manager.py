@@ -0,0 +1,112 @@
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("tkinter")
+pytest.importorskip("PIL")
+pytest.importorskip("panoptes_client")
+
+from unWISE_verse.SubjectManager import GIFPrefetcher, SubjectManager
+from unWISE_verse.SubjectStore import SubjectStore
+
+class BlockingSubjectManager:
+    """
+    Stands in for a SubjectManager whose GIFs are generated only once they are released.
+    """
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.generated_subject_ids = []
+
+    def generateSubjectGIF(self, subject_id):
+        self.started.set()
+        self.release.wait()
+        self.generated_subject_ids.append(subject_id)
+
+def test_cancel_waits_for_the_gif_being_prefetched():
+    subject_manager = BlockingSubjectManager()
+    prefetcher = GIFPrefetcher(subject_manager)
+    prefetcher.prefetch(["1", "2", "3"])
+    assert subject_manager.started.wait(timeout=5)
+
+    cancelled = threading.Event()
+    cancel_thread = threading.Thread(target=lambda: (prefetcher.cancel(), cancelled.set()))
+    cancel_thread.start()
+
+    # The cancellation can't finish while a GIF is still being prefetched.
+    assert not cancelled.wait(timeout=0.2)
+
+    subject_manager.release.set()
+    cancel_thread.join(timeout=5)
+
+    # Only the GIF which was in flight is generated, and the pending subjects are dropped.
+    assert cancelled.is_set()
+    assert subject_manager.generated_subject_ids == ["1"]
+    assert prefetcher.pending_subject_ids == []
+
+class Variable:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+class StandInUI:
+    """
+    Stands in for the user interface of a SubjectManager, holding the values of its collect fields.
+    """
+
+    def __init__(self, project_id, subject_set_id, request_online):
+        self.projectID = Variable(project_id)
+        self.subjectSetID = Variable(subject_set_id)
+        self.requestOnline = Variable(request_online)
+        self.messages = []
+
+    def display(self, message, level=None):
+        self.messages.append(message)
+
+class StandInSubjectSelectionContainer:
+    def __init__(self, subject_manager):
+        self.subject_manager = subject_manager
+        self.listed_subject_ids = None
+
+    def setDefaultListBox(self):
+        self.listed_subject_ids = self.subject_manager.subject_store.getSubjectIDs()
+
+def createSubjectManager(directory, spout, ui):
+    # The widgets of the subject manager aren't created, since they need a display.
+    subject_manager = SubjectManager.__new__(SubjectManager)
+    subject_manager.UI = ui
+    subject_manager.spout = spout
+    subject_manager.directory = str(directory)
+    subject_manager.subjects = []
+    subject_manager.subject_object_dict = {}
+    subject_manager.subject_store = SubjectStore()
+    subject_manager.subjects_json_filename = None
+    subject_manager.subject_selection_container = StandInSubjectSelectionContainer(subject_manager)
+    return subject_manager
+
+def test_collecting_subjects_online_then_offline_lists_them(tmp_path, stand_in, spout):
+    project = stand_in.createProject()
+    subject_set = stand_in.createSubjectSet(project["id"])
+    subject_ids = []
+    for index in range(5):
+        subject = stand_in.createResource("subjects", {"metadata": {"index": str(index)}, "locations": [{"image/png": f"frame_{index}"}], "links": {"project": project["id"], "subject_sets": [subject_set["id"]]}})
+        stand_in.resources["subject_sets"][subject_set["id"]]["links"]["subjects"].append(subject["id"])
+        subject_ids.append(subject["id"])
+
+    online_manager = createSubjectManager(tmp_path, spout, StandInUI(project["id"], subject_set["id"], True))
+    online_manager.collectSubjects()
+    assert sorted(online_manager.subject_selection_container.listed_subject_ids, key=int) == subject_ids
+    assert os.path.isfile(online_manager.subjects_json_filename)
+
+    # Collecting again online only compares the subjects with the last sync point.
+    online_manager.collectSubjects()
+    assert sorted(online_manager.subject_selection_container.listed_subject_ids, key=int) == subject_ids
+
+    offline_manager = createSubjectManager(tmp_path, spout, StandInUI(project["id"], subject_set["id"], False))
+    offline_manager.collectSubjects()
+    assert sorted(offline_manager.subject_selection_container.listed_subject_ids, key=int) == subject_ids
+    assert not any(message.startswith("Error") for message in online_manager.UI.messages + offline_manager.UI.messages)
@@ -0,0 +1,123 @@
+from Data import Data
+from unWISE_verse import UploadJournal as upload_journal_module
+from unWISE_verse.UploadJournal import UploadJournal
+
+def makeRows(*target_ids):
+    return [Data({"f1": "frame.png"}, {"TARGET ID": target_id}) for target_id in target_ids]
+
+def writeManifest(manifest_filename, rows):
+    # The journal only hashes the manifest file to detect regeneration, so its contents needn't be a real manifest.
+    manifest_filename.write_text("\n".join(str(row.getDictionary(reduced=False)) for row in rows) + "\n")
+
+def journalRows(journal, rows):
+    journal.resetRowOccurrences()
+    return [journal.getNextRowHash(row) for row in rows]
+
+def test_rows_of_a_regenerated_manifest_are_not_finished(tmp_path):
+    manifest_filename = tmp_path / "manifest.csv"
+    old_rows = makeRows(1, 2)
+    writeManifest(manifest_filename, old_rows)
+
+    journal = UploadJournal(str(manifest_filename), 1, 10)
+    journal.bindManifest(old_rows)
+    for subject_id, row_hash in enumerate(journalRows(journal, old_rows), start=100):
+        journal.recordCreated(row_hash, str(subject_id))
+        journal.recordStamped(row_hash)
+    journal.close()
+
+    new_rows = makeRows(2, 3)
+    writeManifest(manifest_filename, new_rows)
+
+    journal = UploadJournal(str(manifest_filename), 1, 10)
+    journal.bindManifest(new_rows)
+    kept_row_hash = journalRows(journal, new_rows)[0]
+    journal.close()
+
+    # Only the subject of the row which is in both manifests is kept, and the rewritten journal reloads the same way.
+    assert journal.getUnlinkedRows() == [(kept_row_hash, "101")]
+    assert UploadJournal(str(manifest_filename), 1, 10).getUnlinkedRows() == [(kept_row_hash, "101")]
+
+def test_binding_the_same_manifest_keeps_the_journal(tmp_path):
+    manifest_filename = tmp_path / "manifest.csv"
+    rows = makeRows(1, 2)
+    writeManifest(manifest_filename, rows)
+
+    journal = UploadJournal(str(manifest_filename), 1, 10)
+    journal.bindManifest(rows)
+    row_hashes = journalRows(journal, rows)
+    journal.recordCreated(row_hashes[0], "100")
+    journal.close()
+
+    # The rows of an unchanged manifest aren't read again.
+    journal = UploadJournal(str(manifest_filename), 1, 10)
+    journal.bindManifest(data_iterable=iter(()))
+    assert journal.getUnstampedRows() == [(row_hashes[0], "100")]
+
+def test_entries_are_synced_together(tmp_path, monkeypatch):
+    synced_files = []
+    monkeypatch.setattr(upload_journal_module.os, "fsync", synced_files.append)
+
+    journal = UploadJournal(str(tmp_path / "manifest.csv"), 1, 10)
+    for subject_id in range(5):
+        journal.recordCreated(f"row_{subject_id}", str(subject_id))
+
+    # The entries are flushed as they are written, but only synced to disk once the journal is closed.
+    assert len(UploadJournal(str(tmp_path / "manifest.csv"), 1, 10).getUnstampedRows()) == 5
+    assert synced_files == []
+
+    journal.close()
+    assert len(synced_files) == 1
+
+def test_identical_rows_are_hashed_by_occurrence(tmp_path):
+    rows = makeRows(1, 1, 2, 1)
+    row_hashes = [UploadJournal.getRowHash(row) for row in rows]
+    assert row_hashes[0] == row_hashes[1] == row_hashes[3]
+
+    journal = UploadJournal(str(tmp_path / "manifest.csv"), 1, 10)
+    first_pass = journalRows(journal, rows)
+
+    # Each identical row has its own hash, and another pass over the manifest hashes the rows the same way.
+    assert len(set(first_pass)) == 4
+    assert first_pass[0] == row_hashes[0] and first_pass[2] == row_hashes[2]
+    assert journalRows(journal, rows) == first_pass
+    assert list(UploadJournal.iterateRowHashes(rows)) == first_pass
+
+def test_partially_written_line_is_ignored_and_not_appended_to(tmp_path):
+    journal = UploadJournal(str(tmp_path / "manifest.csv"), 1, 10)
+    journal.recordCreated("row_1", "100")
+    journal.close()
+    with open(journal.filename, "a") as file:
+        file.write('{"event": "created", "row": "row_2", "sub')
+
+    journal = UploadJournal(str(tmp_path / "manifest.csv"), 1, 10)
+    assert journal.getUnstampedRows() == [("row_1", "100")]
+    journal.recordCreated("row_3", "300")
+    journal.close()
+
+    journal = UploadJournal(str(tmp_path / "manifest.csv"), 1, 10)
+    assert journal.getUnstampedRows() == [("row_1", "100"), ("row_3", "300")]
+
+def test_links_are_only_counted_for_the_same_subject_set(tmp_path):
+    journal = UploadJournal(str(tmp_path / "manifest.csv"), 1, 10)
+    journal.recordCreated("row_1", "100")
+    journal.recordStamped("row_1")
+    journal.recordLinked(["row_1"])
+    journal.close()
+
+    other_subject_set_journal = UploadJournal(str(tmp_path / "manifest.csv"), 1, 20)
+    assert other_subject_set_journal.isStamped("row_1")
+    assert not other_subject_set_journal.isLinked("row_1")
+    assert other_subject_set_journal.getUnlinkedRows() == [("row_1", "100")]
+
+    assert UploadJournal(str(tmp_path / "manifest.csv"), 1, 10).getUnlinkedRows() == []
+
+def test_subjects_are_only_reused_for_the_same_project(tmp_path):
+    journal = UploadJournal(str(tmp_path / "manifest.csv"), 1, 10)
+    journal.recordCreated("row_1", "100")
+    journal.recordStamped("row_1")
+    journal.close()
+
+    other_project_journal = UploadJournal(str(tmp_path / "manifest.csv"), 2, 10)
+    assert not other_project_journal.isCreated("row_1")
+    assert not other_project_journal.isStamped("row_1")
+    assert other_project_journal.getUnlinkedRows() == []
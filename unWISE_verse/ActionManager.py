@@ -3,19 +3,22 @@ import io
 import logging
 import multiprocessing
 import os.path
+import inspect
 import platform
+import queue
 import threading
 from pathlib import Path
 from time import sleep
 from tkinter import ttk
 from tkinter.scrolledtext import ScrolledText
 
-from PIL import Image
 from tqdm import tqdm
 
 from unWISE_verse.Data import Data
-from unWISE_verse.Dataset import get_available_astronomy_datasets, AstronomyDataset
+from unWISE_verse.Dataset import get_available_astronomy_datasets, AstronomyDataset, TargetFile
+from unWISE_verse.GIFExporter import exportSubjectGIFs
 from unWISE_verse.Spout import Spout
+from unWISE_verse.UploadJournal import UploadJournal
 import tkinter as tk
 
 global action_index
@@ -315,7 +318,7 @@ class GenerateManifest(Action):
 
         super().__init__(UI, self.name, function, UI_elements, disabled)
 
-    def generateManifest(self):
+    def generateManifest(self, subchunk_callback=None):
 
         dataset_dict = get_available_astronomy_datasets()
         dataset_type = dataset_dict.get(self.UI.datasetType.get(), None)
@@ -354,7 +357,7 @@ class GenerateManifest(Action):
             self.UI.display(f"Error: Dataset '{self.UI.datasetType.get()}' does not have a pre-defined mutable columns list.")
             return
 
-        metadata_target_filename = mergeMetadataAndTargetFile(metadata_dictionary=metadata_dict, target_filename=self.UI.targetFile.get())
+        metadata_target_file = mergeMetadataAndTargetFile(metadata_dictionary=metadata_dict, target_filename=self.UI.targetFile.get())
 
         dataset_dict = get_available_astronomy_datasets()
 
@@ -364,7 +367,27 @@ class GenerateManifest(Action):
             self.UI.display(f"Error: {self.UI.datasetType.get()} is not a valid dataset type.")
             return
         else:
-            dataset = dataset_type(metadata_target_filename, self.UI.manifestFile.get(), ignore_incomplete_data=self.UI.ignorePartialCutouts.get(), termination_event=self.UI.termination_event, log_queue=self.UI.logger.log_queue)
+            dataset_kwargs = {}
+            if (subchunk_callback is not None):
+                dataset_kwargs["subchunk_callback"] = subchunk_callback
+            dataset = dataset_type(metadata_target_file, self.UI.manifestFile.get(), ignore_incomplete_data=self.UI.ignorePartialCutouts.get(), termination_event=self.UI.termination_event, log_queue=self.UI.logger.log_queue, **dataset_kwargs)
+
+    def supportsSubchunkCallback(self):
+        """
+        Determine whether the selected dataset type can pass completed subchunks to a callback during collection.
+
+        Returns
+        -------
+        bool
+            True if the selected dataset type accepts a subchunk_callback argument, False otherwise.
+        """
+
+        dataset_type = get_available_astronomy_datasets().get(self.UI.datasetType.get(), None)
+
+        if (dataset_type is None):
+            return False
+
+        return "subchunk_callback" in inspect.signature(dataset_type.__init__).parameters
 
     def verifyInputs(self):
         """
@@ -444,7 +467,8 @@ class UploadManifest(StagedAction):
         UI_elements = [UI.submit_button, UI.manifest_button, UI.upload_button, UI.full_button, UI.projectID_entry, UI.subjectSetID_entry, UI.manifestFile_entry, UI.manifestFile_button]
         disabled = False
 
-        stage_names = ["Create Subjects", "Update Subjects", "Upload Subjects"]
+        # Subjects are created and linked in one streaming stage (see Spout.streamManifest).
+        stage_names = ["Upload Subjects"]
 
         super().__init__(stage_names, function, UI_elements, UI, disabled=disabled)
 
@@ -455,19 +479,17 @@ class UploadManifest(StagedAction):
             spout = Spout(login=login, display_printouts=True, progress_callback=self.UI.display, termination_event=self.UI.termination_event)
             self.UI.display("Required Zooniverse information was verified.")
 
-            self.setStage("Create Subjects")
-            subjects = spout.generateSubjects(self.UI.manifestFile.get())
-
             project = spout.findProject(self.UI.projectID.get())
+            subject_set = spout.findSubjectSet(self.UI.subjectSetID.get())
 
-            self.setStage("Update Subjects")
-            success = spout.updateSubjects(subjects, project)
-
-            if (success):
-                self.UI.display("Manifest subjects have been given unique Zooniverse IDs.")
+            # The journal lets a rerun after an interrupted upload skip the rows which were already uploaded.
+            journal = UploadJournal(self.UI.manifestFile.get(), project.id, subject_set.id)
 
             self.setStage("Upload Subjects")
-            success = spout.uploadSubjects(self.UI.subjectSetID.get(), subjects)
+            try:
+                success = spout.streamManifest(self.UI.manifestFile.get(), project, subject_set, journal=journal)
+            finally:
+                journal.close()
 
             if (success):
                 self.UI.display("Manifest subjects have been published to Zooniverse.")
@@ -572,6 +594,64 @@ class FullPipeline(CompositeAction):
     def __init__(self, UI):
         disabled = False
         super().__init__(self.name, [GenerateManifest(UI), UploadManifest(UI)], UI, disabled=disabled)
+        self.function = self.runPipeline
+
+    def runPipeline(self):
+        """
+        Generate the manifest and upload it, uploading each completed subchunk while collection continues.
+
+        Notes
+        -----
+        Completed subchunks are uploaded by a worker thread through the manifest's upload journal. Once collection
+        finishes, the upload action runs over the whole manifest and only uploads the rows the journal doesn't have,
+        such as the last partial subchunk. If the login can't be verified or the dataset type doesn't support subchunk
+        callbacks, the actions run one after the other instead.
+        """
+
+        generate_manifest, upload_manifest = self.actions
+        login = self.UI.login
+
+        if (not generate_manifest.supportsSubchunkCallback() or not Spout.verifyLogin(login)):
+            generate_manifest.execute()
+            upload_manifest.execute()
+            return
+
+        spout = Spout(login=login, display_printouts=True, progress_callback=self.UI.display, termination_event=self.UI.termination_event)
+        project = spout.findProject(self.UI.projectID.get())
+        subject_set = spout.findSubjectSet(self.UI.subjectSetID.get())
+        journal = UploadJournal(self.UI.manifestFile.get(), project.id, subject_set.id)
+
+        subchunk_queue = queue.Queue()
+
+        def queuedData():
+            while (True):
+                subchunk = subchunk_queue.get()
+                if (subchunk is None):
+                    return
+                for data in subchunk:
+                    yield data
+
+        def uploadSubchunks():
+            rows = spout.iterateSubjectsFromData(queuedData(), journal)
+            linked_count, failed_count = spout.streamSubjects(rows, project, subject_set, journal)
+            self.UI.display(f"Uploaded {linked_count} subjects while the manifest was being generated.")
+
+        # The upload thread sends its requests with the Panoptes client this thread logged in with.
+        upload_thread = threading.Thread(target=Spout.bindClient(uploadSubchunks), name="Subchunk Upload Thread")
+        upload_thread.start()
+
+        try:
+            generate_manifest.execute(subchunk_callback=subchunk_queue.put)
+        finally:
+            subchunk_queue.put(None)
+            upload_thread.join()
+            journal.close()
+
+        if (self.UI.termination_event.is_set()):
+            return
+
+        # Upload whatever the subchunk uploads didn't cover, resuming from the journal.
+        upload_manifest.execute()
 
 class CollectSubjects(Action):
     name = "Collect Subjects"
@@ -783,35 +863,39 @@ class DownloadSubjectGif(Action):
         self.UI.display(f"Downloading GIFs to {gif_directory}")
 
         speed = float(self.UI.current_action_field_inputs_dict["Speed (ms/frame)"].get())
-        total_subjects = len(selected_subjects)
-        count = 1
-        for subject_id in selected_subjects:
-            gif_filename = f"{subject_id}_speed_{speed}.gif"
-            gif_filepath = os.path.join(gif_directory, gif_filename)
-
-            self.UI.display(f"Downloading GIF for subject {subject_id} to {gif_filepath}")
-            self.UI.display(f"{self.name}:{count}/{total_subjects}", level=self.UI.logger.level_values.get("DEBUG"))
-            count += 1
-
-            filepaths = self.UI.subject_manager.getSubjectImages(subject_id)
+        ms_per_frame = int(speed)
 
-            # Open the images and store them in a list
-            images = [Image.open(image_path) for image_path in filepaths]
+        zip_filename = self.UI.current_action_field_inputs_dict["ZIP Filename"].get()
+        if(zip_filename == ''):
+            zip_filename = None
+        elif(not zip_filename.endswith(".zip")):
+            zip_filename += ".zip"
 
-            ms_per_frame = int(speed)
+        # Cached frames are read from disk and the rest are downloaded, concurrently, and the GIFs are encoded in a
+        # process pool straight from the frames in memory.
+        subject_frames = [(subject_id, self.UI.subject_manager.getSubjectFrameSources(subject_id)) for subject_id in selected_subjects]
 
-            # Save the images as a GIF
-            images[0].save(
-                gif_filepath,
-                save_all=True,
-                append_images=images[1:],
-                duration=ms_per_frame,
-                loop=0
-            )
+        def displayProgress(count, total_subjects):
+            self.UI.display(f"{self.name}:{count}/{total_subjects}", level=self.UI.logger.level_values.get("DEBUG"))
 
-            # Delete the images
-            for image_path in filepaths:
-                os.remove(image_path)
+        def displayFailure(subject_id, exception):
+            self.UI.display(f"Failed to download the GIF of subject {subject_id}: {exception}", level=self.UI.logger.level_values.get("ERROR"))
+
+        exported_count = exportSubjectGIFs(
+            subject_frames,
+            ms_per_frame,
+            gif_directory,
+            lambda subject_id: f"{subject_id}_speed_{speed}.gif",
+            zip_filename=zip_filename,
+            termination_event=self.UI.termination_event,
+            progress_callback=displayProgress,
+            failure_callback=displayFailure
+        )
+
+        if(zip_filename is not None):
+            self.UI.display(f"Downloaded {exported_count} of {len(subject_frames)} GIFs to {os.path.join(gif_directory, zip_filename)}")
+        else:
+            self.UI.display(f"Downloaded {exported_count} of {len(subject_frames)} GIFs to {gif_directory}")
 
     def verifyInputs(self):
         """
@@ -1028,37 +1112,28 @@ class Aggregate(StagedAction):
 
 # Action Helper functions
 def mergeMetadataAndTargetFile(metadata_dictionary, target_filename):
-        metadata_target_filename = target_filename.split('.')[0] + '-metadata-target.csv'
-
-        target_dict_list = []
-        with open(target_filename, newline='') as target_file:
-            reader = csv.DictReader(target_file)
-            for row in reader:
-                target_dict_list.append(row)
-
-        target_field_names = list(target_dict_list[0].keys())
-
-        metadata_field_names = list(metadata_dictionary.keys())
-
-        metadata_target_field_names = [*target_field_names, *metadata_field_names]
+        """
+        Merge the UI metadata constants with the target file.
 
-        metadata_target_dict_list = []
+        Parameters
+        ----------
+        metadata_dictionary : dict
+            The metadata field names and values to add to every target.
+        target_filename : str
+            The filename of the target file.
 
-        # If there are duplicate keys, the target dictionary will overwrite the metadata dictionary
-        for target_dict in target_dict_list:
-            metadata_target_dict = {}
-            for field_name in metadata_field_names:
-                metadata_target_dict[field_name] = metadata_dictionary[field_name]
-            for field_name in target_field_names:
-                metadata_target_dict[field_name] = target_dict[field_name]
-            metadata_target_dict_list.append(metadata_target_dict)
+        Returns
+        -------
+        metadata_target_file : TargetFile
+            The target file with the metadata applied as an overlay on each row as it is read.
 
-        with open(metadata_target_filename, "w", newline='') as metadata_targets_file:
-            writer = csv.DictWriter(metadata_targets_file, metadata_target_field_names)
-            writer.writeheader()
-            writer.writerows(metadata_target_dict_list)
+        Notes
+        -----
+        If there are duplicate keys, the target file's values are used over the metadata dictionary's.
+        No merged copy of the target file is written.
+        """
 
-        return metadata_target_filename
+        return TargetFile(target_filename, metadata_overlay=metadata_dictionary)
 
 def getMutableColumns(dataset_type):
     """
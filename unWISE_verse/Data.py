@@ -3,11 +3,83 @@ Created on June 9th 2021
 Completely refactored on December 21st 2023
 @author: Austin Humphreys
 """
+import ast
+import csv
 import re
 
 
+def decodeBool(value):
+    """
+    Decodes a boolean from its record string.
+
+    Parameters
+    ----------
+        value : str
+            The record string of the boolean.
+
+    Returns
+    -------
+        bool
+            The decoded boolean.
+    """
+
+    if(value == "True"):
+        return True
+    elif(value == "False"):
+        return False
+    else:
+        raise ValueError(f"'{value}' is not a valid boolean.")
+
+def decodeNone(value):
+    """
+    Decodes a None value from its record string.
+
+    Parameters
+    ----------
+        value : str
+            The record string of the None value.
+
+    Returns
+    -------
+        None
+    """
+
+    if(value != "" and value != "None"):
+        raise ValueError(f"'{value}' is not a valid None value.")
+
+    return None
+
+def decodeLiteral(value_type):
+    """
+    Creates a decoder for a container type which is stored as a Python literal.
+
+    Parameters
+    ----------
+        value_type : type
+            The container type to decode (tuple, list, or dict).
+
+    Returns
+    -------
+        function
+            A function which decodes a record string into an instance of the container type.
+    """
+
+    def decoder(value):
+        literal = ast.literal_eval(value)
+        if(not isinstance(literal, value_type)):
+            raise ValueError(f"'{value}' is not a valid {value_type.__name__}.")
+        return literal
+
+    return decoder
+
+
 class Data:
     privatization_symbol = "#"
+
+    # The types which can be stored in a record, along with the decoder used to parse each type from its record string.
+    record_types = {"str": str, "int": int, "float": float, "bool": bool, "NoneType": type(None), "tuple": tuple, "list": list, "dict": dict}
+    record_type_decoders = {"str": str, "int": int, "float": float, "bool": decodeBool, "NoneType": decodeNone, "tuple": decodeLiteral(tuple), "list": decodeLiteral(list), "dict": decodeLiteral(dict)}
+    record_class_pattern = re.compile(r"<class '(\w+)'>")
     def __init__(self, data, metadata=None):
         """
         Initializes a Data object, an object which holds the data and metadata of a single object.
@@ -613,6 +685,8 @@ class Data:
         Notes
         -----
         A record is a formatted version of the data and metadata dictionaries. It is used to store the data and metadata in a csv file and be able to retrieve it later with its original typing.
+        Record fields read from a csv file are parsed as Python literals, never evaluated, so only the types in Data.record_type_decoders are accepted.
+        For large files, prefer the typed record format of RecordSchema, which stores each type once in the header.
         """
 
         data = {}
@@ -622,18 +696,12 @@ class Data:
             record_field_dictionary = {}
             if(isinstance(record[key], str)):
                 try:
-                    # Check if a pattern of the form "<class '...'>" is present and replace it with the actual class
-                    if(not re.search(r"<class '.*'>", record[key])):
-                        record_field_dictionary = eval(record[key])
-                    else:
-                        class_strings = re.findall(r"<class '.*'>", record[key])
-                        # Replace the class strings with the actual class names for evaluation. Do so for each found class string.
-                        for class_string in class_strings:
-                            class_name = class_string[8:-2]
-                            record[key] = re.sub(class_string, class_name, record[key])
-                        record_field_dictionary = eval(record[key])
+                    # Replace any "<class '...'>" pattern with the quoted class name so the field is a plain literal.
+                    record_field_dictionary = ast.literal_eval(Data.record_class_pattern.sub(r"'\1'", record[key]))
                 except Exception as e:
                     raise ValueError(f"Could not evaluate record field '{key}': {e}")
+                if(not isinstance(record_field_dictionary, dict)):
+                    raise ValueError(f"Record field '{key}' is not a valid record field.")
             elif(isinstance(record[key], dict)):
                 record_field_dictionary = record[key]
             else:
@@ -642,24 +710,70 @@ class Data:
             category = record_field_dictionary["category"]
 
             if (category == "data"):
-                data_type = record_field_dictionary["type"]
-
-                if(not isinstance(data_type, type)):
-                    raise TypeError(f"Data type '{record_field_dictionary['type']}' is not a valid type.")
-
-                data[key] = data_type(record_field_dictionary["value"])
+                data_type = Data.getRecordType(record_field_dictionary["type"], "Data")
+                data[key] = Data.castRecordValue(record_field_dictionary["value"], data_type)
             elif (category == "metadata"):
-                metadata_type = record_field_dictionary["type"]
-
-                if(not isinstance(metadata_type, type)):
-                    raise TypeError(f"Metadata type '{record_field_dictionary['type']}' is not a valid type.")
-
-                metadata[key] = metadata_type(record_field_dictionary["value"])
+                metadata_type = Data.getRecordType(record_field_dictionary["type"], "Metadata")
+                metadata[key] = Data.castRecordValue(record_field_dictionary["value"], metadata_type)
             else:
                 raise ValueError(f"Category '{category}' is not a valid category.")
 
         return Data(data=data, metadata=metadata)
 
+    @staticmethod
+    def getRecordType(record_type, category_name="Data"):
+        """
+        Resolves the type of a record field from either a type or the name of a type.
+
+        Parameters
+        ----------
+            record_type : type or str
+                The type of the record field or its name, as written in a record.
+            category_name : str, optional
+                The name of the category of the record field, used for error messages. By default, it is "Data".
+
+        Returns
+        -------
+            type
+                The type of the record field.
+        """
+
+        if(isinstance(record_type, str)):
+            if(record_type not in Data.record_types):
+                raise TypeError(f"{category_name} type '{record_type}' is not a valid type.")
+            return Data.record_types[record_type]
+
+        if(not isinstance(record_type, type)):
+            raise TypeError(f"{category_name} type '{record_type}' is not a valid type.")
+
+        return record_type
+
+    @staticmethod
+    def castRecordValue(value, value_type):
+        """
+        Casts a record value to its record type.
+
+        Parameters
+        ----------
+            value : object
+                The record value.
+            value_type : type
+                The type of the record value.
+
+        Returns
+        -------
+            object
+                The record value as an instance of its type.
+        """
+
+        if(value_type is type(None)):
+            return None
+
+        if(isinstance(value, value_type)):
+            return value
+
+        return value_type(value)
+
     def getTypeDictionary(self):
         """
         Returns the combined data and metadata type dictionaries in a dictionary of the form {data: data_types, metadata: metadata_types}.
@@ -671,3 +785,284 @@ class Data:
         """
 
         return {"data": self.data_types, "metadata": self.metadata_types}
+
+    @staticmethod
+    def createFromFields(data, metadata, private_metadata_fields_dictionary):
+        """
+        Creates a Data object from field dictionaries whose names have already been validated.
+
+        Parameters
+        ----------
+            data : dict
+                The data field names and values.
+            metadata : dict
+                The reduced metadata field names and values.
+            private_metadata_fields_dictionary : dict
+                Whether each reduced metadata field name is private.
+
+        Returns
+        -------
+            Data
+                The Data object holding the provided fields.
+
+        Notes
+        -----
+        This skips the per-field name validation done by the constructor, so it should only be used when the field
+        names are known to be valid, e.g. when they come from a RecordSchema which validated them once.
+        """
+
+        data_object = Data.__new__(Data)
+        data_object.data = data
+        data_object.data_types = {key: type(value) for key, value in data.items()}
+        data_object.metadata = metadata
+        data_object.metadata_types = {key: type(value) for key, value in metadata.items()}
+        data_object.private_metadata_fields_dictionary = private_metadata_fields_dictionary
+        return data_object
+
+
+class RecordSchema:
+    column_separator = "|"
+    def __init__(self, columns):
+        """
+        Initializes a RecordSchema object, the typed layout of a record file where each column's category and type are written once in the header.
+
+        Parameters
+        ----------
+            columns : Iterable of tuples of the form (field_name, category, type_name)
+                The unreduced field name, category ("data" or "metadata"), and type name of each column.
+
+        Notes
+        -----
+        A typed record file is a CSV file whose header cells are of the form "field_name|category|type_name" and whose
+        cells are the string forms of the values. Each column is parsed by a decoder chosen once from
+        Data.record_type_decoders, so no per-cell type inference or evaluation is needed.
+        """
+
+        self.columns = []
+        self.decoders = []
+
+        data_field_names = []
+        metadata_field_names = []
+
+        for field_name, category, type_name in columns:
+            if(not isinstance(field_name, str) or field_name == ""):
+                raise TypeError(f"The record field name, {field_name}, is not a non-empty string.")
+
+            if(category == "data"):
+                data_field_names.append(field_name)
+            elif(category == "metadata"):
+                metadata_field_names.append(field_name)
+            else:
+                raise ValueError(f"Category '{category}' is not a valid category.")
+
+            if(type_name not in Data.record_type_decoders):
+                raise TypeError(f"Record type '{type_name}' of field '{field_name}' is not a valid type.")
+
+            self.columns.append((field_name, category, type_name))
+            self.decoders.append(Data.record_type_decoders[type_name])
+
+        # Validate the field names once using an empty Data object, rather than once per decoded row.
+        template = Data(data_field_names, metadata_field_names)
+        self.data_field_names = template.getDataFieldNames()
+        self.private_metadata_fields_dictionary = template.private_metadata_fields_dictionary
+
+        self.keys = []
+        for field_name, category, type_name in self.columns:
+            if(category == "metadata"):
+                self.keys.append(template.reduceFieldName(field_name))
+            else:
+                self.keys.append(field_name)
+
+    def __eq__(self, other):
+        """
+        Returns whether two RecordSchema objects have the same columns.
+        """
+
+        return isinstance(other, RecordSchema) and self.columns == other.columns
+
+    def __repr__(self):
+        """
+        Returns a string representation of the RecordSchema object.
+        """
+
+        return "RecordSchema(" + str(self.columns) + ")"
+
+    @classmethod
+    def fromData(cls, data):
+        """
+        Creates a RecordSchema from the fields and types of a Data object.
+
+        Parameters
+        ----------
+            data : Data object
+                The Data object to take the fields and types from.
+
+        Returns
+        -------
+            RecordSchema
+                The schema of the Data object.
+        """
+
+        columns = []
+
+        for metadata_field_name in data.getMetadataFieldNames(reduced=False):
+            metadata_type = data.metadata_types[data.reduceFieldName(metadata_field_name)]
+            columns.append((metadata_field_name, "metadata", metadata_type.__name__))
+
+        for data_field_name in data.getDataFieldNames():
+            columns.append((data_field_name, "data", data.data_types[data_field_name].__name__))
+
+        return cls(columns)
+
+    @classmethod
+    def fromHeader(cls, header):
+        """
+        Creates a RecordSchema from the header of a typed record file.
+
+        Parameters
+        ----------
+            header : Iterable of str
+                The header cells, each of the form "field_name|category|type_name".
+
+        Returns
+        -------
+            RecordSchema
+                The schema described by the header.
+        """
+
+        columns = []
+        for header_cell in header:
+            column = header_cell.rsplit(cls.column_separator, 2)
+            if(len(column) != 3):
+                raise ValueError(f"Header cell '{header_cell}' is not of the form 'field_name{cls.column_separator}category{cls.column_separator}type_name'.")
+            columns.append(tuple(column))
+
+        return cls(columns)
+
+    def getHeader(self):
+        """
+        Returns the header cells of the schema.
+
+        Returns
+        -------
+            list of str
+                The header cells, each of the form "field_name|category|type_name".
+        """
+
+        return [self.column_separator.join(column) for column in self.columns]
+
+    def encode(self, data):
+        """
+        Encodes a Data object into the cells of a typed record row.
+
+        Parameters
+        ----------
+            data : Data object
+                The Data object to encode. It must have the fields of the schema.
+
+        Returns
+        -------
+            list of str
+                The cells of the row, in column order.
+        """
+
+        row = []
+        for field_name, category, type_name in self.columns:
+            value = data[field_name]
+            if(type(value).__name__ != type_name):
+                raise TypeError(f"Record field '{field_name}' has type '{type(value).__name__}', but the schema requires '{type_name}'.")
+            if(value is None):
+                row.append("")
+            else:
+                row.append(str(value))
+        return row
+
+    def decode(self, row):
+        """
+        Decodes the cells of a typed record row into a Data object.
+
+        Parameters
+        ----------
+            row : Iterable of str
+                The cells of the row, in column order.
+
+        Returns
+        -------
+            Data
+                The decoded Data object.
+        """
+
+        data = {}
+        metadata = {}
+
+        for (field_name, category, type_name), key, decoder, cell in zip(self.columns, self.keys, self.decoders, row):
+            try:
+                value = decoder(cell)
+            except Exception as e:
+                raise ValueError(f"Could not decode record field '{field_name}' as {type_name}: {e}")
+
+            if(category == "data"):
+                data[key] = value
+            else:
+                metadata[key] = value
+
+        return Data.createFromFields(data, metadata, dict(self.private_metadata_fields_dictionary))
+
+    @classmethod
+    def writeRecords(cls, filename, data_list, schema=None):
+        """
+        Writes Data objects to a typed record file.
+
+        Parameters
+        ----------
+            filename : str
+                The filename of the typed record CSV file.
+            data_list : Iterable of Data objects
+                The Data objects to write. They must all share the same fields and types.
+            schema : RecordSchema, optional
+                The schema to write with. By default, it is taken from the first Data object.
+
+        Returns
+        -------
+            RecordSchema
+                The schema the file was written with.
+        """
+
+        with open(filename, "w", newline='') as file:
+            writer = csv.writer(file)
+            if(schema is not None):
+                writer.writerow(schema.getHeader())
+
+            for data in data_list:
+                if(schema is None):
+                    schema = cls.fromData(data)
+                    writer.writerow(schema.getHeader())
+                writer.writerow(schema.encode(data))
+
+        return schema
+
+    @classmethod
+    def readRecords(cls, filename):
+        """
+        Reads Data objects from a typed record file, one row at a time.
+
+        Parameters
+        ----------
+            filename : str
+                The filename of the typed record CSV file.
+
+        Yields
+        ------
+            Data
+                The Data object of each row.
+        """
+
+        with open(filename, "r", newline='') as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if(header is None):
+                return
+
+            schema = cls.fromHeader(header)
+            for row in reader:
+                yield schema.decode(row)
@@ -1,8 +1,10 @@
 import atexit
 import csv
 import hashlib
+import io
 import logging
 import math
+import mmap
 import tkinter
 from datetime import datetime
 from logging.handlers import QueueListener, QueueHandler
@@ -13,6 +15,8 @@ import random
 import re
 import signal
 import time
+from array import array
+from collections import OrderedDict
 
 import astropy
 from astropy import time as astropy_time
@@ -22,6 +26,7 @@ from flipbooks import unWISEQuery, WiseViewQuery
 from statistics import mean
 
 from flipbooks.LegacySurveyQuery import LegacySurveyQuery
+import numpy as np
 from tqdm import tqdm
 
 from Data import Data
@@ -38,8 +43,436 @@ def empty_progress_callback(text):
 
 # TODO: Implement a way to allow some metadata values to be empty or conditionally empty.
 
+class ManifestSchema:
+    data_field_pattern = re.compile(r"^f\d+$")
+    def __init__(self, field_names):
+        """
+        Initializes a ManifestSchema object, the classification of a manifest's columns into data and metadata fields.
+
+        Parameters
+        ----------
+            field_names : Iterable of str
+                The field names of the manifest header, in column order.
+
+        Notes
+        -----
+            Fields of the form "fn", where n is an integer, are data fields and the rest are metadata fields.
+            The header is classified and validated once, so rows can be turned into Data objects without repeating
+            that work for every row.
+        """
+
+        self.field_names = list(field_names)
+        self.field_count = len(self.field_names)
+
+        self.data_field_names = []
+        self.data_field_indices = []
+        self.metadata_field_names = []
+        self.metadata_field_indices = []
+
+        for index, field_name in enumerate(self.field_names):
+            if (self.data_field_pattern.match(field_name)):
+                self.data_field_names.append(field_name)
+                self.data_field_indices.append(index)
+            else:
+                self.metadata_field_names.append(field_name)
+                self.metadata_field_indices.append(index)
+
+        # Validate the field names once with an empty Data object.
+        template = Data(self.data_field_names, self.metadata_field_names)
+        self.reduced_metadata_field_names = template.getMetadataFieldNames()
+        self.private_metadata_fields_dictionary = template.private_metadata_fields_dictionary
+
+    def __eq__(self, other):
+        """
+        Returns whether two ManifestSchema objects have the same field names in the same order.
+        """
+
+        return isinstance(other, ManifestSchema) and self.field_names == other.field_names
+
+    def getDataFieldNames(self):
+        """
+        Returns the names of the data fields.
+        """
+
+        return list(self.data_field_names)
+
+    def getMetadataFieldNames(self, reduced=True):
+        """
+        Returns the names of the metadata fields.
+        """
+
+        if(reduced):
+            return list(self.reduced_metadata_field_names)
+        else:
+            return list(self.metadata_field_names)
+
+    def createData(self, row):
+        """
+        Creates a Data object from a row of the manifest.
+
+        Parameters
+        ----------
+            row : list of str
+                The cells of the row, in the same column order as the header.
+
+        Returns
+        -------
+            Data
+                The Data object of the row.
+        """
+
+        # Match csv.DictReader, which fills missing cells with None and drops extra cells from the fields.
+        if (len(row) < self.field_count):
+            row = row + [None] * (self.field_count - len(row))
+
+        data = {field_name: row[index] for field_name, index in zip(self.data_field_names, self.data_field_indices)}
+        metadata = {field_name: row[index] for field_name, index in zip(self.reduced_metadata_field_names, self.metadata_field_indices)}
+
+        return Data.createFromFields(data, metadata, dict(self.private_metadata_fields_dictionary))
+
+    @classmethod
+    def fromManifest(cls, filename):
+        """
+        Creates a ManifestSchema from the header of a manifest CSV file.
+
+        Parameters
+        ----------
+            filename : str
+                The manifest filename.
+
+        Returns
+        -------
+            ManifestSchema or None
+                The schema of the manifest, or None if the manifest does not exist or is empty.
+        """
+
+        if (not os.path.exists(filename)):
+            return None
+
+        if (BinaryManifest.isBinaryManifest(filename)):
+            return cls(BinaryManifest(filename).field_names)
+
+        with open(filename, "r", newline='') as file:
+            header = next(csv.reader(file), None)
+
+        if (header is None):
+            return None
+
+        return cls(header)
+
+class ManifestIndex:
+    index_file_extension = ".index"
+    def __init__(self, manifest_filename, save_index = True):
+        """
+        Initializes a ManifestIndex object, a row-offset index over a memory-mapped manifest CSV file.
+
+        Parameters
+        ----------
+            manifest_filename : str
+                The manifest filename of the CSV file containing the Zooniverse subject data and metadata.
+            save_index : bool, optional
+                Whether to save a newly built index next to the manifest, so it can be loaded instead of rebuilt the
+                next time. By default, it is True.
+
+        Notes
+        -----
+            The index is saved as manifest_filename + ".index" and stores the manifest's size and modification time,
+            so a stale index is rebuilt automatically. The manifest should not be modified while the index is open.
+        """
+
+        self.manifest_filename = manifest_filename
+        self.index_filename = manifest_filename + self.index_file_extension
+
+        stat = os.stat(manifest_filename)
+        self.manifest_size = stat.st_size
+        self.manifest_mtime = stat.st_mtime_ns
+
+        self.row_offsets = self.loadIndex()
+        if(self.row_offsets is None):
+            self.row_offsets = self.buildIndex()
+            if(save_index):
+                self.saveIndex()
+
+        self.file = open(manifest_filename, "rb")
+        if(self.manifest_size > 0):
+            self.memory_map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            # Empty files cannot be memory-mapped.
+            self.memory_map = b""
+
+    def __len__(self):
+        """
+        Returns the number of rows in the manifest, excluding the header.
+        """
+
+        return len(self.row_offsets) - 1
+
+    def buildIndex(self):
+        """
+        Scans the manifest and returns the byte offsets of the start of each row followed by the end of the file.
+
+        Returns
+        -------
+            array
+                The row offsets, where the last offset is the size of the manifest.
+
+        Notes
+        -----
+            Newlines inside quoted cells don't end a row, and blank lines are skipped, as csv.reader does.
+        """
+
+        row_offsets = array("Q")
+
+        with open(self.manifest_filename, "rb") as file:
+            offset = 0
+            in_quotes = False
+            header_read = False
+            for line in file:
+                if(not in_quotes):
+                    if(header_read and line.strip() != b""):
+                        row_offsets.append(offset)
+                    header_read = True
+
+                # A quote character toggles the quoted state, and an escaped quote ("") toggles it twice.
+                if(line.count(b'"') % 2 == 1):
+                    in_quotes = not in_quotes
+
+                offset += len(line)
+
+        row_offsets.append(self.manifest_size)
+        return row_offsets
+
+    def loadIndex(self):
+        """
+        Loads the saved index of the manifest.
+
+        Returns
+        -------
+            array or None
+                The row offsets, or None if there is no saved index or it doesn't match the manifest.
+        """
+
+        if(not os.path.exists(self.index_filename)):
+            return None
+
+        row_offsets = array("Q")
+        try:
+            with open(self.index_filename, "rb") as file:
+                row_offsets.frombytes(file.read())
+        except (OSError, ValueError):
+            return None
+
+        # The first two values are the manifest's size and modification time when the index was built.
+        if(len(row_offsets) < 3 or row_offsets[0] != self.manifest_size or row_offsets[1] != self.manifest_mtime):
+            return None
+
+        return row_offsets[2:]
+
+    def saveIndex(self):
+        """
+        Saves the index of the manifest, if the manifest's directory is writable.
+        """
+
+        index = array("Q", [self.manifest_size, self.manifest_mtime])
+        index.extend(self.row_offsets)
+        try:
+            with open(self.index_filename, "wb") as file:
+                index.tofile(file)
+        except OSError:
+            pass
+
+    def readRow(self, index):
+        """
+        Reads a row of the manifest.
+
+        Parameters
+        ----------
+            index : int
+                The index of the row, excluding the header.
+
+        Returns
+        -------
+            list of str
+                The cells of the row.
+        """
+
+        text = self.memory_map[self.row_offsets[index]:self.row_offsets[index + 1]].decode("utf-8")
+        return next(csv.reader(io.StringIO(text, newline='')), [])
+
+    def close(self):
+        """
+        Closes the memory map and the manifest file.
+        """
+
+        if(isinstance(self.memory_map, mmap.mmap)):
+            self.memory_map.close()
+        self.file.close()
+
+class BinaryManifest:
+    file_extension = ".npy"
+    dtype_codes = {bool: "?", int: "i8", float: "f8"}
+    row_block_size = 4096
+    def __init__(self, filename, memory_map = True):
+        """
+        Initializes a BinaryManifest object, a columnar manifest stored as a NumPy structured array.
+
+        Parameters
+        ----------
+            filename : str
+                The filename of the binary manifest.
+            memory_map : bool, optional
+                Whether to memory-map the binary manifest instead of reading it into memory. By default, it is True.
+
+        Notes
+        -----
+            The array's field names are the manifest's field names and its dtype is the typed schema, so columns whose
+            values are all booleans, all integers, or all floats load as their types without parsing strings. Every
+            other column is stored as a string column, with None stored as an empty string, as in the CSV manifest.
+        """
+
+        self.filename = filename
+        self.array = np.load(filename, mmap_mode="r" if memory_map else None, allow_pickle=False)
+        self.field_names = list(self.array.dtype.names)
+
+    def __len__(self):
+        """
+        Returns the number of rows in the binary manifest.
+        """
+
+        return len(self.array)
+
+    def readRow(self, index):
+        """
+        Reads a row of the binary manifest.
+
+        Parameters
+        ----------
+            index : int
+                The index of the row.
+
+        Returns
+        -------
+            list
+                The values of the row as Python objects.
+        """
+
+        return list(self.array[index].tolist())
+
+    def readRows(self):
+        """
+        Reads the rows of the binary manifest in order, a block of rows at a time.
+
+        Yields
+        ------
+            list
+                The values of each row as Python objects.
+        """
+
+        for start in range(0, len(self.array), self.row_block_size):
+            for row in self.array[start:start + self.row_block_size].tolist():
+                yield list(row)
+
+    def close(self):
+        """
+        Releases the binary manifest's array.
+        """
+
+        self.array = None
+
+    @classmethod
+    def isBinaryManifest(cls, filename):
+        """
+        Returns whether a manifest filename refers to a binary manifest.
+        """
+
+        return filename.endswith(cls.file_extension)
+
+    @classmethod
+    def getColumnDtype(cls, values):
+        """
+        Determines the dtype of a column from its values.
+
+        Parameters
+        ----------
+            values : list
+                The values of the column.
+
+        Returns
+        -------
+            str
+                The NumPy dtype code of the column.
+        """
+
+        value_types = set(type(value) for value in values)
+
+        if(len(value_types) == 1):
+            value_type = value_types.pop()
+            if(value_type is int and not all(-2**63 <= value < 2**63 for value in values)):
+                return f"U{max(len(str(value)) for value in values)}"
+            if(value_type in cls.dtype_codes):
+                return cls.dtype_codes[value_type]
+
+        return f"U{max([1] + [len(str(value)) for value in values if value is not None])}"
+
+    @classmethod
+    def write(cls, filename, field_names, rows):
+        """
+        Writes rows to a binary manifest.
+
+        Parameters
+        ----------
+            filename : str
+                The filename of the binary manifest.
+            field_names : list of str
+                The field names of the manifest, in column order.
+            rows : list of lists
+                The values of each row, in the same order as the field names.
+        """
+
+        columns = list(zip(*rows)) if len(rows) > 0 else [() for field_name in field_names]
+
+        dtype = []
+        for field_name, values in zip(field_names, columns):
+            column_dtype = cls.getColumnDtype(values)
+            dtype.append((field_name, column_dtype))
+
+        string_columns = [i for i, (field_name, column_dtype) in enumerate(dtype) if column_dtype.startswith("U")]
+        if(len(string_columns) > 0):
+            rows = [list(row) for row in rows]
+            for row in rows:
+                for i in string_columns:
+                    row[i] = "" if row[i] is None else str(row[i])
+
+        array = np.array([tuple(row) for row in rows], dtype=dtype)
+
+        with open(filename, "wb") as file:
+            np.save(file, array, allow_pickle=False)
+
+    @classmethod
+    def exportToCSV(cls, filename, manifest_filename):
+        """
+        Exports a binary manifest to a CSV manifest for tools which only read CSV, such as Zooniverse's.
+
+        Parameters
+        ----------
+            filename : str
+                The filename of the binary manifest.
+            manifest_filename : str
+                The filename of the CSV manifest to write.
+        """
+
+        binary_manifest = cls(filename)
+
+        with open(manifest_filename, "w", newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(binary_manifest.field_names)
+            for row in binary_manifest.readRows():
+                writer.writerow(row)
+
+        binary_manifest.close()
+
 class Dataset:
-    def __init__(self, data_list: Union[List[Data], List[dict]], uniform_data = False, uniform_metadata = False, progress_callback: Callable = None):
+    def __init__(self, data_list: Union[List[Data], List[dict]], uniform_data = False, uniform_metadata = False, progress_callback: Callable = None, schema = None):
         """
         Initializes a Dataset object, an object which stores a list of data and metadata dictionaries.
 
@@ -53,6 +486,9 @@ class Dataset:
                 Used to determine whether the metadata field names are uniform across all data objects. By default, it is False.
             progress_callback : function, optional
                 A function which takes in a string and displays it to the user for progress updates. By default, it is None.
+            schema : ManifestSchema, optional
+                The schema shared by every data object in the data list. If it is provided, the uniform field checks are
+                done once on the schema instead of on every data object. By default, it is None.
 
         Notes
         -----
@@ -87,27 +523,45 @@ class Dataset:
 
         self.uniform_data = uniform_data
         self.uniform_metadata = uniform_metadata
+        self.schema = schema
 
-        if(len(self.data_list) > 0):
-            if (uniform_data):
-                data_field_names = self.data_list[0].getDataFieldNames()
-                for data in self.data_list:
+        # Every data object created from a schema has exactly the schema's fields, so the fields are uniform by construction.
+        if(len(self.data_list) > 0 and self.schema is None):
+            self.verifyUniformFields(self.data_list)
+
+    def verifyUniformFields(self, data_list):
+        """
+        Verifies that the data and metadata field names are uniform across the data objects, if required.
+
+        Parameters
+        ----------
+            data_list : Iterable of Data objects
+                The data objects to verify.
+        """
+
+        data_field_names = None
+        metadata_field_names = None
+
+        for data in data_list:
+            if (self.uniform_data):
+                if (data_field_names is None):
+                    data_field_names = data.getDataFieldNames()
+                elif (data.getDataFieldNames() != data_field_names):
                     mismatched_field_names = []
-                    if (data.getDataFieldNames() != data_field_names):
-                        for field_name in data.getDataFieldNames():
-                            if (field_name not in data_field_names):
-                                mismatched_field_names.append(field_name)
-                        raise ValueError("The data field names are not uniform across all data objects with the following mismatched field names: " + str(mismatched_field_names))
-
-            if (uniform_metadata):
-                metadata_field_names = self.data_list[0].getMetadataFieldNames()
-                for data in self.data_list:
-                    if (data.getMetadataFieldNames() != metadata_field_names):
-                        mismatched_field_names = []
-                        for field_name in data.getMetadataFieldNames():
-                            if (field_name not in metadata_field_names):
-                                mismatched_field_names.append(field_name)
-                        raise ValueError("The metadata field names are not uniform across all data objects with the following mismatched field names: " + str(mismatched_field_names))
+                    for field_name in data.getDataFieldNames():
+                        if (field_name not in data_field_names):
+                            mismatched_field_names.append(field_name)
+                    raise ValueError("The data field names are not uniform across all data objects with the following mismatched field names: " + str(mismatched_field_names))
+
+            if (self.uniform_metadata):
+                if (metadata_field_names is None):
+                    metadata_field_names = data.getMetadataFieldNames()
+                elif (data.getMetadataFieldNames() != metadata_field_names):
+                    mismatched_field_names = []
+                    for field_name in data.getMetadataFieldNames():
+                        if (field_name not in metadata_field_names):
+                            mismatched_field_names.append(field_name)
+                    raise ValueError("The metadata field names are not uniform across all data objects with the following mismatched field names: " + str(mismatched_field_names))
 
     def __len__(self):
         """
@@ -128,13 +582,13 @@ class Dataset:
         """
 
         if(self.uniform_data and self.uniform_metadata):
-            return "Dataset with " + str(len(self.data_list)) + " data objects with uniform data and metadata fields: " + str(self.data_list[0].getDataFieldNames()) + " and " + str(self.data_list[0].getMetadataFieldNames()) + ", respectively."
+            return "Dataset with " + str(len(self)) + " data objects with uniform data and metadata fields: " + str(self[0].getDataFieldNames()) + " and " + str(self[0].getMetadataFieldNames()) + ", respectively."
         elif(self.uniform_data):
-            return "Dataset with " + str(len(self.data_list)) + " data objects with uniform data fields: " + str(self.data_list[0].getDataFieldNames()) + "."
+            return "Dataset with " + str(len(self)) + " data objects with uniform data fields: " + str(self[0].getDataFieldNames()) + "."
         elif(self.uniform_metadata):
-            return "Dataset with " + str(len(self.data_list)) + " data objects with uniform metadata fields: " + str(self.data_list[0].getMetadataFieldNames()) + "."
+            return "Dataset with " + str(len(self)) + " data objects with uniform metadata fields: " + str(self[0].getMetadataFieldNames()) + "."
         else:
-            return "Dataset with " + str(len(self.data_list)) + " data objects."
+            return "Dataset with " + str(len(self)) + " data objects."
 
     def __repr__(self):
         """
@@ -147,10 +601,10 @@ class Dataset:
         Returns a list of dictionaries from the data objects in the dataset.
         """
 
-        return [data.getDictionary(reduced=False) for data in self.data_list]
+        return [data.getDictionary(reduced=False) for data in self]
 
 class ZooniverseDataset(Dataset):
-    def __init__(self, manifest_filename, uniform_data = False, uniform_metadata = False, progress_callback = None):
+    def __init__(self, manifest_filename, uniform_data = False, uniform_metadata = False, progress_callback = None, lazy = False, cache_size = 1024):
         """
         Initializes a ZooniverseDataset object, an object which stores a list of data objects meant to be used for Zooniverse projects.
 
@@ -164,12 +618,95 @@ class ZooniverseDataset(Dataset):
                 Used to determine whether the metadata field names are uniform across all data objects. By default, it is False.
             progress_callback : function, optional
                 A function which takes in a string and displays it to the user for progress updates. By default, it is None.
+            lazy : bool, optional
+                Whether to parse rows on demand from a memory-mapped, indexed manifest instead of loading every row up
+                front. By default, it is False.
+            cache_size : int, optional
+                The number of most recently used rows to keep decoded in lazy mode. By default, it is 1024.
+
+        Notes
+        -----
+            To read a manifest once without holding every row in memory, use ZooniverseDataset.iterateManifest instead.
+            In lazy mode, the dataset holds the manifest open until close() is called.
+            A manifest filename ending in ".npy" is loaded as a binary manifest (see BinaryManifest).
         """
         self.manifest_filename = manifest_filename
+        self.lazy = lazy
+        self.manifest_index = None
+
+        schema = ManifestSchema.fromManifest(manifest_filename)
+
+        if(self.lazy and schema is not None):
+            if(BinaryManifest.isBinaryManifest(manifest_filename)):
+                self.manifest_index = BinaryManifest(manifest_filename)
+            else:
+                self.manifest_index = ManifestIndex(manifest_filename)
+            self.cache_size = cache_size
+            self.row_cache = OrderedDict()
+            data_list = []
+        else:
+            data_list = self.loadDataFromManifest(manifest_filename)
+
+        super().__init__(data_list, uniform_data, uniform_metadata, progress_callback, schema=schema)
+
+    def __len__(self):
+        """
+        Overloads the len() function for the ZooniverseDataset object.
+        """
+
+        if(self.manifest_index is not None):
+            return len(self.manifest_index)
+        else:
+            return super().__len__()
+
+    def __getitem__(self, index):
+        """
+        Overloads the [] operator for the ZooniverseDataset object.
+        """
+
+        if(self.manifest_index is None):
+            return super().__getitem__(index)
+
+        if(isinstance(index, slice)):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if(index < 0):
+            index += len(self)
+        if(index < 0 or index >= len(self)):
+            raise IndexError("ZooniverseDataset index out of range")
+
+        if(index in self.row_cache):
+            self.row_cache.move_to_end(index)
+            return self.row_cache[index]
+
+        data = self.schema.createData(self.manifest_index.readRow(index))
 
-        data_list = self.loadDataFromManifest(manifest_filename)
+        if(self.cache_size > 0):
+            self.row_cache[index] = data
+            if(len(self.row_cache) > self.cache_size):
+                self.row_cache.popitem(last=False)
 
-        super().__init__(data_list, uniform_data, uniform_metadata, progress_callback)
+        return data
+
+    def __repr__(self):
+        """
+        Overloads the repr() function for the ZooniverseDataset object.
+        """
+
+        if(self.manifest_index is not None):
+            return f"ZooniverseDataset({self.manifest_filename!r}, lazy=True) with {len(self)} rows"
+        else:
+            return super().__repr__()
+
+    def close(self):
+        """
+        Closes the memory-mapped manifest of a lazy ZooniverseDataset.
+        """
+
+        if(self.manifest_index is not None):
+            self.manifest_index.close()
+            self.manifest_index = None
+            self.row_cache.clear()
 
     def loadDataFromManifest(self, filename):
         """
@@ -181,41 +718,86 @@ class ZooniverseDataset(Dataset):
                 The manifest filename of the Zooniverse subject data and metadata CSV file.
         """
 
-        data_list = []
+        return list(self.iterateManifest(filename))
+
+    @staticmethod
+    def iterateManifest(filename):
+        """
+        Iterates over the rows of a manifest CSV file as data objects, one row at a time.
+
+        Parameters
+        ----------
+            filename : str
+                The manifest filename of the Zooniverse subject data and metadata CSV file.
+
+        Yields
+        ------
+            Data
+                The data object of each row of the manifest.
+
+        Notes
+        -----
+            The header is classified into data and metadata fields once, and only one row is held in memory at a time.
+            If the file doesn't exist, nothing is yielded. Binary manifests are read transparently.
+        """
 
-        # If the file doesn't exist return an empty list
         if (not os.path.exists(filename)):
-            return data_list
+            return
+
+        if (BinaryManifest.isBinaryManifest(filename)):
+            binary_manifest = BinaryManifest(filename)
+            schema = ManifestSchema(binary_manifest.field_names)
+            for row in binary_manifest.readRows():
+                yield schema.createData(row)
+            binary_manifest.close()
+            return
+
+        with open(filename, "r", newline='') as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+
+            if (header is None):
+                return
+
+            schema = ManifestSchema(header)
 
-        with open(filename, "r") as file:
-            reader = csv.DictReader(file)
             for row in reader:
+                # Skip blank lines, as csv.DictReader does.
+                if (len(row) == 0):
+                    continue
 
-                # Find all fields with are of the form "fn" where n is an integer.
-                # These fields are the data fields and the rest are the metadata fields.
-                data_field_names = []
-                metadata_field_names = []
-                for field_name in row.keys():
-                    if (re.match(r"^f\d+$", field_name)):
-                        data_field_names.append(field_name)
-                    else:
-                        metadata_field_names.append(field_name)
+                yield schema.createData(row)
 
-                data = {}
-                metadata = {}
+    @staticmethod
+    def countManifestRows(filename):
+        """
+        Counts the rows of a manifest CSV file without creating data objects.
 
-                for data_field_name in data_field_names:
-                    data[data_field_name] = row[data_field_name]
+        Parameters
+        ----------
+            filename : str
+                The manifest filename of the Zooniverse subject data and metadata CSV file.
 
-                for metadata_field_name in metadata_field_names:
-                    metadata[metadata_field_name] = row[metadata_field_name]
+        Returns
+        -------
+            int
+                The number of rows in the manifest, excluding the header.
+        """
 
-                data_list.append(Data(data, metadata))
+        if (not os.path.exists(filename)):
+            return 0
 
-        return data_list
+        if (BinaryManifest.isBinaryManifest(filename)):
+            return len(BinaryManifest(filename))
+
+        with open(filename, "r", newline='') as file:
+            reader = csv.reader(file)
+            if (next(reader, None) is None):
+                return 0
+            return sum(1 for row in reader if len(row) != 0)
 
     @classmethod
-    def generateManifest(cls, manifest_filename, data_list):
+    def generateManifest(cls, manifest_filename, data_list, binary = False):
         """
         Generates a manifest CSV file from a list of data objects.
 
@@ -225,6 +807,13 @@ class ZooniverseDataset(Dataset):
                 The manifest filename of the CSV file containing the Zooniverse subject data and metadata.
             data_list : list
                 A list of data objects.
+            binary : bool, optional
+                Whether to also generate a binary manifest with a typed schema next to the CSV file, with the same name
+                and a ".npy" extension. By default, it is False.
+
+        Notes
+        -----
+            The CSV manifest is always generated, since Zooniverse's tools only read CSV.
         """
 
         data_field_names = []
@@ -276,6 +865,12 @@ class ZooniverseDataset(Dataset):
                         row[metadata_field_name] = data[metadata_field_name]
                     writer.writerow(row)
 
+        if(binary):
+            binary_manifest_filename = manifest_filename.split(".csv")[0] + BinaryManifest.file_extension
+            field_names = metadata_field_names + data_field_names
+            rows = [[data[field_name] for field_name in field_names] for data in valid_data if data is not None]
+            BinaryManifest.write(binary_manifest_filename, field_names, rows)
+
         # Generate the ignored manifest file.
         ignored_manifest_filename = manifest_filename.split(".csv")[0] + "_ignored.csv"
         if (len(ignored_data) > 0):
@@ -291,20 +886,95 @@ class ZooniverseDataset(Dataset):
                             row[metadata_field_name] = data[metadata_field_name]
                         writer.writerow(row)
 
+class TargetFile:
+    def __init__(self, filename, metadata_overlay = None):
+        """
+        Initializes a TargetFile object, a target list CSV file read one row at a time with constant metadata overlaid on each row.
+
+        Parameters
+        ----------
+            filename : str
+                The target filename of the CSV file containing the target list.
+            metadata_overlay : dict, optional
+                The metadata field names and values to add to every row. By default, it is None.
+
+        Notes
+        -----
+            The overlay is applied as rows are read, so no merged copy of the target file is written and only one row
+            is held in memory at a time. If a field is in both the target file and the overlay, the target file's value
+            is used. The overlay fields come after the target file's fields.
+        """
+
+        self.filename = filename
+        self.metadata_overlay = {}
+        if(metadata_overlay is not None):
+            # Store the values as the strings a CSV file would hold, so overlaid rows match rows read from a merged file.
+            for field_name, value in metadata_overlay.items():
+                self.metadata_overlay[field_name] = "" if value is None else str(value)
+
+        self.target_fieldnames = []
+        if(os.path.isfile(filename)):
+            with open(filename, "r") as file:
+                self.target_fieldnames = csv.DictReader(file).fieldnames or []
+
+        self.overlay_fieldnames = [field_name for field_name in self.metadata_overlay if field_name not in self.target_fieldnames]
+        self.fieldnames = self.target_fieldnames + self.overlay_fieldnames
+
+    def __iter__(self):
+        """
+        Iterates over the rows of the target file as dictionaries, with the metadata overlay applied.
+        """
+
+        with open(self.filename, "r") as file:
+            for row in csv.DictReader(file):
+                for field_name in self.overlay_fieldnames:
+                    row[field_name] = self.metadata_overlay[field_name]
+                yield row
+
+    def countRows(self):
+        """
+        Counts the rows of the target file, excluding the header and blank lines.
+        """
+
+        with open(self.filename, "r") as file:
+            return max(sum(1 for row in csv.reader(file) if len(row) != 0) - 1, 0)
+
+    @classmethod
+    def create(cls, target):
+        """
+        Creates a TargetFile from a target filename, or returns the target if it is already a TargetFile.
+
+        Parameters
+        ----------
+            target : str or TargetFile
+                The target filename or TargetFile.
+
+        Returns
+        -------
+            TargetFile
+                The target file.
+        """
+
+        if(isinstance(target, TargetFile)):
+            return target
+        else:
+            return cls(target)
+
 class AstronomyDataset(ZooniverseDataset):
     required_target_columns = []
     required_private_columns = []
     mutable_columns_dict = {}
     mutable_columns_keys_dict = {}
 
-    def __init__(self, target_filename, manifest_filename, dataset_name, ignore_incomplete_data = False, uniform_data = False, uniform_metadata = False, termination_event = None, log_queue = None, chunk_size = 1000, subchunk_size = 100, max_query_queue_size = 50, query_batch_number = 25):
+    def __init__(self, target_filename, manifest_filename, dataset_name, ignore_incomplete_data = False, uniform_data = False, uniform_metadata = False, termination_event = None, log_queue = None, chunk_size = 1000, subchunk_size = 100, max_query_queue_size = 50, query_batch_number = 25, subchunk_callback = None):
         """
         Initializes a AstronomyDataset object, an object which stores a list of data objects meant to be used for an Astronomy-based Zooniverse project.
 
         Parameters
         ----------
-            target_filename : str
+            target_filename : str or TargetFile
                 The target filename of the CSV file containing the target list, consisting of at least RA, DEC, and TARGET ID as columns.
+                A TargetFile can be provided to overlay constant metadata on every row of the target list.
             manifest_filename : str
                 The manifest filename of the generated CSV file containing the Zooniverse subject data and metadata.
             dataset_name : str
@@ -327,6 +997,10 @@ class AstronomyDataset(ZooniverseDataset):
                 The maximum size of the query queue. By default, it is 50.
             query_batch_number : int, optional
                 The number of queries to request in a batch. By default, it is 25.
+            subchunk_callback : function, optional
+                A function which takes in a list of Data objects. If provided, it is called from the main process with
+                the rows of each subchunk as soon as the subchunk is complete, while collection continues. By default,
+                it is None.
 
         Notes
         -----
@@ -336,6 +1010,8 @@ class AstronomyDataset(ZooniverseDataset):
             The manifest file must be a CSV file.
             Astronomy Datasets load the data and metadata from the target file with save states, such that progress will
             not be lost if the process was stopped early.
+            The rows passed to subchunk_callback are in manifest order and exclude ignored data. Rows loaded from a save
+            state are passed as well, and rows after the last complete subchunk are only written to the manifest.
         """
 
         self.dataset_name = dataset_name
@@ -357,7 +1033,10 @@ class AstronomyDataset(ZooniverseDataset):
         if(not hasattr(self, "mutable_columns_keys_dict")):
             raise NotImplementedError("The mutable_columns_keys_dict attribute must be implemented by the subclass.")
 
-        self.setColumnKeys(target_filename)
+        self.target_file = TargetFile.create(target_filename)
+        target_filename = self.target_file.filename
+
+        self.setColumnKeys(self.target_file)
 
         self.ignore_incomplete_data = ignore_incomplete_data
 
@@ -415,12 +1094,10 @@ class AstronomyDataset(ZooniverseDataset):
 
         try:
             if (png_directory_key is not None):
-                # Open the target file and read the PNG directory key.
-                with open(target_filename, "r") as file:
-                    reader = csv.DictReader(file)
-                    for row in reader:
-                        png_directory = row[png_directory_key]
-                        break
+                # Read the PNG directory key from the first row of the target file.
+                for row in self.target_file:
+                    png_directory = row[png_directory_key]
+                    break
 
                 if(Chunker.exists(id=unique_hash_id)):
                     self.chunker = Chunker.load(id=unique_hash_id)
@@ -447,10 +1124,7 @@ class AstronomyDataset(ZooniverseDataset):
         data_list = manager.list()
 
         # Find the total number of rows in the target file.
-        self.total_rows = 0
-        with open(target_filename, "r") as file:
-            reader = csv.reader(file)
-            self.total_rows = sum(1 for row in reader) - 1
+        self.total_rows = self.target_file.countRows()
 
         if(os.path.isfile(self.save_state_filename)):
             self.log("Loading saved state...", log_queue=log_queue)
@@ -470,12 +1144,18 @@ class AstronomyDataset(ZooniverseDataset):
 
         # Collect the data from the target file.
 
-        collection_process = multiprocessing.Process(target=self.collectDataFromTargetList, args=(target_filename, starting_index, termination_event, data_list, log_queue), name="Collection Process")
+        collection_process = multiprocessing.Process(target=self.collectDataFromTargetList, args=(self.target_file, starting_index, termination_event, data_list, log_queue), name="Collection Process")
         collection_process.start()
 
 
-        # Wait for the collection process to finish.
-        collection_process.join()
+        # Wait for the collection process to finish, passing each completed subchunk to the subchunk callback.
+        if(subchunk_callback is None):
+            collection_process.join()
+        else:
+            handed_count = 0
+            while(collection_process.is_alive()):
+                collection_process.join(timeout=1.0)
+                handed_count = self.handCompletedSubchunks(data_list, handed_count, subchunk_callback)
 
         collection_process_exitcode = collection_process.exitcode
 
@@ -508,6 +1188,35 @@ class AstronomyDataset(ZooniverseDataset):
 
         super().__init__(manifest_filename, uniform_data, uniform_metadata, progress_callback)
 
+    def handCompletedSubchunks(self, data_list, handed_count, subchunk_callback):
+        """
+        Passes the rows of the subchunks completed since the last call to the subchunk callback.
+
+        Parameters
+        ----------
+            data_list : multiprocessing.managers.ListProxy
+                The list of collected data objects.
+            handed_count : int
+                The number of rows of the data list which were already passed.
+            subchunk_callback : function
+                A function which takes in a list of Data objects.
+
+        Returns
+        -------
+            int
+                The number of rows of the data list which have been passed.
+        """
+
+        subchunk_size = self.chunker.subchunk_size if self.chunker.subchunk_size > 0 else self.chunker.chunk_size
+        completed_count = (len(data_list) // subchunk_size) * subchunk_size
+
+        for start in range(handed_count, completed_count, subchunk_size):
+            # Tuples of the form (flag, data) are ignored data, which is not written to the manifest.
+            subchunk = [data for data in data_list[start:start + subchunk_size] if isinstance(data, Data)]
+            subchunk_callback(subchunk)
+
+        return max(handed_count, completed_count)
+
     def retrieveSaveState(self):
         """
         Retrieves the save state of the dataset.
@@ -567,7 +1276,7 @@ class AstronomyDataset(ZooniverseDataset):
 
         Parameters
         ----------
-            target_filename : str
+            target_filename : str or TargetFile
                 The target filename of the CSV file containing the target list, consisting of at least RA, DEC, and TARGET ID as columns.
             starting_index : int, optional
                 The starting index for loading the data objects. By default, it is 0.
@@ -671,7 +1380,7 @@ class AstronomyDataset(ZooniverseDataset):
 
         Parameters
         ----------
-            target_filename : str
+            target_filename : str or TargetFile
                 The target filename of the CSV file containing the target list, consisting of at least RA, DEC, and TARGET ID as columns.
             starting_index : int
                 The starting index for loading the data objects.
@@ -685,32 +1394,31 @@ class AstronomyDataset(ZooniverseDataset):
                 A multiprocessing.Queue object which will be used to log messages. By default, it is None.
         """
 
-        max_index = None
-        with open(target_filename, "r") as file:
-            reader = csv.DictReader(file)
+        target_file = TargetFile.create(target_filename)
 
-            max_index = sum(1 for row in reader) - starting_index
+        max_index = target_file.countRows() - starting_index
 
         row_batch = []
-        with open(target_filename, "r") as file:
-            reader = csv.DictReader(file)
-
-            # Skip the first starting_index rows.
-            for i in range(starting_index):
-                next(reader)
-                # Iterate through the rows of the CSV file.
-
-            # Iterate through the rows of the CSV file and request the queries to fill the queue.
-            for index, row in enumerate(reader):
-                row_batch.append(row)
-                if(termination_event is not None and termination_event.is_set()):
-                    self.log("Terminating query requests...", log_queue)
-                    break
+        reader = iter(target_file)
+
+        # Skip the first starting_index rows.
+        for i in range(starting_index):
+            next(reader)
 
-                if ((index + 1) % batch_number == 0 or index == max_index - 1):
-                    self.requestQueryBatch(rows=row_batch, query_queue=query_queue, log_queue=log_queue)
-                    self.log(f"Received queries for rows {(index + starting_index) - len(row_batch) + 2} to {(index + starting_index) + 1}...", log_queue)
-                    row_batch = []
+        # Iterate through the rows of the CSV file and request the queries to fill the queue.
+        for index, row in enumerate(reader):
+            row_batch.append(row)
+            if(termination_event is not None and termination_event.is_set()):
+                self.log("Terminating query requests...", log_queue)
+                break
+
+            if ((index + 1) % batch_number == 0 or index == max_index - 1):
+                self.requestQueryBatch(rows=row_batch, query_queue=query_queue, log_queue=log_queue)
+                self.log(f"Received queries for rows {(index + starting_index) - len(row_batch) + 2} to {(index + starting_index) + 1}...", log_queue)
+                row_batch = []
+
+        # Close the target file if the iteration stopped early.
+        reader.close()
 
         if(termination_event is not None and not termination_event.is_set()):
             self.log("Finished requesting queries.", log_queue)
@@ -1093,15 +1801,13 @@ class AstronomyDataset(ZooniverseDataset):
 
         Parameters
         ----------
-            target_filename : str
+            target_filename : str or TargetFile
                 The target filename of the CSV file containing the target list, usually consisting of at least RA, DEC, and TARGET ID as columns.
         """
 
         keys = []
         if(target_filename is not None):
-            with open(target_filename, "r") as target_file:
-                reader = csv.DictReader(target_file)
-                keys = reader.fieldnames
+            keys = TargetFile.create(target_filename).fieldnames
 
         for key in keys:
             attribute_name = None
@@ -1174,7 +1880,7 @@ class CoolNeighborsDataset(AstronomyDataset):
                             "gridcolor": InputField.ColorSelector("Grid color", "Select a grid color"),
                             "ignore_partial_cutouts": InputField.Checkbutton("Ignore partial cutouts")}
     mutable_columns_keys_dict = {"scale": "SCALE", "fov": "FOV", "minbright": "MINBRIGHT", "maxbright": "MAXBRIGHT", "addgrid": "ADDGRID", "gridcount": "GRIDCOUNT", "gridtype": "GRIDTYPE", "gridcolor": "GRIDCOLOR", "ignore_partial_cutouts": "IGNORE_PARTIAL_CUTOUTS"}
-    def __init__(self, target_filename, manifest_filename, ignore_incomplete_data=False, termination_event=None, log_queue=None):
+    def __init__(self, target_filename, manifest_filename, ignore_incomplete_data=False, termination_event=None, log_queue=None, subchunk_callback=None):
         """
         Initializes a CoolNeighborsDataset object, an object which stores a list of data objects meant to be used for the Cool Neighbors Zooniverse project.
 
@@ -1190,6 +1896,8 @@ class CoolNeighborsDataset(AstronomyDataset):
                 A multiprocessing.Event object which can be used to terminate the process early. By default, it is None.
             log_queue : multiprocessing.Queue, optional
                 A multiprocessing.Queue object which will be used to log the progress of the data generation process. By default, it is None.
+            subchunk_callback : function, optional
+                A function which takes in the list of Data objects of each subchunk as soon as it is complete. By default, it is None.
 
         Notes
         -----
@@ -1207,7 +1915,7 @@ class CoolNeighborsDataset(AstronomyDataset):
         max_query_queue_size = 50 # Only increase this if the server/dataset you are querying can handle it.
         query_batch_number = 25 # Only increase this if the server/dataset you are querying can handle it.
 
-        super().__init__(target_filename, manifest_filename, self.dataset_name, ignore_incomplete_data, uniform_data, uniform_metadata, termination_event, log_queue, chunk_size, subchunk_size, max_query_queue_size, query_batch_number)
+        super().__init__(target_filename, manifest_filename, self.dataset_name, ignore_incomplete_data, uniform_data, uniform_metadata, termination_event, log_queue, chunk_size, subchunk_size, max_query_queue_size, query_batch_number, subchunk_callback=subchunk_callback)
 
     def generateData(self, row, query:WiseViewQuery = None, log_queue=None):
         """
@@ -1411,7 +2119,7 @@ class ExoasteroidsDataset(AstronomyDataset):
                             "image_type": InputField.OptionMenu("Select image type", str, ["Regular Image", "Difference Image", "Both"])}
     mutable_columns_keys_dict = {"scale": "SCALE", "fov": "FOV", "minbright": "MINBRIGHT", "maxbright": "MAXBRIGHT", "addgrid": "ADDGRID", "gridcount": "GRIDCOUNT", "gridtype": "GRIDTYPE", "gridcolor": "GRIDCOLOR", "ignore_partial_cutouts": "IGNORE_PARTIAL_CUTOUTS", "image_type": "IMAGE_TYPE"}
 
-    def __init__(self, target_filename, manifest_filename, ignore_incomplete_data=False, termination_event=None, log_queue=None):
+    def __init__(self, target_filename, manifest_filename, ignore_incomplete_data=False, termination_event=None, log_queue=None, subchunk_callback=None):
         """
         Initializes an ExoasteroidsDataset object, an object which stores a list of data objects meant to be used for the Exoasteroids Zooniverse project.
 
@@ -1427,6 +2135,8 @@ class ExoasteroidsDataset(AstronomyDataset):
                 A multiprocessing.Event object which can be used to terminate the process early. By default, it is None.
             log_queue : multiprocessing.Queue, optional
                 A multiprocessing.Queue object which will be used to log the progress of the data generation process. By default, it is None.
+            subchunk_callback : function, optional
+                A function which takes in the list of Data objects of each subchunk as soon as it is complete. By default, it is None.
 
         Notes
         -----
@@ -1444,7 +2154,7 @@ class ExoasteroidsDataset(AstronomyDataset):
         max_query_queue_size = 50 # Only increase this if the server/dataset you are querying can handle it.
         query_batch_number = 25 # Only increase this if the server/dataset you are querying can handle it.
 
-        super().__init__(target_filename, manifest_filename, self.dataset_name, ignore_incomplete_data, uniform_data, uniform_metadata, termination_event, log_queue, chunk_size, subchunk_size, max_query_queue_size, query_batch_number)
+        super().__init__(target_filename, manifest_filename, self.dataset_name, ignore_incomplete_data, uniform_data, uniform_metadata, termination_event, log_queue, chunk_size, subchunk_size, max_query_queue_size, query_batch_number, subchunk_callback=subchunk_callback)
 
     def generateData(self, row, query=None, log_queue=None):
         """
@@ -1695,7 +2405,7 @@ class LegacySurveyDataset(AstronomyDataset):
                             "blink": InputField.Entry("Blink", str),
                             "ignore_partial_cutouts": InputField.Checkbutton("Ignore partial cutouts")}
     mutable_columns_keys_dict = {"zoom": "ZOOM", "fov": "FOV", "layer": "LAYER", "blink": "BLINK", "ignore_partial_cutouts": "IGNORE_PARTIAL_CUTOUTS"}
-    def __init__(self, target_filename, manifest_filename, ignore_incomplete_data=False, termination_event=None, log_queue=None):
+    def __init__(self, target_filename, manifest_filename, ignore_incomplete_data=False, termination_event=None, log_queue=None, subchunk_callback=None):
         """
         Initializes a LegacySurveyDataset object, an object which stores a list of data objects meant to be used for the Legacy Surveys Zooniverse project.
 
@@ -1711,6 +2421,8 @@ class LegacySurveyDataset(AstronomyDataset):
                 A multiprocessing.Event object which can be used to terminate the process early. By default, it is None.
             log_queue : multiprocessing.Queue, optional
                 A multiprocessing.Queue object which will be used to log the progress of the data generation process. By default, it is None.
+            subchunk_callback : function, optional
+                A function which takes in the list of Data objects of each subchunk as soon as it is complete. By default, it is None.
         """
 
         uniform_data = True
@@ -1723,7 +2435,7 @@ class LegacySurveyDataset(AstronomyDataset):
         # Adjustable parameters for the query process.
         max_query_queue_size = 50
 
-        super().__init__(target_filename, manifest_filename, self.dataset_name, ignore_incomplete_data, uniform_data, uniform_metadata, termination_event, log_queue, chunk_size, subchunk_size, max_query_queue_size)
+        super().__init__(target_filename, manifest_filename, self.dataset_name, ignore_incomplete_data, uniform_data, uniform_metadata, termination_event, log_queue, chunk_size, subchunk_size, max_query_queue_size, subchunk_callback=subchunk_callback)
 
     def generateData(self, row, query=None, log_queue=None):
         """
@@ -0,0 +1,131 @@
+import os
+import threading
+from collections import OrderedDict
+
+class DiskCache:
+    def __init__(self, directory, max_bytes=512 * 1024 ** 2):
+        """
+        Thread-safe, size-bounded cache of files in a directory, such as the frames and GIFs of subjects.
+
+        Parameters
+        ----------
+        directory : str
+            The directory of the cached files. It is created if it doesn't exist.
+        max_bytes : int, optional
+            The highest total size of the cached files. The least recently used files are deleted first.
+
+        Notes
+        -----
+        Files are written to DiskCache.getFilepath and then added with DiskCache.add. The files already in the
+        directory are cached in the order they were last modified, and DiskCache.get updates the modification time of
+        a file, so that the order in which files were used persists between sessions.
+        """
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+
+        existing_files = []
+        for filename in os.listdir(directory):
+            filepath = os.path.join(directory, filename)
+            if(os.path.isfile(filepath) and not filename.endswith(".part")):
+                file_status = os.stat(filepath)
+                existing_files.append((file_status.st_mtime, filename, file_status.st_size))
+
+        for modification_time, filename, size in sorted(existing_files):
+            self.entries[filename] = size
+            self.total_bytes += size
+
+        with self.lock:
+            self.evict()
+
+    def getFilepath(self, filename):
+        """
+        Returns the filepath of a file in the cache directory, whether or not it is cached.
+        """
+
+        return os.path.join(self.directory, filename)
+
+    def get(self, filename):
+        """
+        Returns the filepath of a cached file and marks it as the most recently used, or None if it isn't cached.
+        """
+
+        with self.lock:
+            if(filename not in self.entries):
+                return None
+
+            filepath = self.getFilepath(filename)
+            if(not os.path.isfile(filepath)):
+                self.total_bytes -= self.entries.pop(filename)
+                return None
+
+            self.entries.move_to_end(filename)
+
+        try:
+            os.utime(filepath)
+        except OSError:
+            pass
+        return filepath
+
+    def add(self, filename):
+        """
+        Adds a file which was written to the cache directory as the most recently used, then deletes the least recently
+        used files until the cache fits in max_bytes. The added file is never deleted by its own addition.
+
+        Returns
+        -------
+        str
+            The filepath of the file.
+        """
+
+        filepath = self.getFilepath(filename)
+        size = os.path.getsize(filepath)
+
+        with self.lock:
+            self.total_bytes += size - self.entries.pop(filename, 0)
+            self.entries[filename] = size
+            self.evict()
+
+        return filepath
+
+    def evict(self):
+        """
+        Deletes the least recently used files until the cache fits in max_bytes, keeping the most recently used file.
+        Must be called with the lock held.
+        """
+
+        while(self.total_bytes > self.max_bytes and len(self.entries) > 1):
+            filename, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(self.getFilepath(filename))
+            except OSError:
+                pass
+
+    def remove(self, filename):
+        """
+        Deletes a cached file.
+        """
+
+        with self.lock:
+            self.total_bytes -= self.entries.pop(filename, 0)
+            try:
+                os.remove(self.getFilepath(filename))
+            except OSError:
+                pass
+
+    def clear(self):
+        """
+        Forgets every cached file, for when the cache directory was deleted.
+        """
+
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+        os.makedirs(self.directory, exist_ok=True)
@@ -0,0 +1,230 @@
+import ast
+import importlib.util
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+# The search functions imported by each worker process, by filepath and function name.
+search_functions = {}
+
+def parseSearchFunctionFile(search_function_filepath):
+    """
+    Parses a search function file, which is a .py file containing exactly one function declaration.
+
+    Parameters
+    ----------
+    search_function_filepath : str
+        The filepath of the search function file.
+
+    Returns
+    -------
+    tuple
+        A tuple of the form (function_names, vectorized), where function_names is a list of the names of the
+        functions declared in the file and vectorized is True if the first argument of the first function is
+        annotated as a DataFrame.
+
+    Notes
+    -----
+    A search function takes in a subject dictionary and returns a boolean, which determines if the subject satisfies
+    the search criteria. A vectorized search function, whose first argument is annotated as a pandas DataFrame, takes
+    in a DataFrame of the metadata of many subjects, indexed by subject ID, and returns a boolean mask of its rows.
+    """
+
+    with open(search_function_filepath, 'r') as file:
+        file_content = file.read()
+
+    parsed_ast = ast.parse(file_content)
+    function_defs = [node for node in parsed_ast.body if isinstance(node, ast.FunctionDef)]
+
+    vectorized = False
+    if(len(function_defs) > 0 and len(function_defs[0].args.args) > 0):
+        annotation = function_defs[0].args.args[0].annotation
+        if(isinstance(annotation, ast.Attribute)):
+            vectorized = annotation.attr == "DataFrame"
+        elif(isinstance(annotation, ast.Name)):
+            vectorized = annotation.id == "DataFrame"
+        elif(isinstance(annotation, ast.Constant)):
+            vectorized = str(annotation.value).split(".")[-1] == "DataFrame"
+
+    return [function_def.name for function_def in function_defs], vectorized
+
+def getSearchFunction(search_function_filepath, function_name):
+    """
+    Imports a search function, once per process.
+    """
+
+    key = (search_function_filepath, function_name)
+    if(key not in search_functions):
+        module_name = os.path.splitext(os.path.basename(search_function_filepath))[0]
+        spec = importlib.util.spec_from_file_location(module_name, search_function_filepath)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        search_functions[key] = getattr(module, function_name)
+
+    return search_functions[key]
+
+def applySearchFunction(search_function_filepath, function_name, subject_dicts):
+    """
+    Applies a search function to each subject dictionary of a chunk.
+
+    Returns
+    -------
+    tuple
+        A tuple of the form (valid_subject_ids, failures), where failures is a list of tuples of the form
+        (subject_id, error_message) of the subjects the search function raised an exception on.
+
+    Raises
+    ------
+    TypeError
+        If the search function returns something other than a boolean.
+    """
+
+    search_function = getSearchFunction(search_function_filepath, function_name)
+
+    valid_subject_ids = []
+    failures = []
+    for subject_dict in subject_dicts:
+        subject_id = subject_dict['subject_id']
+        try:
+            result = search_function(subject_dict)
+        except Exception as e:
+            failures.append((subject_id, str(e)))
+            continue
+
+        if(not isinstance(result, (bool, np.bool_))):
+            raise TypeError("The function must return a boolean value.")
+
+        if(result):
+            valid_subject_ids.append(subject_id)
+
+    return valid_subject_ids, failures
+
+def applyVectorizedSearchFunction(search_function_filepath, function_name, subject_dicts):
+    """
+    Applies a vectorized search function to a DataFrame of the metadata of a chunk of subjects.
+
+    Returns
+    -------
+    tuple
+        A tuple of the form (valid_subject_ids, failures), where failures is always empty, since an exception raised
+        by a vectorized search function fails the whole chunk.
+
+    Raises
+    ------
+    TypeError
+        If the search function doesn't return a boolean mask with one value per subject.
+    """
+
+    try:
+        import pandas as pd
+    except ImportError:
+        raise ImportError("Vectorized search functions require pandas, which is not installed.")
+
+    search_function = getSearchFunction(search_function_filepath, function_name)
+
+    subject_ids = [subject_dict['subject_id'] for subject_dict in subject_dicts]
+    metadata = pd.DataFrame.from_records([subject_dict.get('metadata', {}) for subject_dict in subject_dicts], index=pd.Index(subject_ids, name="subject_id"))
+
+    mask = np.asarray(search_function(metadata))
+    if(mask.dtype != bool or mask.shape != (len(subject_ids),)):
+        raise TypeError("The function must return a boolean mask with one value per subject.")
+
+    return [subject_id for subject_id, valid in zip(subject_ids, mask) if valid], []
+
+def runFunctionalSearch(search_function_filepath, function_name, subject_dicts, total_subjects, vectorized=False, max_workers=None, chunk_size=2000, max_failures=3, termination_event=None, progress_callback=None, failure_callback=None):
+    """
+    Applies a search function to subject dictionaries in a process pool, a chunk of subjects at a time.
+
+    Parameters
+    ----------
+    search_function_filepath : str
+        The filepath of the search function file.
+    function_name : str
+        The name of the search function.
+    subject_dicts : Iterable of dict
+        The subject dictionaries to search.
+    total_subjects : int
+        The number of subject dictionaries, which the progress is reported against.
+    vectorized : bool, optional
+        Whether the search function is a vectorized search function, as determined by parseSearchFunctionFile.
+    max_workers : int, optional
+        The number of worker processes. By default, it is the number of CPUs.
+    chunk_size : int, optional
+        The number of subjects sent to a worker process at once.
+    max_failures : int, optional
+        The search is aborted once the search function has raised an exception on more subjects than this.
+    termination_event : threading.Event, optional
+        If this is set, the search is cancelled.
+    progress_callback : function, optional
+        A function which takes in the number of searched subjects and the total number of subjects.
+    failure_callback : function, optional
+        A function which takes in the subject ID and error message of each subject the search function failed on.
+
+    Returns
+    -------
+    list of str or None
+        The IDs of the subjects which satisfy the search function, in the order of the subject dictionaries, or None
+        if the search was cancelled or aborted.
+
+    Raises
+    ------
+    Exception
+        Any exception raised while importing or applying the search function to a chunk, other than the exceptions
+        the search function raises on individual subjects.
+    """
+
+    if(max_workers is None):
+        max_workers = os.cpu_count() or 1
+
+    apply_function = applyVectorizedSearchFunction if vectorized else applySearchFunction
+
+    subject_dicts = iter(subject_dicts)
+    chunks = enumerate(iter(lambda: list(itertools.islice(subject_dicts, chunk_size)), []))
+
+    results = {}
+    searched_count = 0
+    failure_count = 0
+
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    in_flight = {}
+
+    def submitNext():
+        for chunk_index, chunk in chunks:
+            in_flight[executor.submit(apply_function, search_function_filepath, function_name, chunk)] = (chunk_index, len(chunk))
+            return True
+        return False
+
+    try:
+        # At most two chunks per worker are in flight, so the subject dictionaries are read as the search progresses.
+        while(len(in_flight) < 2 * max_workers and submitNext()):
+            pass
+
+        while(len(in_flight) > 0):
+            if(termination_event is not None and termination_event.is_set()):
+                return None
+
+            done, pending = wait(in_flight, timeout=0.25, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk_index, chunk_length = in_flight.pop(future)
+                results[chunk_index], failures = future.result()
+                searched_count += chunk_length
+
+                for subject_id, error_message in failures:
+                    failure_count += 1
+                    if(failure_callback is not None):
+                        failure_callback(subject_id, error_message)
+
+                if(failure_count > max_failures):
+                    return None
+
+                if(progress_callback is not None):
+                    progress_callback(searched_count, total_subjects)
+
+                submitNext()
+    finally:
+        # The chunks which haven't started are dropped, and the running ones are left to finish in the background.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return [subject_id for chunk_index in sorted(results) for subject_id in results[chunk_index]]
@@ -0,0 +1,175 @@
+import io
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from PIL import Image
+
+from unWISE_verse.Spout import Spout
+
+def encodeGIF(frame_buffers, ms_per_frame):
+    """
+    Encodes the frames of a subject as a GIF, entirely in memory.
+
+    Parameters
+    ----------
+    frame_buffers : list of bytes
+        The encoded images of the frames, such as PNGs.
+    ms_per_frame : int
+        The duration of each frame, in milliseconds.
+
+    Returns
+    -------
+    bytes
+        The GIF.
+    """
+
+    images = [Image.open(io.BytesIO(frame_buffer)) for frame_buffer in frame_buffers]
+
+    gif_buffer = io.BytesIO()
+    images[0].save(
+        gif_buffer,
+        format="GIF",
+        save_all=True,
+        append_images=images[1:],
+        duration=ms_per_frame,
+        loop=0
+    )
+    return gif_buffer.getvalue()
+
+def readFrames(frames):
+    """
+    Reads the frames of a subject into memory.
+
+    Parameters
+    ----------
+    frames : list of tuples
+        A list of tuples of the form (filepath, location) for each frame, where filepath is the filepath of the image
+        if it was already downloaded, or None, and location is the location of the image on the Zooniverse server. A
+        frame without a filepath, or whose file was deleted since, such as by the eviction of the subject cache, is
+        downloaded from its location.
+
+    Returns
+    -------
+    list of bytes
+        The encoded images of the frames.
+    """
+
+    frame_buffers = []
+    for filepath, location in frames:
+        if(filepath is not None):
+            try:
+                with open(filepath, "rb") as frame_file:
+                    frame_buffers.append(frame_file.read())
+                continue
+            except FileNotFoundError:
+                pass
+        frame_buffers.append(Spout.downloadToMemory(location))
+    return frame_buffers
+
+def exportSubjectGIFs(subject_frames, ms_per_frame, output_directory, gif_filenames, zip_filename=None, download_workers=None, max_workers=None, termination_event=None, progress_callback=None, failure_callback=None):
+    """
+    Exports the GIFs of many subjects. The frames of the subjects are read and downloaded concurrently in threads and
+    encoded as GIFs in a process pool, without temporary files.
+
+    Parameters
+    ----------
+    subject_frames : list of tuples
+        A list of tuples of the form (subject_id, frames), where frames is as taken by readFrames.
+    ms_per_frame : int
+        The duration of each frame, in milliseconds.
+    output_directory : str
+        The directory the GIFs, or the ZIP file of the GIFs, are written to.
+    gif_filenames : function
+        A function which takes in a subject ID and returns the filename of its GIF.
+    zip_filename : str, optional
+        If given, the GIFs are written to a single ZIP file with this filename instead of separate files.
+    download_workers : int, optional
+        The number of subjects whose frames are read at once. By default, it is Spout.download_workers.
+    max_workers : int, optional
+        The number of encoding processes. By default, it is the number of CPUs.
+    termination_event : threading.Event, optional
+        If this is set, the export is cancelled. The GIFs which were already written are kept.
+    progress_callback : function, optional
+        A function which takes in the number of finished subjects and the total number of subjects.
+    failure_callback : function, optional
+        A function which takes in the subject ID and exception of each subject which could not be exported.
+
+    Returns
+    -------
+    int
+        The number of exported GIFs.
+    """
+
+    if(download_workers is None):
+        download_workers = Spout.download_workers
+
+    if(max_workers is None):
+        max_workers = os.cpu_count() or 1
+
+    total_subjects = len(subject_frames)
+    finished_count = 0
+    exported_count = 0
+
+    # GIFs are already compressed, so they are stored in the ZIP file as they are.
+    zip_file = None
+    if(zip_filename is not None):
+        zip_file = zipfile.ZipFile(os.path.join(output_directory, zip_filename), "w", compression=zipfile.ZIP_STORED)
+
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    in_flight = {}
+
+    def handleFailure(subject_id, exception):
+        if(failure_callback is not None):
+            failure_callback(subject_id, exception)
+
+    def isTerminated():
+        return termination_event is not None and termination_event.is_set()
+
+    def collectEncodedGIFs():
+        nonlocal finished_count, exported_count
+
+        done, pending = wait(in_flight, timeout=0.25, return_when=FIRST_COMPLETED)
+        for future in done:
+            subject_id = in_flight.pop(future)
+            finished_count += 1
+
+            exception = future.exception()
+            if(exception is not None):
+                handleFailure(subject_id, exception)
+            else:
+                gif_filename = gif_filenames(subject_id)
+                if(zip_file is not None):
+                    zip_file.writestr(gif_filename, future.result())
+                else:
+                    with open(os.path.join(output_directory, gif_filename), "wb") as gif_file:
+                        gif_file.write(future.result())
+                exported_count += 1
+
+            if(progress_callback is not None):
+                progress_callback(finished_count, total_subjects)
+
+    try:
+        for index, (subject_id, frames), frame_buffers, exception in Spout.mapConcurrently(lambda subject_frame: readFrames(subject_frame[1]), subject_frames, download_workers, termination_event):
+            if(exception is not None):
+                finished_count += 1
+                handleFailure(subject_id, exception)
+                if(progress_callback is not None):
+                    progress_callback(finished_count, total_subjects)
+                continue
+
+            in_flight[executor.submit(encodeGIF, frame_buffers, ms_per_frame)] = subject_id
+
+            # Frames are only read while the encoding processes keep up, which bounds the frames held in memory.
+            while(len(in_flight) >= 2 * max_workers and not isTerminated()):
+                collectEncodedGIFs()
+
+        while(len(in_flight) > 0 and not isTerminated()):
+            collectEncodedGIFs()
+    finally:
+        # On cancellation, the GIFs which haven't started encoding are dropped.
+        executor.shutdown(wait=False, cancel_futures=True)
+        if(zip_file is not None):
+            zip_file.close()
+
+    return exported_count
@@ -0,0 +1,292 @@
+import email.utils
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+class RequestGovernor:
+    # Responses which are retried, and the ones among them which mean the server is throttling the client.
+    retryable_status_codes = {429, 500, 502, 503, 504}
+    throttle_status_codes = {429, 503}
+
+    # Requests with these methods can be repeated safely after a server error. Other requests, such as the POST which
+    # creates a subject, are only retried when they were throttled, since the server didn't process them.
+    idempotent_methods = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+    def __init__(self, requests_per_second=20.0, max_requests_per_second=None, burst=40, max_concurrency=16, min_concurrency=1, max_retries=5, base_delay=0.5, max_delay=60.0):
+        """
+        Paces and retries the HTTP requests made to the Zooniverse API, backing off when the server throttles them.
+
+        Parameters
+        ----------
+        requests_per_second : float, optional
+            The rate at which requests are started at first.
+        max_requests_per_second : float, optional
+            The highest rate the governor raises the rate to while requests succeed. By default, it is four times
+            requests_per_second.
+        burst : int, optional
+            The number of requests which can be started at once after the governor has been idle.
+        max_concurrency : int, optional
+            The highest number of requests in flight at once.
+        min_concurrency : int, optional
+            The lowest number of requests in flight at once the concurrency ceiling is reduced to when throttled.
+        max_retries : int, optional
+            The number of times a request is retried before its last response is returned or its error is raised.
+        base_delay : float, optional
+            The delay, in seconds, of the first retry without a Retry-After header. It doubles with each retry.
+        max_delay : float, optional
+            The longest delay, in seconds, before a retry.
+
+        Notes
+        -----
+        Requests are started through a token bucket, which refills at the current rate up to burst tokens, and are
+        limited by a concurrency ceiling. When a request is throttled (HTTP 429 or 503), the rate and the ceiling are
+        halved, at most once per second, and if the response has a Retry-After header, every request waits for it.
+        Each ceiling's worth of successful requests raises the ceiling by one and the rate by a tenth, up to their
+        maximums, so the governor probes rates above the initial one until the server throttles it. Retries without a Retry-After header wait a random delay of up to base_delay * 2 ** retry seconds.
+        """
+
+        self.max_rate = max_requests_per_second if max_requests_per_second is not None else 4 * requests_per_second
+        self.rate = requests_per_second
+        self.min_rate = requests_per_second / 64
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill_time = time.monotonic()
+
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency_limit = max_concurrency
+        self.in_flight = 0
+        self.success_streak = 0
+        self.paused_until = 0.0
+        self.last_decrease_time = None
+
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.condition = threading.Condition()
+        self.resetStatistics()
+
+    def resetStatistics(self):
+        """
+        Resets the request, retry, and throttle counters.
+        """
+
+        with self.condition:
+            self.request_count = 0
+            self.retry_count = 0
+            self.throttle_count = 0
+            self.start_time = time.monotonic()
+
+    def getStatistics(self):
+        """
+        Returns the counters of the governor since it was created or its statistics were last reset.
+
+        Returns
+        -------
+        dict
+            A dictionary with the number of requests, retries, and throttled responses, the effective number of
+            requests per second, and the current rate and concurrency ceiling.
+        """
+
+        with self.condition:
+            elapsed_time = max(time.monotonic() - self.start_time, 1e-9)
+            return {"requests": self.request_count, "retries": self.retry_count, "throttles": self.throttle_count,
+                    "requests_per_second": self.request_count / elapsed_time, "rate": self.rate,
+                    "concurrency_limit": self.concurrency_limit}
+
+    def refillTokens(self, current_time):
+        """
+        Adds the tokens earned since the last refill to the bucket. Must be called with the condition held.
+        """
+
+        self.tokens = min(self.burst, self.tokens + (current_time - self.last_refill_time) * self.rate)
+        self.last_refill_time = current_time
+
+    def acquire(self):
+        """
+        Waits until a request may be started under the rate and concurrency ceiling, then counts it as in flight.
+        """
+
+        with self.condition:
+            while(True):
+                current_time = time.monotonic()
+                self.refillTokens(current_time)
+
+                if(self.in_flight >= self.concurrency_limit):
+                    wait_time = None
+                elif(current_time < self.paused_until):
+                    wait_time = self.paused_until - current_time
+                elif(self.tokens < 1):
+                    wait_time = (1 - self.tokens) / self.rate
+                else:
+                    self.tokens -= 1
+                    self.in_flight += 1
+                    self.request_count += 1
+                    return
+
+                self.condition.wait(timeout=wait_time)
+
+    def release(self, throttled=False, retry_after=None):
+        """
+        Counts a request as finished and adapts the rate and concurrency ceiling to its outcome.
+
+        Parameters
+        ----------
+        throttled : bool, optional
+            Whether the server throttled the request.
+        retry_after : float, optional
+            The number of seconds the server asked the client to wait before its next request.
+        """
+
+        with self.condition:
+            self.in_flight -= 1
+
+            if(throttled):
+                current_time = time.monotonic()
+                self.throttle_count += 1
+                self.success_streak = 0
+
+                # Requests which were already in flight when the server started throttling are throttled together,
+                # so the rate and ceiling are only reduced once per second.
+                if(self.last_decrease_time is None or current_time - self.last_decrease_time >= 1.0):
+                    self.last_decrease_time = current_time
+                    self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit // 2)
+                    self.rate = max(self.min_rate, self.rate / 2)
+
+                if(retry_after is not None):
+                    self.paused_until = max(self.paused_until, current_time + retry_after)
+            else:
+                self.success_streak += 1
+                if(self.success_streak >= self.concurrency_limit):
+                    self.success_streak = 0
+                    self.concurrency_limit = min(self.max_concurrency, self.concurrency_limit + 1)
+                    self.rate = min(self.max_rate, self.rate * 1.1)
+
+            self.condition.notify_all()
+
+    def recordRetry(self):
+        """
+        Counts a retried request.
+        """
+
+        with self.condition:
+            self.retry_count += 1
+
+    def getRetryDelay(self, retry, retry_after=None):
+        """
+        Returns the number of seconds to wait before a retry.
+
+        Parameters
+        ----------
+        retry : int
+            The number of retries of the request before this one.
+        retry_after : float, optional
+            The number of seconds the server asked the client to wait, which is used instead of the backoff.
+
+        Returns
+        -------
+        float
+            The delay before the retry.
+        """
+
+        if(retry_after is not None):
+            return min(self.max_delay, retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry))
+
+    @staticmethod
+    def parseRetryAfter(value):
+        """
+        Parses the value of a Retry-After header, which is either a number of seconds or an HTTP date.
+
+        Returns
+        -------
+        float or None
+            The number of seconds to wait, or None if the header is missing or can't be parsed.
+        """
+
+        if(value is None):
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            retry_time = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_time.timestamp() - time.time())
+
+    def install(self, session):
+        """
+        Routes every request of a requests.Session through the governor. Sessions which already route their requests
+        through the governor are left as they are.
+
+        Parameters
+        ----------
+        session : requests.Session
+            The session, such as the session of a Panoptes client.
+        """
+
+        installed_adapter = session.get_adapter("https://")
+        if(isinstance(installed_adapter, GovernedHTTPAdapter) and installed_adapter.governor is self):
+            return
+
+        adapter = GovernedHTTPAdapter(self, pool_maxsize=self.max_concurrency)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+class GovernedHTTPAdapter(HTTPAdapter):
+    def __init__(self, governor, **kwargs):
+        """
+        A requests transport adapter which sends its requests through a RequestGovernor.
+
+        Parameters
+        ----------
+        governor : RequestGovernor
+            The governor which paces and retries the requests.
+        kwargs : dict
+            The keyword arguments of requests.adapters.HTTPAdapter.
+        """
+
+        self.governor = governor
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        governor = self.governor
+        idempotent = request.method in governor.idempotent_methods
+
+        retry = 0
+        while(True):
+            governor.acquire()
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                governor.release()
+                if(not idempotent or retry >= governor.max_retries):
+                    raise
+                governor.recordRetry()
+                time.sleep(governor.getRetryDelay(retry))
+                retry += 1
+                continue
+
+            status_code = response.status_code
+            throttled = status_code in governor.throttle_status_codes
+            retryable = status_code in governor.retryable_status_codes and (throttled or idempotent)
+
+            if(not retryable or retry >= governor.max_retries):
+                governor.release(throttled=throttled)
+                return response
+
+            retry_after = governor.parseRetryAfter(response.headers.get("Retry-After"))
+            governor.release(throttled=throttled, retry_after=retry_after)
+            response.close()
+
+            governor.recordRetry()
+            time.sleep(governor.getRetryDelay(retry, retry_after))
+            retry += 1
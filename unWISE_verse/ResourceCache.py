@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import OrderedDict
+
+class ResourceCache:
+    def __init__(self, time_to_live=300.0, max_size=1024):
+        """
+        Thread-safe cache of small Zooniverse resources, such as projects and subject sets, which rarely change.
+
+        Parameters
+        ----------
+        time_to_live : float, optional
+            The number of seconds a cached resource is used for before it is fetched again.
+        max_size : int, optional
+            The highest number of cached resources. The least recently used resources are dropped first.
+
+        Notes
+        -----
+        Resources are keyed by their class and an identifier, such as their ID. A resource which is changed through
+        Spout is invalidated, so that the next lookup fetches it again.
+        """
+
+        self.time_to_live = time_to_live
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def getKey(resource_class, identifier):
+        """
+        Returns the key of a resource in the cache.
+        """
+
+        return resource_class.__name__, str(identifier)
+
+    def get(self, resource_class, identifier):
+        """
+        Returns a cached resource, or None if it isn't cached or has expired.
+        """
+
+        key = self.getKey(resource_class, identifier)
+        with self.lock:
+            entry = self.entries.get(key, None)
+            if(entry is None):
+                return None
+
+            resource, expiry_time = entry
+            if(time.monotonic() >= expiry_time):
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return resource
+
+    def put(self, resource_class, identifier, resource):
+        """
+        Caches a resource.
+        """
+
+        key = self.getKey(resource_class, identifier)
+        with self.lock:
+            self.entries[key] = (resource, time.monotonic() + self.time_to_live)
+            self.entries.move_to_end(key)
+            while(len(self.entries) > self.max_size):
+                self.entries.popitem(last=False)
+
+    def getOrFetch(self, resource_class, identifier, fetch_function):
+        """
+        Returns a cached resource, fetching and caching it if it isn't cached or has expired.
+
+        Parameters
+        ----------
+        resource_class : class
+            The panoptes_client class of the resource, such as Project.
+        identifier : int or str
+            The identifier of the resource.
+        fetch_function : function
+            A function which takes in no arguments and fetches the resource from Zooniverse.
+
+        Returns
+        -------
+        object
+            The resource.
+        """
+
+        resource = self.get(resource_class, identifier)
+        if(resource is None):
+            resource = fetch_function()
+            if(resource is not None):
+                self.put(resource_class, identifier, resource)
+        return resource
+
+    def invalidate(self, resource_class=None, identifier=None):
+        """
+        Removes resources from the cache.
+
+        Parameters
+        ----------
+        resource_class : class, optional
+            The class of the resources to remove. If None, every resource is removed.
+        identifier : int or str, optional
+            The identifier of the resource to remove. If None, every resource of resource_class is removed.
+        """
+
+        with self.lock:
+            if(resource_class is None):
+                self.entries.clear()
+            elif(identifier is None):
+                for key in [key for key in self.entries if key[0] == resource_class.__name__]:
+                    del self.entries[key]
+            else:
+                self.entries.pop(self.getKey(resource_class, identifier), None)
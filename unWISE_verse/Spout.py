@@ -1,14 +1,21 @@
+import csv
 import getpass
 import os
 import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from copy import copy
 from typing import Iterable
 
 import requests
 from panoptes_client import Panoptes, Project, SubjectSet, Subject, User, ProjectRole
-from panoptes_client.panoptes import PanoptesAPIException
+from panoptes_client.panoptes import PanoptesAPIException, LinkCollection
+from requests.adapters import HTTPAdapter
 
 from unWISE_verse.Login import Login
+from unWISE_verse.RequestGovernor import RequestGovernor
+from unWISE_verse.ResourceCache import ResourceCache
 
 client = Panoptes()
 
@@ -58,6 +65,38 @@ def formatSubjectsInput(func):
     return wrapper
 
 class Spout:
+    max_workers = 8
+
+    # The number of resources requested per page when collecting subjects and subject sets from Zooniverse.
+    page_size = 100
+
+    # The limits of the number of subjects linked to or removed from a subject set per request, and the response
+    # time the batch size is adapted towards.
+    min_batch_size = 50
+    max_batch_size = 1000
+    target_batch_time = 5.0
+
+    # Subjects are unlinked with their IDs in the URL of the request, so fewer are unlinked per request to keep the
+    # URL within the limits of servers and proxies. IDs of up to 9 digits and a comma keep 200 IDs under 2 KB.
+    max_unlink_batch_size = 200
+
+    # The time (time.monotonic()) each subject, by ID, was last fetched from or saved to Zooniverse.
+    subject_fetch_times = {}
+
+    # Every request to the Zooniverse API goes through this governor, which paces, throttles, and retries them.
+    request_governor = RequestGovernor(max_concurrency=2 * max_workers)
+
+    # Projects, subject sets, project roles, and users which were looked up recently, shared by every Spout.
+    resource_cache = ResourceCache()
+
+    # Subject images are downloaded through one pooled session, shared by every Spout, with at most download_workers
+    # downloads in flight. Each download is streamed to disk in download_chunk_size pieces.
+    download_workers = 16
+    download_chunk_size = 64 * 1024
+    download_timeout = 30.0
+    download_retries = 3
+    download_session = None
+    download_session_lock = threading.Lock()
 
     def __init__(self, login: Login = None, display_printouts=False, progress_callback=None, termination_event=None):
         """
@@ -106,8 +145,12 @@ class Spout:
         password = login.password
         if (username == "" or password == ""):
             return False
+
+        # The cached resources were looked up with the permissions of the previous login.
+        Spout.invalidateCache()
+
         try:
-            Panoptes.connect(username=username, password=password)
+            Spout.request_governor.install(Panoptes.connect(username=username, password=password).session)
             return True
         except:
             return False
@@ -126,12 +169,17 @@ class Spout:
 
         global client
 
+        # The cached resources were looked up with the permissions of the previous login.
+        Spout.invalidateCache()
+
         try:
             client = Panoptes.connect(username=login.username, password=login.password)
         except PanoptesAPIException:
             login.deleteLoginSave()
             raise Exception("Login to Zooniverse failed. Please try again.")
 
+        Spout.request_governor.install(client.session)
+
     @staticmethod
     def requestLogin(filename="login.pickle", save=True):
         if (Login.loginExists(filename)):
@@ -224,7 +272,7 @@ class Spout:
         project_id = Spout.formatID(project_id)
 
         try:
-            return Project.find(project_id)
+            return cls.resource_cache.getOrFetch(Project, project_id, lambda: Project.find(project_id))
         except PanoptesAPIException:
             raise PanoptesAPIException(f"Project with ID {project_id} does not exist or you do not have access to it.")
 
@@ -237,10 +285,39 @@ class Spout:
         project_role_id = Spout.formatID(project_role_id)
 
         try:
-            return ProjectRole.find(project_role_id)
+            return cls.resource_cache.getOrFetch(ProjectRole, project_role_id, lambda: ProjectRole.find(project_role_id))
         except PanoptesAPIException:
             raise PanoptesAPIException(f"Project role with ID {project_role_id} does not exist or you do not have access to it.")
 
+    @classmethod
+    @checkLogin
+    def findProjectRoles(cls, project_role_ids):
+        """
+        Finds project roles on Zooniverse by their IDs, requesting the uncached ones a page of IDs at a time.
+
+        Parameters
+        ----------
+            project_role_ids : Iterable of ints or strs
+                The IDs of the project roles.
+
+        Returns
+        -------
+            List of ProjectRole objects
+                The project roles which were found, in the same order as project_role_ids.
+        """
+
+        project_role_ids = list(dict.fromkeys(cls.formatID(project_role_id) for project_role_id in project_role_ids))
+        project_roles = {project_role_id: cls.resource_cache.get(ProjectRole, project_role_id) for project_role_id in project_role_ids}
+
+        uncached_ids = [project_role_id for project_role_id, project_role in project_roles.items() if project_role is None]
+        for i in range(0, len(uncached_ids), cls.page_size):
+            id_page = uncached_ids[i:i + cls.page_size]
+            for project_role in ProjectRole.where(id=",".join(str(project_role_id) for project_role_id in id_page), page_size=len(id_page)):
+                cls.resource_cache.put(ProjectRole, project_role.id, project_role)
+                project_roles[int(project_role.id)] = project_role
+
+        return [project_role for project_role in project_roles.values() if project_role is not None]
+
     @classmethod
     @checkLogin
     def findSubjectSet(cls, subject_set_id):
@@ -250,7 +327,7 @@ class Spout:
         subject_set_id = Spout.formatID(subject_set_id)
 
         try:
-            return SubjectSet.find(subject_set_id)
+            return cls.resource_cache.getOrFetch(SubjectSet, subject_set_id, lambda: SubjectSet.find(subject_set_id))
         except PanoptesAPIException:
             raise PanoptesAPIException(f"Subject set with ID {subject_set_id} does not exist or you do not have access to it.")
 
@@ -262,25 +339,158 @@ class Spout:
 
         subject_id = Spout.formatID(subject_id)
         try:
-            return Subject.find(subject_id)
+            subject = Subject.find(subject_id)
         except PanoptesAPIException:
             raise PanoptesAPIException(f"Subject with ID {subject_id} does not exist or you do not have access to it.")
 
+        cls.recordSubjectsFetched([subject])
+        return subject
+
+    @classmethod
+    def invalidateCache(cls, resource_class=None, resource_id=None):
+        """
+        Removes resources from the resource cache, so that their next lookup fetches them from Zooniverse.
+
+        Parameters
+        ----------
+            resource_class : class, optional
+                The class of the resources, such as Project or SubjectSet. If None, the whole cache is cleared.
+            resource_id : int or str, optional
+                The ID of the resource. If None, every resource of resource_class is removed.
+        """
+
+        cls.resource_cache.invalidate(resource_class, resource_id)
+
+    @classmethod
+    def recordSubjectsFetched(cls, subjects):
+        """
+        Records that the subjects were just fetched from or saved to Zooniverse, so their local copies are up to date.
+
+        Parameters
+        ----------
+            subjects : List of Subject objects
+                The subjects which were fetched or saved.
+        """
+
+        fetch_time = time.monotonic()
+        for subject in subjects:
+            cls.subject_fetch_times[str(subject.id)] = fetch_time
+
+    @classmethod
+    def saveSubjectMetadata(cls, subject):
+        """
+        Saves the metadata of an existing subject to Zooniverse with a single request.
+
+        Parameters
+        ----------
+            subject : Subject object
+                The subject, whose local copy is loaded.
+
+        Returns
+        -------
+            Subject object
+                The subject, whose local copy is replaced by the one in the response.
+
+        Notes
+        -----
+            Subject.save marks an updated subject as unloaded and then reads its locations, so every save also reloads
+            the subject, and so does its next attribute access. The response of the update is the server's copy of the
+            subject, so it is kept as the local copy instead, and the subject is recorded as fetched.
+        """
+
+        response, etag = Panoptes.client().put(Subject.url(subject.id), json={Subject._api_slug: {"metadata": subject.raw["metadata"]}}, etag=subject.etag)
+        subject.set_raw(response[Subject._api_slug][0], etag)
+        cls.recordSubjectsFetched([subject])
+        return subject
+
+    @classmethod
+    def isSubjectFresh(cls, subject, max_age):
+        """
+        Checks if the local copy of a subject was fetched from or saved to Zooniverse at most max_age seconds ago.
+
+        Parameters
+        ----------
+            subject : Subject object
+                The subject to check.
+            max_age : float
+                The maximum age, in seconds, of a fresh copy.
+
+        Returns
+        -------
+            bool
+                True if the local copy of the subject is fresh, False otherwise.
+        """
+
+        # A subject which isn't loaded has no local copy, however recently its ID was fetched.
+        if(not subject._loaded):
+            return False
+
+        fetch_time = cls.subject_fetch_times.get(str(subject.id), None)
+        return fetch_time is not None and time.monotonic() - fetch_time <= max_age
+
     @classmethod
     @checkLogin
-    def findSubjects(cls, subject_ids):
+    def findSubjects(cls, subject_ids, max_workers=None, progress_callback=None):
+        """
+        Finds subjects on Zooniverse by their IDs, requesting them a page of IDs at a time.
+
+        Parameters
+        ----------
+            subject_ids : Iterable of Subject objects, ints, or strs
+                The subjects to find, as Subject objects or subject IDs. A single Subject object or ID is also accepted.
+            max_workers : int, optional
+                The number of pages requested at once. By default, it is Spout.max_workers.
+            progress_callback : function, optional
+                A function that takes in a string and a level, which the number of found subjects is reported to.
+
+        Returns
+        -------
+            List of Subject objects
+                The subjects, in the same order as subject_ids. Subject objects are returned as they are and repeated
+                IDs are only requested once.
+        """
+
         if (isinstance(subject_ids, Subject)):
             return [subject_ids]
         elif (isinstance(subject_ids, int) or isinstance(subject_ids, str)):
             return [cls.findSubject(subject_ids)]
 
-        subjects = []
-
         if(not isinstance(subject_ids, Iterable)):
             raise TypeError(f"Subject IDs must be an iterable of integers, strings, or Subject objects not {type(subject_ids)}.")
 
+        subject_ids = [subject_id if isinstance(subject_id, Subject) else cls.formatID(subject_id) for subject_id in subject_ids]
+
+        # dict.fromkeys removes repeated IDs while keeping their order.
+        unique_subject_ids = list(dict.fromkeys(subject_id for subject_id in subject_ids if not isinstance(subject_id, Subject)))
+        id_pages = [unique_subject_ids[i:i + cls.page_size] for i in range(0, len(unique_subject_ids), cls.page_size)]
+
+        def findPage(id_page):
+            subjects = list(Subject.where(id=",".join(str(subject_id) for subject_id in id_page), page_size=len(id_page)))
+            cls.recordSubjectsFetched(subjects)
+            return subjects
+
+        found_subjects = {}
+        for index, id_page, result, exception in cls.mapConcurrently(findPage, id_pages, max_workers=max_workers):
+            if(exception is not None):
+                raise exception
+
+            for subject in result:
+                found_subjects[int(subject.id)] = subject
+
+            if(progress_callback is not None):
+                try:
+                    progress_callback(f"Collect Subjects: {len(found_subjects)}/{len(unique_subject_ids)}", level=10)
+                except:
+                    pass
+
+        subjects = []
         for subject_id in subject_ids:
-            subjects.append(cls.findSubject(subject_id))
+            if(isinstance(subject_id, Subject)):
+                subjects.append(subject_id)
+            elif(subject_id in found_subjects):
+                subjects.append(found_subjects[subject_id])
+            else:
+                raise PanoptesAPIException(f"Subject with ID {subject_id} does not exist or you do not have access to it.")
         return subjects
 
     @formatProjectInput
@@ -305,6 +515,9 @@ class Spout:
         subject_set.links.project = project
         subject_set.display_name = copy(display_name)
         subject_set.save()
+
+        # The project's links now include the new subject set.
+        self.invalidateCache(Project, project.id)
         return subject_set
 
     @checkLogin
@@ -328,7 +541,7 @@ class Spout:
             return False
 
         try:
-            project = Project.find(project_identifier)
+            project = self.findProject(project_identifier)
 
             if(project is None):
                 return False
@@ -361,7 +574,7 @@ class Spout:
             return False
 
         try:
-            subject_set = SubjectSet.find(subject_set_identifier)
+            subject_set = self.findSubjectSet(subject_set_identifier)
 
             if(subject_set is None):
                 return False
@@ -394,7 +607,7 @@ class Spout:
         except PanoptesAPIException:
             return False
 
-    def generateSubjects(self, manifest_filename):
+    def generateSubjects(self, manifest_filename, journal=None):
         """
         Generates a list of subjects from a list of subjects from a Zooniverse manifest file.
 
@@ -402,6 +615,9 @@ class Spout:
         ----------
             manifest_filename : str
                 A string representing the filename of the Zooniverse manifest file.
+            journal : UploadJournal, optional
+                The upload journal of the manifest. If provided, rows whose subjects were already created are skipped
+                and each generated subject is registered with its row in the journal.
 
         Returns
         -------
@@ -418,279 +634,965 @@ class Spout:
 
         from Dataset import ZooniverseDataset
 
-        zooniverse_dataset = ZooniverseDataset(manifest_filename)
-
-        subject_dictionaries = zooniverse_dataset.getDictionaries()
         subjects = []
-        subject_total = len(subject_dictionaries)
-        for subject_dictionary in subject_dictionaries:
-            data_dictionary = subject_dictionary["data"]
-            metadata_dictionary = subject_dictionary["metadata"]
-            subject = Subject()
-            for data_key in data_dictionary:
-                if(os.path.exists(data_dictionary[data_key])):
-                    subject.add_location(data_dictionary[data_key])
-                else:
-                    if(data_dictionary[data_key] != ""):
-                        self.progress_callback(f"Could not complete subject upload. The image file requested at {data_dictionary[data_key]} does not exist.")
-                        self.termination_event.set()
+        subject_total = ZooniverseDataset.countManifestRows(manifest_filename)
+        skipped_count = 0
+        for row_hash, subject in self.iterateSubjects(manifest_filename, journal):
+            if(subject is None):
+                skipped_count += 1
+                continue
 
-            subject.metadata.update(metadata_dictionary)
             subjects.append(subject)
 
             try:
-                self.progress_callback(f"Create Subjects: {len(subjects)}/{subject_total}", level=10)
+                self.progress_callback(f"Create Subjects: {len(subjects) + skipped_count}/{subject_total}", level=10)
             except:
                 pass
 
-            self.progress_callback(f"Created subject {len(subjects)} out of {subject_total}.")
+            self.progress_callback(f"Created subject {len(subjects) + skipped_count} out of {subject_total}.")
+
+        if(skipped_count > 0):
+            self.progress_callback(f"Skipped {skipped_count} rows whose subjects were already created according to the upload journal.")
 
         self.progress_callback("Subjects generated.")
 
         return subjects
 
-    @checkLogin
-    def updateSubjects(self, subjects, project):
+    def iterateSubjects(self, manifest_filename, journal=None):
         """
-        Updates the subject's metadata to include an ID field with their Zooniverse ID and associates them with a project for uploading purposes.
+        Generates unsaved subjects from a Zooniverse manifest file, one row at a time.
 
         Parameters
         ----------
-            subjects : list
-                A list of Subject objects that will be given their IDs.
+            manifest_filename : str
+                A string representing the filename of the Zooniverse manifest file.
+            journal : UploadJournal, optional
+                The upload journal of the manifest. If provided, each generated subject is registered with its row in
+                the journal.
+
+        Yields
+        ------
+            tuple
+                A tuple of the form (row_hash, subject) for each row of the manifest. The row hash is None if no journal
+                is provided, and the subject is None if the journal shows that the row's subject was already created.
         """
 
-        total_subjects = len(subjects)
-
-        try:
-            index = 0
-            for subject in subjects:
-                subject.links.project = project
-                subject.reload()
-                subject.save()
-                subject.reload()
-                subject.metadata.update({"ID": subject.id})
-                subject.save()
-                subject.reload()
-                try:
-                    self.progress_callback(f"Update Subjects: {index+1}/{total_subjects}", level=10)
-                except:
-                    pass
-
-                self.progress_callback(f"Updated Subject {index + 1} out of {total_subjects}")
-
-                index += 1
-        except PanoptesAPIException as e:
-            self.progress_callback(f"Error updating subjects: {e}")
-            return False
+        from Dataset import ZooniverseDataset
 
-        self.progress_callback("Subjects updated.")
-        return True
+        # Stream the manifest once instead of building a ZooniverseDataset and a copy of its dictionaries.
+        return self.iterateSubjectsFromData(ZooniverseDataset.iterateManifest(manifest_filename), journal)
 
-    @checkLogin
-    def uploadSubjects(self, subject_set, subjects):
+    def iterateSubjectsFromData(self, data_iterable, journal=None):
         """
-        Uploads a list of subjects to a subject set on Zooniverse.
+        Generates unsaved subjects from Data objects, one at a time.
 
         Parameters
         ----------
-            subject_set : SubjectSet object, int, or str
-                A SubjectSet object, or a string or integer representing the ID of a subject set on Zooniverse.
-            subjects : list
-                A list of Subject objects to be uploaded to the subject set or a list of subject IDs.
-
-        Returns
-        -------
-        bool
-            True if the subjects were successfully uploaded, False otherwise.
+            data_iterable : Iterable of Data objects
+                The Data objects of the rows of a manifest, in manifest order.
+            journal : UploadJournal, optional
+                The upload journal of the manifest. If provided, each generated subject is registered with its row in
+                the journal.
+
+        Yields
+        ------
+            tuple
+                A tuple of the form (row_hash, subject) for each Data object, as in Spout.iterateSubjects.
         """
 
-        subject_set = self.findSubjectSet(subject_set)
-        subjects = self.findSubjects(subjects)
+        row_hash = None
+        if(journal is not None):
+            journal.resetRowOccurrences()
 
-        chunk_size = 1000
-        total_subjects = len(subjects)
+        for data in data_iterable:
+            if(journal is not None):
+                row_hash = journal.getNextRowHash(data)
+                if(journal.isCreated(row_hash)):
+                    yield row_hash, None
+                    continue
 
-        for i in range(0, len(subjects), chunk_size):
-            subject_set.reload()
-            chunk_subjects = subjects[i:i+chunk_size]
-            subject_set.add(chunk_subjects)
-            self.progress_callback(f"Added subjects " + str(i+1) + " through " + str(i+len(chunk_subjects)) + " to the subject set.")
-            try:
-                self.progress_callback(f"Upload Subjects: {i+len(chunk_subjects)}/{total_subjects}", level=10)
-            except:
-                pass
-            subject_set.save()
+            subject = self.createSubjectFromData(data)
 
-        self.progress_callback("Subject set filled.")
+            if(journal is not None):
+                journal.registerSubject(subject, row_hash)
 
-        return True
+            yield row_hash, subject
 
-    @formatSubjectSetInput
-    def publishManifest(self, subject_set, manifest_filename):
+    def createSubjectFromData(self, data):
         """
-        Publishes a manifest file to a subject set in Zooniverse.
+        Creates an unsaved subject from the Data object of a manifest row.
 
         Parameters
         ----------
-            subject_set : SubjectSet object, subject set ID, or display name of the subject set (if it is a subject set of the linked project)
-                The subject set that the subjects will be uploaded to.
-            manifest_filename : str
-                A string representing the filename of the Zooniverse manifest file.
-        """
+            data : Data
+                The Data object, whose data fields are image filenames.
 
-        subjects = self.generateSubjects(manifest_filename)
+        Returns
+        -------
+            Subject object
+                The unsaved subject with the images as its locations and the unreduced metadata, as strings, as its metadata.
+        """
 
-        success = self.uploadSubjects(subject_set, subjects)
+        subject_dictionary = data.getDictionary(reduced=False)
+        data_dictionary = subject_dictionary["data"]
+        metadata_dictionary = subject_dictionary["metadata"]
+        subject = Subject()
+        for data_key in data_dictionary:
+            if(os.path.exists(data_dictionary[data_key])):
+                subject.add_location(data_dictionary[data_key])
+            else:
+                if(data_dictionary[data_key] != ""):
+                    self.progress_callback(f"Could not complete subject upload. The image file requested at {data_dictionary[data_key]} does not exist.")
+                    self.termination_event.set()
 
-        if(success):
-            self.progress_callback("Manifest subjects have been published to Zooniverse.")
+        # The metadata is stored as it would be read back from the manifest CSV, so subjects uploaded straight from
+        # the Data objects of a subchunk have the same metadata as subjects uploaded from the manifest.
+        subject.metadata.update({key: "" if value is None else str(value) for key, value in metadata_dictionary.items()})
+        return subject
 
-    @checkLogin
-    def removeSubjects(self, subject_set, subjects=None, override_verification=False):
+    @staticmethod
+    def bindClient(function):
         """
-        Removes a list of subjects from a subject set on Zooniverse.
+        Binds a function to the Panoptes client of the calling thread, so that it can be run in another thread.
 
         Parameters
         ----------
-            subject_set : SubjectSet object
-                A SubjectSet object that the subjects will be removed from.
-            subjects : Subject object or list of Subject objects, optional
-               A subject object or list of subject objects that will be removed from the subject set.
-            override_verification : bool, optional
-                If False, the function will ask for user verification before removing the subjects.
+            function : function
+                The function to bind.
+
+        Returns
+        -------
+            function
+                A function which calls the given function with the client of the calling thread.
 
         Notes
         -----
-            If subjects is None, then all subjects will be removed from the subject set.
-            Removing subjects from a subject set does not delete the subjects from Zooniverse. It only removes them
-            from the subject set and will leave them as orphaned subjects.
+            Panoptes keeps its client per thread, so without this, the requests of a function run in another thread
+            are sent by a new anonymous client, without the login of the calling thread. The requests of the client
+            are routed through Spout.request_governor, so that every thread sharing it is paced together.
         """
 
-        subject_set = self.findSubjectSet(subject_set)
-
-        full_wipe = False
+        client = Panoptes.client()
+        Spout.request_governor.install(client.session)
 
-        if(subjects is not None):
-            if(not isinstance(subjects, list)):
-                if(isinstance(subjects, Subject)):
-                    subjects = [subjects]
-                else:
-                    raise TypeError("subjects must be a list of Subject objects or IDs")
-        else:
-            full_wipe = True
-            subjects = subject_set.subjects
+        def run(*args, **kwargs):
+            with client:
+                return function(*args, **kwargs)
+        return run
 
-        subjects = self.findSubjects(subjects)
+    @staticmethod
+    def mapConcurrently(function, items, max_workers=None, termination_event=None):
+        """
+        Applies a function to each item with a bounded thread pool.
 
-        chunk_size = 1000
+        Parameters
+        ----------
+            function : function
+                A function which takes in a single item.
+            items : Iterable
+                The items to apply the function to.
+            max_workers : int, optional
+                The number of threads. By default, it is Spout.max_workers.
+            termination_event : threading.Event, optional
+                If this is set, no new items are started and the remaining results are not yielded.
 
-        total_subjects = len(subjects)
+        Yields
+        ------
+            tuple
+                A tuple of the form (index, item, result, exception) for each item, in order of completion. If the
+                function raised an exception, result is None and exception is the exception, otherwise exception is None.
 
-        if(not override_verification):
-            print("This will remove all provided subjects from Zooniverse and cannot be undone. Are you sure you want to continue? (Yes or No)")
-            answer = input()
+        Notes
+        -----
+            At most twice max_workers items are in flight at once, so the items can be a generator of any length.
+            The function runs with the Panoptes client of the calling thread (see Spout.bindClient).
+        """
 
-            if (answer.lower() == "yes"):
+        if(max_workers is None):
+            max_workers = Spout.max_workers
 
-                for i in range(0, total_subjects, chunk_size):
-                    subject_set.reload()
-                    chunk_subjects = subjects[i:i + chunk_size]
-                    subject_set.remove(chunk_subjects)
-                    subject_set.save()
+        items = iter(enumerate(items))
+        in_flight = {}
 
-                if (full_wipe):
-                    self.progress_callback("All subjects removed from subject set.")
-                else:
-                    self.progress_callback("Specified subjects removed from subject set.")
+        run = Spout.bindClient(function)
 
-            elif (answer.lower() == "no"):
-                print("Cancelling deletion.")
-                return None
-            else:
-                print("Invalid response. Cancelling removal.")
-                return None
-        else:
+        def submitNext(executor):
+            if(termination_event is not None and termination_event.is_set()):
+                return False
+            for index, item in items:
+                in_flight[executor.submit(run, item)] = (index, item)
+                return True
+            return False
 
-            for i in range(0, total_subjects, chunk_size):
-                subject_set.reload()
-                chunk_subjects = subjects[i:i + chunk_size]
-                subject_set.remove(chunk_subjects)
-                subject_set.save()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while(len(in_flight) < 2 * max_workers and submitNext(executor)):
+                pass
 
-                try:
-                    self.progress_callback(f"Remove Subjects: {i+1}/{total_subjects}", level=10)
-                except:
-                    pass
+            while(len(in_flight) > 0):
+                done, pending = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, item = in_flight.pop(future)
+                    exception = future.exception()
+                    yield index, item, (None if exception is not None else future.result()), exception
+                    submitNext(executor)
 
-            if (full_wipe):
-                self.progress_callback("All subjects removed from subject set.")
-            else:
-                self.progress_callback("Specified subjects removed from subject set.")
+                if(termination_event is not None and termination_event.is_set()):
+                    for future in in_flight:
+                        future.cancel()
+                    in_flight.clear()
 
-    @formatSubjectsInput
-    def deleteSubjects(self, subjects, override_verification=False):
+    @staticmethod
+    def createSubject(subject, project, journal=None):
         """
-        Deletes a list of subjects from Zooniverse.
+        Creates a subject on Zooniverse, uploads its media, and stamps its Zooniverse ID into its metadata.
 
         Parameters
         ----------
-            subjects : Subject object or list of Subject objects
-               A subject object or list of subject objects that will be deleted from Zooniverse.
-            override_verification : bool, optional
-                If False, the function will ask for user verification before deleting the subjects.
+            subject : Subject object
+                An unsaved Subject object.
+            project : Project object
+                The project that the subject will be associated with.
+            journal : UploadJournal, optional
+                The upload journal which the subject was registered with. If provided, the creation and the ID stamp
+                are recorded in it.
+
+        Returns
+        -------
+            Subject object
+                The created subject.
 
         Notes
         -----
-            Deleting subjects from Zooniverse will remove them from all subject sets and will delete them from the
-            Zooniverse database.
+            This uses the fewest calls possible: one save to create the subject and upload its media, and one update
+            to add the ID, which is only known after creation (see Spout.saveSubjectMetadata). Each request updates the
+            subject from its response, so no reloads are needed, and the subject is left fresh for later edits.
         """
 
-        subjects = self.findSubjects(subjects)
-
-        total_subjects = len(subjects)
-
-        if(not override_verification):
-
-            print("This will delete all provided subjects from Zooniverse and cannot be undone. Are you sure you want to continue? (Yes or No)")
-            answer = input()
+        row_hash = journal.popPendingRowHash(subject) if journal is not None else None
 
-            if (answer.lower() == "yes"):
+        subject.links.project = project
+        subject.save()
+        if(row_hash is not None):
+            journal.recordCreated(row_hash, subject.id)
 
-                for i in range(total_subjects):
-                    subjects[i].delete()
+        subject.metadata.update({"ID": subject.id})
+        Spout.saveSubjectMetadata(subject)
+        if(row_hash is not None):
+            journal.recordStamped(row_hash)
 
-                self.progress_callback("Subjects deleted from Zooniverse.")
-            elif (answer.lower() == "no"):
-                print("Cancelling deletion.")
-                return None
-            else:
-                print("Invalid response. Cancelling removal.")
-                return None
+        return subject
 
-        else:
+    @staticmethod
+    def stampSubject(subject_id):
+        """
+        Stamps the Zooniverse ID of an existing subject into its metadata.
 
-            for i in range(total_subjects):
-                subjects[i].delete()
+        Parameters
+        ----------
+            subject_id : int or str
+                The ID of the subject.
 
-                try:
-                    self.progress_callback(f"Delete Subjects: {i+1}/{total_subjects}", level=10)
-                except:
-                    pass
+        Returns
+        -------
+            Subject object
+                The stamped subject.
+        """
 
-            self.progress_callback("Subjects deleted from Zooniverse.")
+        subject = Subject.find(Spout.formatID(subject_id))
+        subject.metadata.update({"ID": subject.id})
+        return Spout.saveSubjectMetadata(subject)
 
-    @formatSubjectsInput
-    def modifySubjectMetadataFieldName(self, subjects, current_field_names, new_field_names):
+    @checkLogin
+    def updateSubjects(self, subjects, project, max_workers=None, journal=None):
         """
-        Modifies the metadata field of the subjects in the subject set.
+        Updates the subject's metadata to include an ID field with their Zooniverse ID and associates them with a project for uploading purposes.
 
         Parameters
         ----------
-        subjects : List of Subject objects
-            A list of Subject objects to be modified or a list of subject IDs to be modified.
-        current_field_names : list of str
-            The name of the metadata field to be modified.
+            subjects : list
+                A list of Subject objects that will be given their IDs.
+            project : Project object
+                The project that the subjects will be associated with.
+            max_workers : int, optional
+                The number of subjects created concurrently. By default, it is Spout.max_workers.
+            journal : UploadJournal, optional
+                The upload journal of the manifest. If provided, each creation is recorded in it, and subjects which
+                were created by an earlier, interrupted upload but not stamped with their ID are stamped.
+
+        Returns
+        -------
+        bool
+            True if every subject was created, False otherwise.
+        """
+
+        total_subjects = len(subjects)
+        updated_count = 0
+        failed_count = 0
+        start_time = time.perf_counter()
+
+        for index, subject, result, exception in self.mapConcurrently(lambda subject: self.createSubject(subject, project, journal), subjects, max_workers, self.termination_event):
+            if(exception is not None):
+                if(not isinstance(exception, PanoptesAPIException)):
+                    raise exception
+                failed_count += 1
+                self.progress_callback(f"Error updating subject {index + 1}: {exception}")
+                continue
+
+            updated_count += 1
+            try:
+                self.progress_callback(f"Update Subjects: {updated_count}/{total_subjects}", level=10)
+            except:
+                pass
+
+            self.progress_callback(f"Updated Subject {updated_count} out of {total_subjects}")
+
+        elapsed_time = time.perf_counter() - start_time
+        if(elapsed_time > 0):
+            self.progress_callback(f"Updated {updated_count} subjects in {elapsed_time:.1f} s ({updated_count / elapsed_time:.1f} subjects/s).")
+        self.reportRequestStatistics()
+
+        if(journal is not None):
+            unstamped_rows = journal.getUnstampedRows()
+            stamped_count = 0
+            for index, (row_hash, subject_id), result, exception in self.mapConcurrently(lambda row: self.stampSubject(row[1]), unstamped_rows, max_workers, self.termination_event):
+                if(exception is not None):
+                    if(not isinstance(exception, PanoptesAPIException)):
+                        raise exception
+                    failed_count += 1
+                    self.progress_callback(f"Error stamping the ID of subject {subject_id}: {exception}")
+                    continue
+                journal.recordStamped(row_hash)
+                stamped_count += 1
+
+            if(len(unstamped_rows) > 0):
+                self.progress_callback(f"Stamped the IDs of {stamped_count} previously created subjects.")
+
+        if(failed_count > 0 or updated_count < total_subjects):
+            self.progress_callback(f"Error updating subjects: {total_subjects - updated_count} of {total_subjects} subjects were not updated.")
+            return False
+
+        self.progress_callback("Subjects updated.")
+        return True
+
+    @checkLogin
+    def uploadSubjects(self, subject_set, subjects, journal=None):
+        """
+        Uploads a list of subjects to a subject set on Zooniverse.
+
+        Parameters
+        ----------
+            subject_set : SubjectSet object, int, or str
+                A SubjectSet object, or a string or integer representing the ID of a subject set on Zooniverse.
+            subjects : list
+                A list of Subject objects to be uploaded to the subject set or a list of subject IDs.
+            journal : UploadJournal, optional
+                The upload journal of the manifest. If provided, every created subject in the journal which is not yet
+                linked to the subject set is linked instead of the provided subjects, and the links are recorded.
+
+        Returns
+        -------
+        bool
+            True if the subjects were successfully uploaded, False otherwise.
+        """
+
+        subject_set = self.findSubjectSet(subject_set)
+
+        if(journal is not None):
+            return self.uploadJournalSubjects(subject_set, journal)
+
+        subjects = self.findSubjects(subjects)
+
+        added_count, failed_subjects = self.runAdaptiveBatches(subjects, lambda batch, batch_size: self.addSubjectLinks(subject_set, batch, batch_size), progress_name="Upload Subjects")
+        self.invalidateCache(SubjectSet, subject_set.id)
+
+        if(len(failed_subjects) > 0):
+            self.progress_callback(f"Error filling the subject set: {len(failed_subjects)} of {len(subjects)} subjects were not added.")
+            return False
+
+        self.progress_callback("Subject set filled.")
+
+        return True
+
+    @checkLogin
+    def uploadJournalSubjects(self, subject_set, journal):
+        """
+        Links the created subjects of an upload journal which are not yet linked to a subject set on Zooniverse.
+
+        Parameters
+        ----------
+            subject_set : SubjectSet object
+                The subject set to link the subjects to.
+            journal : UploadJournal
+                The upload journal of the manifest.
+
+        Returns
+        -------
+        bool
+            True if the subjects were successfully linked, False otherwise.
+        """
+
+        journal.bindManifest()
+        unfinished_rows = journal.getUnlinkedRows()
+
+        # Subjects whose ID isn't stamped yet aren't linked, and count as not added.
+        unlinked_rows = [(row_hash, subject_id) for row_hash, subject_id in unfinished_rows if journal.isStamped(row_hash)]
+
+        linked_count, failed_rows = self.runAdaptiveBatches(unlinked_rows, lambda rows, batch_size: self.linkSubjects(subject_set, rows, journal), progress_name="Upload Subjects")
+
+        if(len(failed_rows) > 0 or linked_count < len(unfinished_rows)):
+            self.progress_callback(f"Error filling the subject set: {len(unfinished_rows) - linked_count} of {len(unfinished_rows)} subjects were not added.")
+            return False
+
+        self.progress_callback("Subject set filled.")
+
+        return True
+
+    def runAdaptiveBatches(self, items, operation, progress_name=None, max_retries=3, max_batch_size=None):
+        """
+        Applies a bulk operation, such as linking subjects to a subject set, to items in batches whose size adapts to
+        the response time of the operation.
+
+        Parameters
+        ----------
+            items : list
+                The items to apply the operation to.
+            operation : function
+                A function which takes in a list of items and a batch_size keyword, such as Spout.addSubjectLinks, and
+                applies the operation to them. Each batch is passed with its length as the batch size, so that it is
+                sent as a single request.
+            progress_name : str, optional
+                The name of the progress bar which the number of completed items is reported to.
+            max_retries : int, optional
+                The number of times a failed batch is retried, with a halved batch size and an increasing delay, before
+                its items are given up on.
+            max_batch_size : int, optional
+                The largest batch size, for operations whose requests can't hold as many items. By default, it is
+                Spout.max_batch_size.
+
+        Returns
+        -------
+            tuple
+                A tuple of the form (completed_count, failed_items).
+
+        Notes
+        -----
+            Batches start at a quarter of the largest batch size. After each successful batch, the batch size is scaled
+            by the ratio of Spout.target_batch_time to the response time, at most doubling, and is kept between
+            Spout.min_batch_size and the largest batch size. Each batch is retried on its own, so a failed batch doesn't
+            affect the batches before or after it. Once a batch fails, the batch size doesn't grow past the halved
+            size it was retried with, so that a batch which is too large isn't sent again and again.
+        """
+
+        if(max_batch_size is None):
+            max_batch_size = self.max_batch_size
+
+        batch_size = max(self.min_batch_size, max_batch_size // 4)
+        completed_count = 0
+        failed_items = []
+        position = 0
+        attempt = 0
+
+        while(position < len(items)):
+            if(self.termination_event is not None and self.termination_event.is_set()):
+                break
+
+            batch = items[position:position + batch_size]
+            start_time = time.monotonic()
+            try:
+                operation(batch, batch_size=len(batch))
+            except PanoptesAPIException as e:
+                attempt += 1
+                if(attempt > max_retries):
+                    self.progress_callback(f"Error processing items {position + 1} through {position + len(batch)}: {e}")
+                    failed_items.extend(batch)
+                    position += len(batch)
+                    attempt = 0
+                else:
+                    batch_size = max(self.min_batch_size, len(batch) // 2)
+                    max_batch_size = min(max_batch_size, batch_size)
+                    time.sleep(2 ** (attempt - 1))
+                continue
+
+            elapsed_time = max(time.monotonic() - start_time, 1e-3)
+            batch_size = int(min(max_batch_size, max(self.min_batch_size, batch_size * min(2.0, self.target_batch_time / elapsed_time))))
+
+            position += len(batch)
+            completed_count += len(batch)
+            attempt = 0
+
+            if(progress_name is not None):
+                try:
+                    self.progress_callback(f"{progress_name}: {position}/{len(items)}", level=10)
+                except:
+                    pass
+
+        return completed_count, failed_items
+
+    @formatSubjectSetInput
+    def publishManifest(self, subject_set, manifest_filename):
+        """
+        Publishes a manifest file to a subject set in Zooniverse.
+
+        Parameters
+        ----------
+            subject_set : SubjectSet object, subject set ID, or display name of the subject set (if it is a subject set of the linked project)
+                The subject set that the subjects will be uploaded to.
+            manifest_filename : str
+                A string representing the filename of the Zooniverse manifest file.
+        """
+
+        subjects = self.generateSubjects(manifest_filename)
+
+        success = self.uploadSubjects(subject_set, subjects)
+
+        if(success):
+            self.progress_callback("Manifest subjects have been published to Zooniverse.")
+
+    @checkLogin
+    def streamManifest(self, manifest_filename, project, subject_set, journal=None, batch_size=100, max_workers=None):
+        """
+        Uploads a manifest file to a subject set on Zooniverse, streaming rows through creation and linking.
+
+        Parameters
+        ----------
+            manifest_filename : str
+                A string representing the filename of the Zooniverse manifest file.
+            project : Project object, int, or str
+                The project that the subjects will be associated with.
+            subject_set : SubjectSet object, int, or str
+                The subject set that the subjects will be linked to.
+            journal : UploadJournal, optional
+                The upload journal of the manifest. If provided, rows which were already uploaded are skipped and
+                subjects left unstamped or unlinked by an earlier, interrupted upload are finished first.
+            batch_size : int, optional
+                The number of created subjects linked to the subject set at once. By default, it is 100.
+            max_workers : int, optional
+                The number of subjects created concurrently. By default, it is Spout.max_workers.
+
+        Returns
+        -------
+        bool
+            True if every row of the manifest was uploaded, False otherwise.
+
+        Notes
+        -----
+            See Spout.streamSubjects for how creation and linking overlap.
+        """
+
+        from Dataset import ZooniverseDataset
+
+        project = self.findProject(project)
+        subject_set = self.findSubjectSet(subject_set)
+
+        total_subjects = ZooniverseDataset.countManifestRows(manifest_filename)
+        linked_count = 0
+        failed_count = 0
+        start_time = time.perf_counter()
+
+        if(journal is not None):
+            # Subjects created for rows which are no longer in the manifest, such as the rows of an earlier manifest
+            # with the same filename, aren't finished.
+            journal.bindManifest()
+            linked_count, failed_count = self.finishJournalSubjects(subject_set, journal, total_subjects, batch_size, max_workers)
+
+        # Rows whose subjects were already created are skipped by the journal, since they were finished above.
+        rows = self.iterateSubjects(manifest_filename, journal)
+        streamed_linked_count, streamed_failed_count = self.streamSubjects(rows, project, subject_set, journal, total_subjects, linked_count, batch_size, max_workers)
+        linked_count += streamed_linked_count
+        failed_count += streamed_failed_count
+
+        elapsed_time = time.perf_counter() - start_time
+        if(elapsed_time > 0):
+            self.progress_callback(f"Uploaded {linked_count} of {total_subjects} subjects in {elapsed_time:.1f} s ({linked_count / elapsed_time:.1f} subjects/s).")
+        self.reportRequestStatistics()
+
+        if(failed_count > 0 or linked_count < total_subjects):
+            self.progress_callback(f"Error uploading subjects: {total_subjects - min(linked_count, total_subjects)} of {total_subjects} subjects were not uploaded.")
+            return False
+
+        self.progress_callback("Subject set filled.")
+        return True
+
+    def finishJournalSubjects(self, subject_set, journal, total_subjects=None, batch_size=100, max_workers=None):
+        """
+        Stamps and links the subjects which an earlier, interrupted upload created but did not finish.
+
+        Parameters
+        ----------
+            subject_set : SubjectSet object
+                The subject set that the subjects will be linked to.
+            journal : UploadJournal
+                The upload journal of the manifest.
+            total_subjects : int, optional
+                The number of rows in the manifest, used for progress updates. By default, it is None.
+            batch_size : int, optional
+                The number of subjects linked to the subject set at once. By default, it is 100.
+            max_workers : int, optional
+                The number of subjects stamped concurrently. By default, it is Spout.max_workers.
+
+        Returns
+        -------
+        tuple
+            A tuple of the form (linked_count, failed_count), where linked_count includes the subjects that were
+            already linked according to the journal, and failed_count includes the subjects whose ID couldn't be stamped.
+        """
+
+        failed_count = 0
+
+        for index, (row_hash, subject_id), result, exception in self.mapConcurrently(lambda row: self.stampSubject(row[1]), journal.getUnstampedRows(), max_workers, self.termination_event):
+            if(exception is not None):
+                if(not isinstance(exception, PanoptesAPIException)):
+                    raise exception
+                failed_count += 1
+                self.progress_callback(f"Error stamping the ID of subject {subject_id}: {exception}")
+            else:
+                journal.recordStamped(row_hash)
+
+        linked_count = len(journal.linked_row_hashes)
+        self.reportUploadProgress(linked_count, total_subjects)
+
+        # Subjects whose ID couldn't be stamped aren't finished, so they are stamped again by the next upload.
+        unlinked_rows = [(row_hash, subject_id) for row_hash, subject_id in journal.getUnlinkedRows() if journal.isStamped(row_hash)]
+        for i in range(0, len(unlinked_rows), batch_size):
+            batch = unlinked_rows[i:i + batch_size]
+            try:
+                linked_count += self.linkSubjects(subject_set, batch, journal)
+            except PanoptesAPIException as e:
+                failed_count += len(batch)
+                self.progress_callback(f"Error linking previously created subjects to the subject set: {e}")
+            self.reportUploadProgress(linked_count, total_subjects)
+
+        return linked_count, failed_count
+
+    @staticmethod
+    def addSubjectLinks(subject_set, subjects, batch_size=100):
+        """
+        Links subjects to a subject set, with a request for each batch of subjects.
+
+        Parameters
+        ----------
+            subject_set : SubjectSet object
+                The subject set that the subjects will be linked to.
+            subjects : list of Subject objects or subject IDs
+                The subjects to link. Subjects which are already linked are skipped.
+            batch_size : int, optional
+                The number of subjects linked by each request.
+
+        Notes
+        -----
+        SubjectSet.add, and the add method of the subject set's link collection, always link 100 subjects per request,
+        so the batchable method of LinkCollection which they wrap is called directly with the batch size.
+        """
+
+        LinkCollection.add(subject_set.links.subjects, subjects, batch_size=batch_size)
+
+    @staticmethod
+    def postSubjectLinks(subject_set, subject_ids):
+        """
+        Links subjects which aren't linked to a subject set yet, with a single request.
+
+        Parameters
+        ----------
+            subject_set : SubjectSet object
+                The subject set that the subjects will be linked to.
+            subject_ids : list of int or str
+                The IDs of the subjects to link.
+
+        Notes
+        -----
+        Unlike Spout.addSubjectLinks, the subjects aren't checked for membership first, which takes a request per
+        subject, so this is meant for subjects which were just created.
+        """
+
+        subject_set.http_post(f"{subject_set.id}/links/subjects", json={"subjects": [str(subject_id) for subject_id in subject_ids]}, retry=True)
+
+    @staticmethod
+    def removeSubjectLinks(subject_set, subjects, batch_size=100):
+        """
+        Unlinks subjects from a subject set, with a request for each batch of subjects.
+
+        Parameters
+        ----------
+            subject_set : SubjectSet object
+                The subject set that the subjects will be unlinked from.
+            subjects : list of Subject objects or subject IDs
+                The subjects to unlink. Subjects which are not linked are skipped.
+            batch_size : int, optional
+                The number of subjects unlinked by each request.
+        """
+
+        LinkCollection.remove(subject_set.links.subjects, subjects, batch_size=batch_size)
+
+    @staticmethod
+    def linkSubjects(subject_set, rows, journal=None, fresh=False):
+        """
+        Links created subjects to a subject set.
+
+        Parameters
+        ----------
+            subject_set : SubjectSet object
+                The subject set that the subjects will be linked to.
+            rows : list of tuples
+                Tuples of the form (row_hash, subject_id) of the subjects.
+            journal : UploadJournal, optional
+                The upload journal of the manifest, which the links are recorded in.
+            fresh : bool, optional
+                Whether the subjects were just created, so they can't be linked to the subject set yet and are linked
+                without membership checks (see Spout.postSubjectLinks). By default, it is False.
+
+        Returns
+        -------
+        int
+            The number of subjects linked.
+        """
+
+        subject_ids = [subject_id for row_hash, subject_id in rows]
+        if(fresh):
+            Spout.postSubjectLinks(subject_set, subject_ids)
+        else:
+            Spout.addSubjectLinks(subject_set, subject_ids, batch_size=len(rows))
+        Spout.invalidateCache(SubjectSet, subject_set.id)
+        if(journal is not None):
+            journal.recordLinked([row_hash for row_hash, subject_id in rows])
+        return len(rows)
+
+    def reportRequestStatistics(self):
+        """
+        Reports the counters of the request governor since they were last reported, then resets them.
+        """
+
+        statistics = self.request_governor.getStatistics()
+        self.request_governor.resetStatistics()
+        self.progress_callback(f"Zooniverse requests: {statistics['requests']} ({statistics['requests_per_second']:.1f} requests/s), {statistics['retries']} retries, {statistics['throttles']} throttled.")
+
+    def reportUploadProgress(self, linked_count, total_subjects):
+        """
+        Reports the number of subjects linked so far, if the total is known.
+        """
+
+        if(total_subjects is None):
+            return
+
+        try:
+            self.progress_callback(f"Upload Subjects: {min(linked_count, total_subjects)}/{total_subjects}", level=10)
+        except:
+            pass
+
+    @checkLogin
+    def streamSubjects(self, rows, project, subject_set, journal=None, total_subjects=None, initial_linked_count=0, batch_size=100, max_workers=None):
+        """
+        Creates and links subjects as they are generated, with creation and linking overlapped.
+
+        Parameters
+        ----------
+            rows : Iterable of tuples
+                Tuples of the form (row_hash, subject), as generated by Spout.iterateSubjects. Rows whose subject is None
+                are skipped.
+            project : Project object
+                The project that the subjects will be associated with.
+            subject_set : SubjectSet object
+                The subject set that the subjects will be linked to.
+            journal : UploadJournal, optional
+                The upload journal which the subjects were registered with.
+            total_subjects : int, optional
+                The total number of subjects, used for progress updates. By default, it is None.
+            initial_linked_count : int, optional
+                The number of subjects already linked, used for progress updates. By default, it is 0.
+            batch_size : int, optional
+                The number of created subjects linked to the subject set at once. By default, it is 100.
+            max_workers : int, optional
+                The number of subjects created concurrently. By default, it is Spout.max_workers.
+
+        Returns
+        -------
+        tuple
+            A tuple of the form (linked_count, failed_count) of the subjects streamed by this call.
+
+        Notes
+        -----
+            The rows are consumed lazily and subjects are created in a bounded thread pool (see Spout.mapConcurrently),
+            while a separate thread links each completed batch to the subject set. At most two link batches wait at a
+            time, so memory stays bounded regardless of the number of rows, and subjects appear in the subject set as
+            soon as their batch is created. Since the subjects were just created, each batch is linked with a single
+            request, without checking whether its subjects are already linked.
+        """
+
+        linked_count = 0
+        failed_count = 0
+
+        def createRow(row):
+            row_hash, subject = row
+            self.createSubject(subject, project, journal)
+            return row_hash, subject.id
+
+        def collectLinkFuture(future, size):
+            nonlocal linked_count, failed_count
+            try:
+                linked_count += future.result()
+            except PanoptesAPIException as e:
+                failed_count += size
+                self.progress_callback(f"Error linking subjects to the subject set: {e}")
+            self.reportUploadProgress(initial_linked_count + linked_count, total_subjects)
+
+        new_rows = (row for row in rows if row[1] is not None)
+        link_futures = []
+        batch = []
+
+        linkSubjects = self.bindClient(self.linkSubjects)
+
+        with ThreadPoolExecutor(max_workers=1) as link_executor:
+            for index, row, result, exception in self.mapConcurrently(createRow, new_rows, max_workers, self.termination_event):
+                if(exception is not None):
+                    if(not isinstance(exception, PanoptesAPIException)):
+                        raise exception
+                    failed_count += 1
+                    self.progress_callback(f"Error creating subject {index + 1}: {exception}")
+                    continue
+
+                batch.append(result)
+                if(len(batch) >= batch_size):
+                    link_futures.append((link_executor.submit(linkSubjects, subject_set, batch, journal, True), len(batch)))
+                    batch = []
+
+                    # Wait for older batches so that at most two batches are waiting to be linked.
+                    while(len(link_futures) > 2 or (len(link_futures) > 0 and link_futures[0][0].done())):
+                        collectLinkFuture(*link_futures.pop(0))
+
+            # Link the last batch even if the upload was terminated, since its subjects were already created.
+            if(len(batch) > 0):
+                link_futures.append((link_executor.submit(linkSubjects, subject_set, batch, journal, True), len(batch)))
+
+            for future, size in link_futures:
+                collectLinkFuture(future, size)
+
+        return linked_count, failed_count
+
+    @checkLogin
+    def removeSubjects(self, subject_set, subjects=None, override_verification=False):
+        """
+        Removes a list of subjects from a subject set on Zooniverse.
+
+        Parameters
+        ----------
+            subject_set : SubjectSet object
+                A SubjectSet object that the subjects will be removed from.
+            subjects : Subject object or list of Subject objects, optional
+               A subject object or list of subject objects that will be removed from the subject set.
+            override_verification : bool, optional
+                If False, the function will ask for user verification before removing the subjects.
+
+        Notes
+        -----
+            If subjects is None, then all subjects will be removed from the subject set.
+            Removing subjects from a subject set does not delete the subjects from Zooniverse. It only removes them
+            from the subject set and will leave them as orphaned subjects.
+        """
+
+        subject_set = self.findSubjectSet(subject_set)
+
+        full_wipe = False
+
+        if(subjects is not None):
+            if(not isinstance(subjects, list)):
+                if(isinstance(subjects, Subject)):
+                    subjects = [subjects]
+                else:
+                    raise TypeError("subjects must be a list of Subject objects or IDs")
+        else:
+            full_wipe = True
+            subjects = subject_set.subjects
+
+        subjects = self.findSubjects(subjects)
+
+        if(not override_verification):
+            print("This will remove all provided subjects from Zooniverse and cannot be undone. Are you sure you want to continue? (Yes or No)")
+            answer = input()
+
+            if (answer.lower() == "no"):
+                print("Cancelling deletion.")
+                return None
+            elif (answer.lower() != "yes"):
+                print("Invalid response. Cancelling removal.")
+                return None
+
+        removed_count, failed_subjects = self.runAdaptiveBatches(subjects, lambda batch, batch_size: self.removeSubjectLinks(subject_set, batch, batch_size), progress_name="Remove Subjects", max_batch_size=self.max_unlink_batch_size)
+        self.invalidateCache(SubjectSet, subject_set.id)
+
+        if (len(failed_subjects) > 0):
+            self.progress_callback(f"Error removing subjects: {len(failed_subjects)} of {len(subjects)} subjects were not removed from the subject set.")
+        elif (full_wipe):
+            self.progress_callback("All subjects removed from subject set.")
+        else:
+            self.progress_callback("Specified subjects removed from subject set.")
+
+    @formatSubjectsInput
+    def deleteSubjects(self, subjects, override_verification=False):
+        """
+        Deletes a list of subjects from Zooniverse.
+
+        Parameters
+        ----------
+            subjects : Subject object or list of Subject objects
+               A subject object or list of subject objects that will be deleted from Zooniverse.
+            override_verification : bool, optional
+                If False, the function will ask for user verification before deleting the subjects.
+
+        Notes
+        -----
+            Deleting subjects from Zooniverse will remove them from all subject sets and will delete them from the
+            Zooniverse database.
+        """
+
+        subjects = self.findSubjects(subjects)
+
+        total_subjects = len(subjects)
+
+        if(not override_verification):
+
+            print("This will delete all provided subjects from Zooniverse and cannot be undone. Are you sure you want to continue? (Yes or No)")
+            answer = input()
+
+            if (answer.lower() == "no"):
+                print("Cancelling deletion.")
+                return None
+            elif (answer.lower() != "yes"):
+                print("Invalid response. Cancelling removal.")
+                return None
+
+        deleted_count = 0
+        failed_count = 0
+        for index, subject, result, exception in self.mapConcurrently(lambda subject: subject.delete(), subjects, termination_event=self.termination_event):
+            if(exception is not None):
+                failed_count += 1
+                self.progress_callback(f"Subject {subject.id} could not be deleted: {exception}")
+            else:
+                deleted_count += 1
+                self.subject_fetch_times.pop(str(subject.id), None)
+
+            try:
+                self.progress_callback(f"Delete Subjects: {deleted_count + failed_count}/{total_subjects}", level=10)
+            except:
+                pass
+
+        # Deleted subjects leave every subject set they were in.
+        self.invalidateCache(SubjectSet)
+
+        if(failed_count > 0):
+            self.progress_callback(f"Error deleting subjects: {failed_count} of {total_subjects} subjects were not deleted.")
+        else:
+            self.progress_callback("Subjects deleted from Zooniverse.")
+
+    @formatSubjectsInput
+    def modifySubjectMetadataFieldName(self, subjects, current_field_names, new_field_names):
+        """
+        Modifies the metadata field of the subjects in the subject set.
+
+        Parameters
+        ----------
+        subjects : List of Subject objects
+            A list of Subject objects to be modified or a list of subject IDs to be modified.
+        current_field_names : list of str
+            The name of the metadata field to be modified.
         new_field_names : list of str
             The new name of the metadata field to be modified.
         """
@@ -710,26 +1612,7 @@ class Spout:
         if(len(current_field_names) != len(new_field_names)):
             raise ValueError("current_field_names and new_field_names must be the same length.")
 
-        total_subjects = len(subjects)
-        count = 1
-        for subject in subjects:
-            subject.reload()
-            modified = False
-            for i, current_field_name in enumerate(current_field_names):
-                try:
-                    subject.metadata[new_field_names[i]] = subject.metadata[current_field_name]
-                    del subject.metadata[current_field_name]
-                    modified = True
-                except KeyError:
-                    self.progress_callback(f" The field name, {current_field_name}, does not exist in the metadata of subject {subject.id}.")
-            if(modified):
-                subject.save()
-            try:
-                self.progress_callback(f"Modify Field Name: {count}/{total_subjects}", level=10)
-            except:
-                pass
-            count += 1
-        self.progress_callback("Specified subjects were modified.")
+        self.editSubjectMetadata(subjects, renames=dict(zip(current_field_names, new_field_names)), progress_name="Modify Field Name")
 
     @formatSubjectsInput
     def modifySubjectMetadataFieldValue(self, subjects, field_names, new_field_values):
@@ -763,18 +1646,137 @@ class Spout:
                 valid_new_fieldnames.append(field_names[i])
                 valid_new_field_values.append(new_field_values[i])
 
-        for subject in subjects:
-            subject.reload()
-            modified = False
-            for i, field_name in enumerate(valid_new_fieldnames):
-                try:
-                    subject.metadata[field_name] = valid_new_field_values[i]
-                    modified = True
-                except KeyError:
-                    self.progress_callback(f"Specified subject {subject.id} was not modified. The current field name, {field_name}, does not exist.")
-            if(modified):
-                subject.save()
-        self.progress_callback("Specified subjects were modified.")
+        field_values = dict(zip(valid_new_fieldnames, valid_new_field_values))
+        patch = {int(subject.id): field_values for subject in subjects}
+        self.editSubjectMetadata(subjects, patch=patch, progress_name="Modify Field Value")
+
+    @staticmethod
+    def loadMetadataPatch(patch_filename):
+        """
+        Loads a metadata patch from a CSV file.
+
+        Parameters
+        ----------
+            patch_filename : str
+                The filename of the CSV file. It has a subject_id column and one column per metadata field to change.
+                An empty cell leaves the field of that subject unchanged.
+
+        Returns
+        -------
+            dict
+                A dictionary of the form {subject_id: {field_name: new_value}}, as accepted by editSubjectMetadata.
+        """
+
+        patch = {}
+        with open(patch_filename, "r", newline="") as patch_file:
+            reader = csv.DictReader(patch_file)
+            if(reader.fieldnames is None or "subject_id" not in reader.fieldnames):
+                raise ValueError(f"The metadata patch {patch_filename} does not have a subject_id column.")
+
+            for row in reader:
+                subject_id = Spout.formatID(row.pop("subject_id"))
+                field_values = {field_name: value for field_name, value in row.items() if field_name is not None and value not in ("", None)}
+                patch.setdefault(subject_id, {}).update(field_values)
+        return patch
+
+    @formatSubjectsInput
+    def editSubjectMetadata(self, subjects, patch=None, renames=None, max_age=60, max_workers=None, progress_name="Modify Metadata", report_filename=None):
+        """
+        Edits the metadata of subjects concurrently, only saving the subjects whose metadata actually changes.
+
+        Parameters
+        ----------
+            subjects : List of Subject objects or List of int or str
+                The subjects to edit, as Subject objects or subject IDs.
+            patch : dict, optional
+                A dictionary of the form {subject_id: {field_name: new_value}} of new metadata values, such as the one
+                returned by loadMetadataPatch. Subjects which aren't in the patch only have their fields renamed.
+            renames : dict, optional
+                A dictionary of the form {current_field_name: new_field_name} of fields to rename in every subject.
+            max_age : float, optional
+                Subjects fetched from or saved to Zooniverse at most this many seconds ago are edited as they are,
+                all other subjects are reloaded first.
+            max_workers : int, optional
+                The number of subjects edited at once. By default, it is Spout.max_workers.
+            progress_name : str, optional
+                The name of the progress bar which the number of edited subjects is reported to.
+            report_filename : str, optional
+                If given, the report is also written to this CSV file.
+
+        Returns
+        -------
+            List of dicts
+                The report, in the order of the subjects, with one dictionary per subject of the form {"subject_id", "status", "changed_fields",
+                "missing_fields", "error"}, where the status is "modified", "unchanged", or "failed".
+        """
+
+        if(patch is None):
+            patch = {}
+        if(renames is None):
+            renames = {}
+
+        def editSubject(subject):
+            if(not self.isSubjectFresh(subject, max_age)):
+                subject.reload()
+                self.recordSubjectsFetched([subject])
+
+            current_metadata = dict(subject.raw.get("metadata") or {})
+            new_metadata = dict(current_metadata)
+
+            missing_fields = []
+            for current_field_name, new_field_name in renames.items():
+                if(current_field_name in new_metadata):
+                    new_metadata[new_field_name] = new_metadata.pop(current_field_name)
+                else:
+                    missing_fields.append(current_field_name)
+
+            new_metadata.update(patch.get(int(subject.id), {}))
+
+            changed_fields = [field_name for field_name in dict.fromkeys(list(current_metadata) + list(new_metadata))
+                              if field_name not in current_metadata or field_name not in new_metadata
+                              or current_metadata[field_name] != new_metadata[field_name]]
+
+            if(len(changed_fields) == 0):
+                return "unchanged", changed_fields, missing_fields
+
+            subject.raw["metadata"] = new_metadata
+            self.saveSubjectMetadata(subject)
+            return "modified", changed_fields, missing_fields
+
+        report = [None] * len(subjects)
+        edited_count = 0
+        for index, subject, result, exception in self.mapConcurrently(editSubject, subjects, max_workers=max_workers, termination_event=self.termination_event):
+            entry = {"subject_id": subject.id, "status": "failed", "changed_fields": "", "missing_fields": "", "error": ""}
+            if(exception is not None):
+                entry["error"] = str(exception)
+                self.progress_callback(f"Subject {subject.id} could not be modified: {exception}")
+            else:
+                status, changed_fields, missing_fields = result
+                entry.update(status=status, changed_fields=",".join(changed_fields), missing_fields=",".join(missing_fields))
+                for field_name in missing_fields:
+                    self.progress_callback(f"The field name, {field_name}, does not exist in the metadata of subject {subject.id}.")
+            report[index] = entry
+            edited_count += 1
+
+            try:
+                self.progress_callback(f"{progress_name}: {edited_count}/{len(subjects)}", level=10)
+            except:
+                pass
+
+        # Subjects which weren't edited before a termination are left out of the report.
+        report = [entry for entry in report if entry is not None]
+
+        modified_count = sum(entry["status"] == "modified" for entry in report)
+        failed_count = sum(entry["status"] == "failed" for entry in report)
+        self.progress_callback(f"Specified subjects were modified: {modified_count} modified, {len(report) - modified_count - failed_count} unchanged, {failed_count} failed.")
+
+        if(report_filename is not None):
+            with open(report_filename, "w", newline="") as report_file:
+                writer = csv.DictWriter(report_file, fieldnames=["subject_id", "status", "changed_fields", "missing_fields", "error"])
+                writer.writeheader()
+                writer.writerows(report)
+
+        return report
 
     @formatSubjectInput
     def subjectHasImages(self, subject):
@@ -818,47 +1820,255 @@ class Spout:
         subject = self.findSubject(subject)
         subject.reload()
 
-        image_filepaths = []
-        for i, location in enumerate(subject.raw['locations']):
-            image_filename = f"{subject.id}_image_{i}.jpg"
-            image_filepaths.append(self.downloadFromLocation(location, directory, image_filename))
+        downloads = [(location, directory, f"{subject.id}_image_{i}.jpg") for i, location in enumerate(subject.raw['locations'])]
+        image_filepaths, failures = self.downloadFromLocations(downloads, skip_existing=False)
+
+        if(len(failures) != 0):
+            raise failures[0][1]
 
         return image_filepaths
 
+    def getSubjectsImages(self, subjects, directory=None, skip_existing=True):
+        """
+        Gets the images of many subjects from the Zooniverse server, downloading all of their frames concurrently.
+
+        Parameters
+        ----------
+        subjects : list of Subject objects or subject IDs
+            The subjects to get the images of.
+        directory : str, optional
+            A string representing the directory where the images will be saved.
+        skip_existing : bool, optional
+            If True, images which were already downloaded to the directory are not downloaded again, so that an
+            interrupted batch can be resumed.
+
+        Returns
+        -------
+        dict
+            A dictionary of the form {subject_id: [image_filepath, ...]}. The filepath of an image which could not be
+            downloaded is None.
+        """
+
+        if(directory is None):
+            directory = os.getcwd()
+
+        subjects = self.findSubjects(subjects)
+
+        downloads = []
+        download_subject_ids = []
+        for subject in subjects:
+            for i, location in enumerate(subject.raw['locations']):
+                downloads.append((location, directory, f"{subject.id}_image_{i}.jpg"))
+                download_subject_ids.append(str(subject.id))
+
+        image_filepaths, failures = self.downloadFromLocations(downloads, skip_existing=skip_existing, progress_name="Download Images")
+
+        subject_images = {str(subject.id): [] for subject in subjects}
+        for subject_id, image_filepath in zip(download_subject_ids, image_filepaths):
+            subject_images[subject_id].append(image_filepath)
+
+        if(len(failures) != 0):
+            self.progress_callback(f"Error downloading images: {len(failures)} of {len(downloads)} images were not downloaded.")
+
+        return subject_images
+
+    @staticmethod
+    def getDownloadSession():
+        """
+        Returns the pooled session images are downloaded through, creating it on first use.
+
+        Returns
+        -------
+        requests.Session
+            The download session.
+        """
+
+        with Spout.download_session_lock:
+            if(Spout.download_session is None):
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=Spout.download_workers)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                Spout.download_session = session
+            return Spout.download_session
+
+    @staticmethod
+    def getLocationURL(location):
+        """
+        Returns the URL of a location on the Zooniverse server.
+
+        Parameters
+        ----------
+        location : dict or str
+            A dictionary of the form {mime_type: url}, as in the locations of a subject, or the URL itself.
+
+        Returns
+        -------
+        str
+            The URL, preferring the PNG of a location with several mime types.
+        """
+
+        if(isinstance(location, dict)):
+            return location["image/png"] if "image/png" in location else next(iter(location.values()))
+        return location
+
+    @staticmethod
+    def downloadToMemory(location):
+        """
+        Downloads a file from a location on the Zooniverse server into memory, through the pooled download session.
+
+        Parameters
+        ----------
+        location : dict or str
+            A dictionary of the form {mime_type: url}, as in the locations of a subject, or the URL of the file.
+
+        Returns
+        -------
+        bytes
+            The contents of the file.
+        """
+
+        url = Spout.getLocationURL(location)
+        session = Spout.getDownloadSession()
+
+        attempt = 0
+        while(True):
+            try:
+                response = session.get(url, timeout=Spout.download_timeout)
+                if(response.status_code < 500 or attempt >= Spout.download_retries):
+                    response.raise_for_status()
+                    return response.content
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+                if(attempt >= Spout.download_retries):
+                    raise
+
+            time.sleep(2 ** attempt)
+            attempt += 1
+
     @staticmethod
-    def downloadFromLocation(location, directory=None, filename=None):
+    def downloadFromLocation(location, directory=None, filename=None, skip_existing=False):
         """
         Downloads a file from a location on the Zooniverse server.
 
         Parameters
         ----------
-        location : str
-            A string representing the location of the file on the Zooniverse server.
+        location : dict or str
+            A dictionary of the form {mime_type: url}, as in the locations of a subject, or the URL of the file.
         directory : str
             A string representing the directory where the file will be saved.
+        filename : str, optional
+            The filename of the file. By default, it is the filename of the URL.
+        skip_existing : bool, optional
+            If True and the file was already downloaded, it is not downloaded again.
 
         Returns
         -------
         str
             A string representing the filepath of the downloaded file.
+
+        Notes
+        -----
+        The file is streamed to a partial file next to it, which is renamed once complete. If the download is
+        interrupted, the next attempt requests only the missing bytes, when the server supports range requests.
         """
 
+        url = Spout.getLocationURL(location)
+
         if(directory is None):
             directory = os.getcwd()
 
         if(filename is None):
-            filename = os.path.basename(location["image/png"])
+            filename = os.path.basename(url)
 
+        os.makedirs(directory, exist_ok=True)
         filepath = os.path.join(directory, filename)
 
-        # Make a request to download the file from the location on the Zooniverse server using requests
-        response = requests.get(location["image/png"])
+        if(skip_existing and os.path.isfile(filepath)):
+            return filepath
+
+        part_filepath = filepath + ".part"
+        session = Spout.getDownloadSession()
+
+        attempt = 0
+        while(True):
+            offset = os.path.getsize(part_filepath) if os.path.isfile(part_filepath) else 0
+            headers = {"Range": f"bytes={offset}-"} if offset > 0 else {}
+
+            try:
+                with session.get(url, headers=headers, stream=True, timeout=Spout.download_timeout) as response:
+                    # The partial file already holds the whole file.
+                    if(response.status_code == 416 and offset > 0):
+                        break
+
+                    if(response.status_code < 500 or attempt >= Spout.download_retries):
+                        response.raise_for_status()
+
+                        # A server which ignores the range sends the whole file again.
+                        with open(part_filepath, "ab" if response.status_code == 206 else "wb") as file:
+                            for chunk in response.iter_content(chunk_size=Spout.download_chunk_size):
+                                file.write(chunk)
+                        break
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+                if(attempt >= Spout.download_retries):
+                    raise
+
+            time.sleep(2 ** attempt)
+            attempt += 1
 
-        with open(filepath, 'wb') as file:
-            file.write(response.content)
+        os.replace(part_filepath, filepath)
 
         return filepath
 
+    def downloadFromLocations(self, downloads, skip_existing=True, max_workers=None, progress_name=None):
+        """
+        Downloads many files from locations on the Zooniverse server concurrently.
+
+        Parameters
+        ----------
+        downloads : list of tuples
+            A list of tuples of the form (location, directory, filename), as taken by Spout.downloadFromLocation.
+        skip_existing : bool, optional
+            If True, files which were already downloaded are not downloaded again, so that an interrupted batch can
+            be resumed.
+        max_workers : int, optional
+            The highest number of downloads in flight at once. By default, it is Spout.download_workers.
+        progress_name : str, optional
+            The name of the progress bar which the number of downloaded files is reported to.
+
+        Returns
+        -------
+        tuple
+            A tuple of the form (filepaths, failures). filepaths holds the filepath of each download in the order of
+            the downloads, or None if it failed or was terminated, and failures is a list of tuples of the form
+            (index, exception) of the failed downloads.
+        """
+
+        if(max_workers is None):
+            max_workers = self.download_workers
+
+        total_downloads = len(downloads)
+        filepaths = [None] * total_downloads
+        failures = []
+
+        def download(arguments):
+            location, directory, filename = arguments
+            return self.downloadFromLocation(location, directory, filename, skip_existing=skip_existing)
+
+        finished_count = 0
+        for index, arguments, filepath, exception in self.mapConcurrently(download, downloads, max_workers, self.termination_event):
+            finished_count += 1
+            if(exception is not None):
+                failures.append((index, exception))
+            else:
+                filepaths[index] = filepath
+
+            if(progress_name is not None):
+                try:
+                    self.progress_callback(f"{progress_name}: {finished_count}/{total_downloads}", level=10)
+                except:
+                    pass
+
+        return filepaths, failures
 
     @formatSubjectInput
     def subjectHasMetadata(self, subject):
@@ -898,8 +2108,6 @@ class Spout:
             A list of Subject objects from the specified project.
         """
 
-        subject_list = []
-
         if (subject_set is not None and only_orphans):
             raise Exception("You cannot specify a subject set ID and have only_orphans as True at the same time.")
 
@@ -914,11 +2122,12 @@ class Spout:
             if(subject_set.links.project.id != project_id):
                 raise Exception("The specified subject set is not associated with the specified project.")
 
-            subject_set_id = subject_set.id
-            total_subjects = Subject.where(project_id=project_id, subject_set_id=subject_set_id).meta["count"]
+            query = {"project_id": project_id, "subject_set_id": subject_set.id}
         else:
-            total_subjects = Subject.where(project_id=project_id).meta["count"]
-            subject_set_id = None
+            query = {"project_id": project_id}
+
+        first_page = Subject.where(page_size=self.page_size, **query)
+        total_subjects = first_page.meta["count"]
 
         if(not only_orphans):
             self.progress_callback(f"Getting {total_subjects} subjects from project {project_id}...")
@@ -927,18 +2136,11 @@ class Spout:
 
         self.progress_callback("Collecting subjects from Zooniverse...")
 
-        count = 1
-        for sms in Subject.where(project_id=project_id, subject_set_id=subject_set_id):
-            if (only_orphans):
-                if (len(sms.raw["links"]["subject_sets"]) == 0):
-                    subject_list.append(sms)
-            else:
-                subject_list.append(sms)
-            try:
-                self.progress_callback(f"Collect Subjects: {count}/{total_subjects}", level=10)
-            except:
-                pass
-            count += 1
+        page_filter = None
+        if (only_orphans):
+            page_filter = lambda sms: len(sms.raw["links"]["subject_sets"]) == 0
+
+        subject_list = self.fetchPages(Subject, query, first_page, page_filter=page_filter, progress_name="Collect Subjects")
 
         self.progress_callback("Subjects collected from Zooniverse.")
 
@@ -960,15 +2162,10 @@ class Spout:
             A list of Subject objects from the specified project.
         """
 
-        subject_list = []
-
         subject_set = self.findSubjectSet(subject_set)
-        subject_set_id = subject_set.id
+        query = {"subject_set_id": subject_set.id}
 
-        for sms in Subject.where(subject_set_id=subject_set_id):
-            subject_list.append(sms)
-
-        return subject_list
+        return self.fetchPages(Subject, query, Subject.where(page_size=self.page_size, **query))
 
     @formatProjectInput
     def getSubjectSetsFromProject(self, project):
@@ -986,15 +2183,76 @@ class Spout:
             A list of SubjectSet objects from the specified project.
         """
 
-        subject_set_list = []
-
         project = self.findProject(project)
-        project_id = project.id
+        query = {"project_id": project.id}
+
+        return self.fetchPages(SubjectSet, query, SubjectSet.where(page_size=self.page_size, **query))
+
+    def fetchPages(self, resource_class, query, first_page, page_filter=None, progress_name=None, max_workers=None):
+        """
+        Gets all resources matching a query from Zooniverse, fetching the pages of the result concurrently.
+
+        Parameters
+        ----------
+            resource_class : class
+                The panoptes_client class of the resources, such as Subject or SubjectSet.
+            query : dict
+                The query parameters of the resources, as passed to resource_class.where.
+            first_page : ResultPaginator
+                The result of resource_class.where(page_size=Spout.page_size, **query), which holds the first page and
+                the page count.
+            page_filter : function, optional
+                A function which takes in a resource and returns True if it should be kept. It is applied by the page
+                workers as each page arrives.
+            progress_name : str, optional
+                The name of the progress bar which the number of collected resources is reported to.
+            max_workers : int, optional
+                The number of pages fetched at once. By default, it is Spout.max_workers.
 
-        for sms in SubjectSet.where(project_id=project_id):
-            subject_set_list.append(sms)
+        Returns
+        -------
+            list
+                The resources matching the query, in the order the pages are returned by Zooniverse.
+        """
+
+        page_count = first_page.meta.get("page_count", 1)
+        total_resources = first_page.meta["count"]
+
+        def getPageResources(paginator):
+            # The object list of a page holds the raw resources. Iterating the paginator would wrap them, but would also
+            # fetch the pages after it.
+            return [resource_class(raw, etag=paginator.etag) for raw in paginator.object_list]
+
+        def fetchPage(page):
+            if(page == 1):
+                resources = getPageResources(first_page)
+            else:
+                resources = getPageResources(resource_class.where(page=page, page_size=self.page_size, **query))
+
+            if(resource_class is Subject):
+                self.recordSubjectsFetched(resources)
 
-        return subject_set_list
+            page_resource_count = len(resources)
+            if(page_filter is not None):
+                resources = [resource for resource in resources if page_filter(resource)]
+            return page_resource_count, resources
+
+        pages = {}
+        fetched_count = 0
+        for index, page, result, exception in self.mapConcurrently(fetchPage, range(1, page_count + 1), max_workers=max_workers, termination_event=self.termination_event):
+            if(exception is not None):
+                raise exception
+
+            page_resource_count, pages[page] = result
+            fetched_count += page_resource_count
+
+            if(progress_name is not None):
+                try:
+                    self.progress_callback(f"{progress_name}: {min(fetched_count, total_resources)}/{total_resources}", level=10)
+                except:
+                    pass
+
+        return [resource for page in sorted(pages) for resource in pages[page]]
 
     @formatSubjectSetInput
     def getProjectFromSubjectSet(self, subject_set):
@@ -1063,14 +2321,15 @@ class Spout:
             pass
 
         if (isinstance(user_identifier, str)):
-            for user in User.where(login=user_identifier):
-                return user
+            user = self.resource_cache.getOrFetch(User, f"login:{user_identifier}", lambda: next(iter(User.where(login=user_identifier)), None))
         elif (isinstance(user_identifier, int)):
-            for user in User.where(id=user_identifier):
-                return user
+            user = self.resource_cache.getOrFetch(User, user_identifier, lambda: next(iter(User.where(id=user_identifier)), None))
         else:
             raise Exception("Invalid user identifier. Must be a string or an int.")
 
+        if (user is not None):
+            return user
+
         self.progress_callback(f"Warning: User {user_identifier} does not exist or is inaccessible to the current user. Returning None.")
 
     @checkLogin
@@ -1097,8 +2356,7 @@ class Spout:
         if(user.raw['display_name'] == project.raw['links']['owner']['display_name']):
             return True
 
-        for project_role_id in project.raw['links']['project_roles']:
-            project_role = self.findProjectRole(project_role_id)
+        for project_role in self.findProjectRoles(project.raw['links']['project_roles']):
             if(project_role.raw['links']['owner']['id'] == user.id):
                 return True
 
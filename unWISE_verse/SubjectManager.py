@@ -1,9 +1,10 @@
-import ast
-import importlib.util
 import json
+import math
 import os
 import threading
 import time
+from collections import OrderedDict
+from datetime import datetime, timezone
 from tkinter import ttk
 from tkinter.scrolledtext import ScrolledText
 
@@ -12,6 +13,10 @@ from PIL import Image, ImageSequence, ImageTk
 from PIL.ImageTk import PhotoImage
 
 from unWISE_verse.Spout import Spout
+from unWISE_verse.SubjectStore import SubjectStore
+from unWISE_verse.DiskCache import DiskCache
+from unWISE_verse.VirtualListBox import VirtualListBox
+from unWISE_verse import FunctionalSearch
 import tkinter as tk
 from tkinter import filedialog as fd
 from Logger import Logger
@@ -38,6 +43,12 @@ def requiresOnline(func):
 
 class SubjectManager:
     directory = None
+
+    # The highest total size of the cached subject frames and GIFs, and the number of subjects on each side of the
+    # selected subject whose GIFs are prefetched.
+    gif_cache_bytes = 512 * 1024 ** 2
+    prefetch_count = 3
+
     def __init__(self, UI):
         self.UI = UI
         global user_interface
@@ -45,9 +56,7 @@ class SubjectManager:
         self.spout = None
         self.subjects = []
         self.subject_object_dict = {}
-        self.subject_dictionaries = []
-        self.subjects_dict = {}
-        self.subject_display_list = []
+        self.subject_store = SubjectStore()
         self.subjects_json_filename = None
         self.click_count = 0
 
@@ -72,6 +81,13 @@ class SubjectManager:
 
         self.subject_gif_directory = os.path.join(self.directory, "GIFs")
 
+        # The frames and GIFs of subjects are cached, so that frames downloaded for display are reused by GIF
+        # downloads, and GIFs are prefetched in the background.
+        self.subject_cache = DiskCache(self.subject_gif_directory, self.gif_cache_bytes)
+        self.gif_locks = {}
+        self.gif_locks_lock = threading.Lock()
+        self.gif_prefetcher = GIFPrefetcher(self)
+
     def createSpout(self):
         self.spout = Spout(login=self.UI.login, display_printouts=True, progress_callback=self.UI.display, termination_event=self.UI.termination_event)
 
@@ -109,98 +125,160 @@ class SubjectManager:
         else:
             self.subjects_json_filename = os.path.join(jsons_directory, f"{project}_subjects.json")
 
-        if (self.subjectFileExists(self.subjects_json_filename)):
-            if(request_online):
-                self.loadSubjectsFromJSON(self.subjects_json_filename)
-            else:
-                self.loadSubjectDictionariesFromJSON(self.subjects_json_filename)
-        else:
-            if(request_online):
-                try:
-                    self.UI.display("Collecting subjects from Zooniverse...")
-                    self.subjects = self.spout.getSubjectsFromProject(project=project, subject_set=subject_set, only_orphans=False)
-                    for subject in self.subjects:
-                        self.subject_object_dict[str(subject.id)] = subject
-                except Exception as e:
-                    self.UI.display(f"Error: {e}")
-                    return
-                global online
-                online = True
-                self.UI.display(f"Saving subjects to JSON file: {self.subjects_json_filename}")
-                self.saveSubjectsToJSON(filename=self.subjects_json_filename)
-                self.UI.display(f"Subjects saved.")
-            else:
-                self.UI.display("Subjects have not been collected. Please collect subjects online.")
+        if(request_online):
+            try:
+                self.refreshSubjects(project, subject_set)
+            except Exception as e:
+                self.UI.display(f"Error: {e}")
                 return
+        elif(self.subjectFileExists(self.subjects_json_filename)):
+            self.loadSubjectDictionariesFromJSON(self.subjects_json_filename)
+        else:
+            self.UI.display("Subjects have not been collected. Please collect subjects online.")
+            return
 
         self.UI.display(f"Compiling subjects for viewing...")
         self.subject_selection_container.setDefaultListBox()
         self.UI.display(f"Subjects compiled.")
 
     def removeSubjects(self, subject_ids):
+        subject_ids = set(str(subject_id) for subject_id in subject_ids)
+
+        self.subject_store.removeSubjects(subject_ids)
         for subject_id in subject_ids:
-            self.subjects_dict.pop(subject_id)
-            self.subject_object_dict.pop(subject_id)
-            for subject_dict in self.subject_dictionaries:
-                if(subject_dict['subject_id'] == subject_id):
-                    self.subject_dictionaries.remove(subject_dict)
-                    break
+            self.subject_object_dict.pop(subject_id, None)
 
-            self.subjects = self.getSubjectObjects(list(self.subjects_dict.keys()))
+        self.subjects = [subject for subject in self.subjects if str(subject.id) not in subject_ids]
 
         # If any of these subjects are selected, unselect them
-        for selected_subject in self.UI.selected_subjects:
-            if selected_subject in subject_ids:
-                self.UI.selected_subjects.remove(selected_subject)
+        self.UI.selected_subjects = [selected_subject for selected_subject in self.UI.selected_subjects if selected_subject not in subject_ids]
+        self.subject_selection_container.subject_list_box.deselect(subject_ids)
 
         self.subject_selection_container.setDefaultListBox()
 
+    def openSubjectStore(self, filename):
+        # The store of a subjects JSON file is kept next to it, and is only reimported when the JSON file changes.
+        store_filename = os.path.splitext(filename)[0] + ".sqlite"
+        if(self.subject_store.filename != store_filename):
+            self.subject_store.close()
+            self.subject_store = SubjectStore(store_filename)
+
+    def refreshSubjects(self, project, subject_set):
+        # Zooniverse can't list only the subjects updated since a given time, so every subject is listed a page at a
+        # time and compared with the last sync point, which records when each subject was last updated. Only the new
+        # and changed subjects are rebuilt, and the subjects which are no longer listed are dropped.
+        sync_filename = self.getSyncFilename(self.subjects_json_filename)
+
+        if(self.subjectFileExists(self.subjects_json_filename)):
+            self.loadSubjectDictionariesFromJSON(self.subjects_json_filename)
+            synced_updated_at = self.loadSyncState(sync_filename).get("updated_at", {})
+        else:
+            self.openSubjectStore(self.subjects_json_filename)
+            self.subject_store.replaceSubjects([])
+            synced_updated_at = {}
+
+        self.UI.display("Collecting subjects from Zooniverse...")
+        self.subjects = self.spout.getSubjectsFromProject(project=project, subject_set=subject_set, only_orphans=False)
+        self.subject_object_dict = {str(subject.id): subject for subject in self.subjects}
+
+        global online
+        online = True
+
+        stored_subject_ids = set(self.subject_store.getSubjectIDs())
+
+        new_count = 0
+        changed_subject_dicts = []
+        for subject_id, subject in self.subject_object_dict.items():
+            updated_at = subject.raw.get("updated_at", None)
+            if(subject_id not in stored_subject_ids):
+                new_count += 1
+            elif(updated_at is not None and synced_updated_at.get(subject_id, None) == updated_at):
+                continue
+
+            changed_subject_dicts.append(self.getSubjectDictionary(subject))
+
+        changed_count = len(changed_subject_dicts) - new_count
+        self.subject_store.putSubjects(changed_subject_dicts)
+
+        deleted_subject_ids = stored_subject_ids.difference(self.subject_object_dict)
+        self.subject_store.removeSubjects(deleted_subject_ids)
+
+        self.UI.display(f"Subjects synced: {new_count} new, {changed_count} changed, {len(deleted_subject_ids)} deleted.")
+
+        if(len(changed_subject_dicts) + len(deleted_subject_ids) != 0 or not self.subjectFileExists(sync_filename)):
+            self.UI.display(f"Saving subjects to JSON file: {self.subjects_json_filename}")
+            self.writeSubjectFiles(self.subjects_json_filename)
+            self.UI.display(f"Subjects saved.")
+
     @requiresOnline
     def saveSubjectsToJSON(self, filename):
-        self.subject_dictionaries = []
+        subject_dicts = []
         for subject in self.subjects:
-            subject.reload()
-            subject_dict = subject._savable_dict()
-            subject_dict['subject_id'] = subject.id
-            self.subject_dictionaries.append(subject_dict)
+            # Subjects which were already fetched from or saved to Zooniverse in this session are up to date.
+            if(not self.spout.isSubjectFresh(subject, math.inf)):
+                subject.reload()
+                self.spout.recordSubjectsFetched([subject])
+            subject_dicts.append(self.getSubjectDictionary(subject))
 
-        # Sort the subject dictionaries by subject ID
-        self.subject_dictionaries = sorted(self.subject_dictionaries, key=lambda x: x['subject_id'])
+        self.openSubjectStore(filename)
+        self.subject_store.replaceSubjects(subject_dicts)
+        self.writeSubjectFiles(filename)
 
-        for subject_dict in self.subject_dictionaries:
-            self.subjects_dict[subject_dict['subject_id']] = subject_dict
+        # The saved subjects replace the listed ones. Tk widgets may only be changed from the UI thread.
+        self.UI.window.after(0, self.subject_selection_container.setDefaultListBox)
 
-        self.subject_selection_container.resetSubjectDisplayList()
+    @staticmethod
+    def getSubjectDictionary(subject):
+        subject_dict = subject._savable_dict()
+        subject_dict['subject_id'] = subject.id
+        return subject_dict
 
+    def writeSubjectFiles(self, filename):
+        # The subject dictionaries are sorted by subject ID
         with open(filename, 'w') as json_file:
-            json.dump(self.subject_dictionaries, json_file, indent=4)
+            json.dump(list(self.subject_store.iterateSubjects()), json_file, indent=4)
 
-    def loadSubjectDictionariesFromJSON(self, filename):
-        with open(filename, 'r') as json_file:
-            self.subject_dictionaries = json.load(json_file)
+        self.subject_store.setProperty("source_signature", SubjectStore.getFileSignature(filename))
 
-        for subject_dict in self.subject_dictionaries:
-            self.subjects_dict[subject_dict['subject_id']] = subject_dict
+        # The sync point of the JSON file, which the next refresh compares the subjects on Zooniverse with.
+        sync_state = {"synced_at": datetime.now(timezone.utc).isoformat(),
+                      "updated_at": {subject_id: subject.raw.get("updated_at", None) for subject_id, subject in self.subject_object_dict.items()}}
 
-        self.subject_selection_container.resetSubjectDisplayList()
+        with open(self.getSyncFilename(filename), 'w') as sync_file:
+            json.dump(sync_state, sync_file)
 
-    def loadSubjectsFromJSON(self, filename):
-        with open(filename, 'r') as json_file:
-            self.subject_dictionaries = json.load(json_file)
+    @staticmethod
+    def getSyncFilename(filename):
+        return os.path.splitext(filename)[0] + "_sync.json"
 
-        for subject_dict in self.subject_dictionaries:
-            self.subjects_dict[subject_dict['subject_id']] = subject_dict
+    @staticmethod
+    def loadSyncState(filename):
+        if(not os.path.isfile(filename)):
+            return {}
+
+        try:
+            with open(filename, 'r') as sync_file:
+                return json.load(sync_file)
+        except (OSError, ValueError):
+            return {}
+
+    def loadSubjectDictionariesFromJSON(self, filename):
+        self.openSubjectStore(filename)
+
+        signature = SubjectStore.getFileSignature(filename)
+        if(self.subject_store.getProperty("source_signature") != signature):
+            with open(filename, 'r') as json_file:
+                self.subject_store.replaceSubjects(json.load(json_file))
+            self.subject_store.setProperty("source_signature", signature)
+
+    def loadSubjectsFromJSON(self, filename):
+        self.loadSubjectDictionariesFromJSON(filename)
 
-        self.UI.display(f"Loading {len(self.subject_dictionaries)} subjects from JSON file: " + filename)
-        subject_ids = [subject_dict['subject_id'] for subject_dict in self.subject_dictionaries]
+        subject_ids = self.subject_store.getSubjectIDs()
+        self.UI.display(f"Loading {len(subject_ids)} subjects from JSON file: " + filename)
         self.UI.display(f"Collecting Subjects from Zooniverse...")
 
-        self.subjects = []
-        total_subjects = len(subject_ids)
-        for index, subject_id in enumerate(subject_ids):
-            subject = self.spout.findSubject(subject_id)
-            self.subjects.append(subject)
-            self.UI.display(f"Collect Subjects: {index+1}/{total_subjects}", level=10)
+        self.subjects = self.spout.findSubjects(subject_ids, progress_callback=self.UI.display)
 
         self.UI.display(f"Subjects collected from Zooniverse.")
 
@@ -210,7 +288,7 @@ class SubjectManager:
         global online
         online = True
 
-        self.subject_selection_container.resetSubjectDisplayList()
+        self.subject_selection_container.setDefaultListBox()
 
     @staticmethod
     def subjectFileExists(filename):
@@ -219,49 +297,78 @@ class SubjectManager:
     def getSubjectImages(self, subject_id):
         # Use the locations in the subject dictionary to download the images from the Zooniverse server
 
-        subject_dict = self.subjects_dict[subject_id]
-        filepaths = []
-        for index, location in enumerate(subject_dict['locations']):
-            image_filename = f"{subject_id}_image_{index}.png"
-            filepath = self.spout.downloadFromLocation(location, self.subject_gif_directory, image_filename)
-            filepaths.append(filepath)
+        subject_dict = self.subject_store.getSubject(subject_id)
+        filenames = [f"{subject_id}_image_{index}.png" for index in range(len(subject_dict['locations']))]
 
-        return filepaths
+        # The frames are downloaded under the subject's GIF lock, so that the prefetcher and a selection of the same
+        # subject don't download to the same partial files at once.
+        with self.getGIFLock(subject_id):
+            # Frames which were already downloaded, for display or for a GIF download, are reused.
+            downloads = [(location, self.subject_gif_directory, filename) for location, filename in zip(subject_dict['locations'], filenames) if self.subject_cache.get(filename) is None]
 
-    def generateSubjectGIF(self, subject_id, duration = 5):
+            if(len(downloads) != 0):
+                # Every missing frame of the subject is downloaded at once through the shared download session.
+                filepaths, failures = self.spout.downloadFromLocations(downloads, skip_existing=False)
 
-        if(not os.path.exists(self.subject_gif_directory)):
-            os.makedirs(self.subject_gif_directory)
+                if(len(failures) != 0):
+                    raise failures[0][1]
 
-        gif_filename = f"{subject_id}.gif"
-        gif_filepath = os.path.join(self.subject_gif_directory, gif_filename)
+                for location, directory, filename in downloads:
+                    self.subject_cache.add(filename)
 
-        if(os.path.exists(gif_filepath)):
-            return gif_filepath
+            return [self.subject_cache.getFilepath(filename) for filename in filenames]
 
-        filepaths = self.getSubjectImages(subject_id)
+    def getSubjectFrameSources(self, subject_id):
+        # The frames of the subject which are cached are read from disk, and the rest are downloaded by the GIF
+        # exporter without being added to the cache, so that exporting many subjects doesn't evict the displayed ones.
+        # Each frame keeps its location, since its cached file may be evicted before the exporter reads it.
+        subject_dict = self.subject_store.getSubject(subject_id)
 
-        # Open the images and store them in a list
-        images = [Image.open(image_path) for image_path in filepaths]
+        frame_sources = []
+        for index, location in enumerate(subject_dict['locations']):
+            frame_sources.append((self.subject_cache.get(f"{subject_id}_image_{index}.png"), location))
+        return frame_sources
+
+    def getGIFLock(self, subject_id):
+        # Each subject's frames and GIF are generated by one thread at a time, so that a GIF being prefetched isn't
+        # generated again when its subject is selected. The lock is reentrant, since generating a GIF gets its frames.
+        with self.gif_locks_lock:
+            return self.gif_locks.setdefault(str(subject_id), threading.RLock())
+
+    def generateSubjectGIF(self, subject_id, duration = 5):
+        with self.getGIFLock(subject_id):
+            gif_filename = f"{subject_id}.gif"
+            gif_filepath = self.subject_cache.get(gif_filename)
 
-        ms_per_frame = int((duration*1000) / len(images))
+            if(gif_filepath is not None):
+                return gif_filepath
 
-        # Save the images as a GIF
-        images[0].save(
-            gif_filepath,
-            save_all=True,
-            append_images=images[1:],
-            duration=ms_per_frame,
-            loop=0
-        )
+            filepaths = self.getSubjectImages(subject_id)
 
-        # Delete the images
-        for image_path in filepaths:
-            os.remove(image_path)
+            # Open the images and store them in a list
+            images = [Image.open(image_path) for image_path in filepaths]
 
-        return gif_filepath
+            ms_per_frame = int((duration*1000) / len(images))
+
+            # Save the images as a GIF
+            images[0].save(
+                self.subject_cache.getFilepath(gif_filename),
+                save_all=True,
+                append_images=images[1:],
+                duration=ms_per_frame,
+                loop=0
+            )
+
+            # The frames stay in the cache for GIF downloads.
+            return self.subject_cache.add(gif_filename)
 
     def deleteCache(self):
+        # The subject store is closed first, so that its database file can be deleted.
+        self.subject_store.close()
+
+        # The GIF being prefetched is finished before its files are deleted.
+        self.gif_prefetcher.cancel()
+
         if(os.path.exists(self.directory)):
             # Delete the SubjectFiles directory
             for root, dirs, files in os.walk(self.directory, topdown=False):
@@ -270,20 +377,25 @@ class SubjectManager:
                 for name in dirs:
                     os.rmdir(os.path.join(root, name))
 
+        self.subject_cache.clear()
+
         self.subjects = []
-        self.subject_dictionaries = []
-        self.subjects_dict = {}
-        self.subject_display_list = []
+        self.subject_object_dict = {}
+        self.subject_store = SubjectStore()
 
         global online
         online = False
 
         self.subjects_json_filename = None
 
+        self.UI.selected_subjects = []
+        self.subject_selection_container.subject_list_box.clearSelection()
         self.subject_selection_container.setDefaultListBox()
         self.subject_panel.subject_page.clear()
 
         self.subject_panel.subject_display.displaying = False
+        with self.subject_panel.subject_display.frame_cache_lock:
+            self.subject_panel.subject_display.frame_cache.clear()
         self.UI.current_gif_frames = []
         self.UI.current_gif_fps = None
         self.subject_panel.subject_display.clearCanvas()
@@ -296,11 +408,52 @@ class SubjectManager:
             subject_objects.append(self.subject_object_dict[str(subject_id)])
         return subject_objects
 
+class GIFPrefetcher:
+    def __init__(self, subject_manager):
+        self.subject_manager = subject_manager
+        self.pending_subject_ids = []
+        self.prefetching = False
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.run, name="GIF Prefetcher", daemon=True)
+        self.thread.start()
+
+    def prefetch(self, subject_ids):
+        # A new request replaces the pending one, since the user has moved on to other subjects.
+        with self.condition:
+            self.pending_subject_ids = list(subject_ids)
+            self.condition.notify_all()
+
+    def cancel(self):
+        # Drops the pending subjects and waits for the GIF being prefetched, if any, to finish.
+        with self.condition:
+            self.pending_subject_ids = []
+            while(self.prefetching):
+                self.condition.wait()
+
+    def run(self):
+        while(True):
+            with self.condition:
+                while(len(self.pending_subject_ids) == 0):
+                    self.condition.wait()
+                subject_id = self.pending_subject_ids.pop(0)
+                self.prefetching = True
+
+            try:
+                self.subject_manager.generateSubjectGIF(subject_id)
+            except Exception:
+                # A GIF which couldn't be prefetched is generated again when its subject is selected.
+                pass
+            finally:
+                with self.condition:
+                    self.prefetching = False
+                    self.condition.notify_all()
+
 class SubjectSelectionContainer:
     def __init__(self, subject_manager):
         self.subject_manager = subject_manager
         self.UI = subject_manager.UI
-        self.subject_display_list = []
+        self.functional_search_thread = threading.Thread()
+        self.functional_search_termination_event = threading.Event()
         self.initializeUIElements()
 
     def initializeUIElements(self):
@@ -345,7 +498,8 @@ class SubjectSelectionContainer:
         self.subject_list_box_frame = ttk.Frame(master=self.subject_selection_container_frame)
         self.UI.configureFrame(self.subject_list_box_frame, 1, 1, self.UI.background_color_hex)
 
-        self.subject_list_box = tk.Listbox(master=self.subject_list_box_frame, font=("consolas", "8", "normal"), width=subject_list_width, height=20, selectmode=tk.EXTENDED)
+        # Only the rows in view are rendered, so that projects with many subjects don't lock up the window.
+        self.subject_list_box = VirtualListBox(self.subject_list_box_frame, rows=20, format_row=self.getFormattedSubjectID, font=("consolas", "8", "normal"), width=subject_list_width)
 
         def selectSubjects(event):
             self.subject_manager.click_count += 1
@@ -365,9 +519,7 @@ class SubjectSelectionContainer:
 
         self.subject_list_box.bind("<Double-Button-1>", getAllSubjects)
 
-        self.list_box_scrollbar = ttk.Scrollbar(self.subject_list_box_frame, orient="vertical", command=self.subject_list_box.yview)
-
-        self.subject_list_box.config(yscrollcommand=self.list_box_scrollbar.set)
+        self.list_box_scrollbar = self.subject_list_box.scrollbar
 
         # Collect and delete cache subjects frame
         self.search_utilities_frame = ttk.Frame(master=self.subject_selection_container_frame)
@@ -419,7 +571,7 @@ class SubjectSelectionContainer:
         self.search_button_frame.grid(row=1, column=0, sticky="w")
         self.search_button.grid(row=1, column=0, sticky="w")
         self.find_button.grid(row=1, column=1, sticky="w")
-        self.subject_list_box.grid(row=0, column=0, sticky="w")
+        self.subject_list_box.list_box.grid(row=0, column=0, sticky="w")
         self.list_box_scrollbar.grid(row=0, column=1, sticky="ns")
         self.subject_list_box_frame.grid(row=1, column=0, sticky="w")
         self.search_utilities_frame.grid(row=2, column=0, sticky="w")
@@ -435,40 +587,18 @@ class SubjectSelectionContainer:
         else:
             return f"✖ Subject {subject_id}"
 
-    @staticmethod
-    def getSubjectIDFromFormattedSubjectID(formatted_subject_id):
-        return formatted_subject_id.split(' ')[2]
+    def applyStringSearch(self, search_string, limit=None, offset=0):
+        # The subject IDs and metadata are searched through the full-text index of the subject store.
+        return self.subject_manager.subject_store.search(search_string, limit=limit, offset=offset)
 
-    def applyStringSearch(self, search_string):
+    def countStringSearch(self, search_string):
+        return self.subject_manager.subject_store.countSearch(search_string)
 
-        valid_subjects = []
-
-        for subject_dict in self.subject_manager.subject_dictionaries:
-            subject_id = subject_dict['subject_id']
-            subject_metadata = self.subject_manager.subjects_dict.get(subject_id, None)
-
-            if(search_string in subject_id):
-                valid_subjects.append(subject_id)
-            else:
-                if(subject_metadata is None):
-                    continue
-                metadata_keys = list(subject_metadata['metadata'].keys())
-                metadata_values = list(subject_metadata['metadata'].values())
-
-                for key, value in zip(metadata_keys, metadata_values):
-                    if(search_string in key.lower() or search_string in value.lower()):
-                        valid_subjects.append(subject_id)
-                        break
-
-        # Sort subjects
-        valid_subjects.sort()
-
-        return valid_subjects
-    
-    def applyFunctionalSearch(self, search_function_filepath):
+    def applyFunctionalSearch(self, search_function_filepath, termination_event=None):
         # A search function file is a .py file which contains one function declaration.
         # The function must take a dictionary as an argument and return a boolean value which determines if the subject
-        # satisfies the search criteria.
+        # satisfies the search criteria. If its argument is annotated as a pandas DataFrame, it is instead given the
+        # metadata of many subjects at once, indexed by subject ID, and must return a boolean mask of the rows.
 
         filename = os.path.basename(search_function_filepath)
 
@@ -478,54 +608,39 @@ class SubjectSelectionContainer:
             self.UI.display(f"Filetype Error: The search function file, {filename}, must be a .py file.")
             return None
 
-        # Step 1: Read the file content
-        with open(search_function_filepath, 'r') as file:
-            file_content = file.read()
-
-        # Step 2: Parse the file content to identify functions
-        parsed_ast = ast.parse(file_content)
-        function_defs = [node for node in parsed_ast.body if isinstance(node, ast.FunctionDef)]
+        function_names, vectorized = FunctionalSearch.parseSearchFunctionFile(search_function_filepath)
 
-        # Step 3: Ensure there is exactly one function
-        if len(function_defs) != 1:
+        # Ensure there is exactly one function
+        if len(function_names) != 1:
             self.UI.display(f"Search failed.")
             self.UI.display(f"Syntax Error: The search function file, {filename}, must contain exactly one function.")
             return None
 
-        function_name = function_defs[0].name
+        # Apply the function to the subjects in a process pool, a chunk of subjects at a time
+        total_subjects = self.subject_manager.subject_store.countSubjects()
+        self.UI.display(f"Applying search function from {filename} to {total_subjects} subjects.")
 
-        # Step 4: Import the function dynamically
-        module_name = os.path.splitext(os.path.basename(search_function_filepath))[0]
-        spec = importlib.util.spec_from_file_location(module_name, search_function_filepath)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
+        def displayProgress(searched_count, total_subjects):
+            self.UI.display(f"Functional Search:{searched_count}/{total_subjects}", level=self.UI.logger.level_values.get("DEBUG"))
 
-        search_function = getattr(module, function_name)
+        def displayFailure(subject_id, error_message):
+            self.UI.display(f"Search function failed on subject {subject_id}.")
+            self.UI.display(f"Error: {error_message}")
 
-        # Step 5: Apply the function to the subjects
-        self.UI.display(f"Applying search function from {filename} to {len(self.subject_manager.subject_dictionaries)} subjects.")
-        valid_subjects = []
-        failure_count = 0
-
-        for subject_dict in self.subject_manager.subject_dictionaries:
-            subject_id = subject_dict['subject_id']
-            try:
-                result = search_function(subject_dict)
-                if(type(result) != bool):
-                    self.UI.display(f"Error: The function must return a boolean value.")
-                    return None
-
-                if (result):
-                    valid_subjects.append(subject_id)
-            except Exception as e:
-                self.UI.display(f"Search function failed on subject {subject_id}.")
-                self.UI.display(f"Error: {e}")
-                failure_count += 1
-                continue
+        try:
+            valid_subjects = FunctionalSearch.runFunctionalSearch(search_function_filepath, function_names[0], self.subject_manager.subject_store.iterateSubjects(), total_subjects,
+                                                                  vectorized=vectorized, termination_event=termination_event, progress_callback=displayProgress, failure_callback=displayFailure)
+        except Exception as e:
+            self.UI.display(f"Search failed.")
+            self.UI.display(f"Error: {e}")
+            return None
 
-            if(failure_count > 3):
+        if(valid_subjects is None):
+            if(termination_event is not None and termination_event.is_set()):
+                self.UI.display(f"Functional search cancelled.")
+            else:
                 self.UI.display(f"Search function failed on too many subjects. Aborting search. Verify the function's logic.")
-                return None
+            return None
 
         if(len(valid_subjects) == 1):
             self.UI.display(f"Search function found 1 subject which satisfied the functional criteria.")
@@ -537,50 +652,45 @@ class SubjectSelectionContainer:
     def searchSubjects(self):
         search_string = self.UI.subjectSearchQuery.get()
 
-        valid_subjects = []
+        # Searching while a functional search is running cancels it.
+        if(self.functional_search_thread.is_alive()):
+            self.UI.display(f"Cancelling functional search...")
+            self.functional_search_termination_event.set()
+            return
 
         if(search_string == "" or search_string == "Search for subjects..."):
             self.setDefaultListBox()
             return
 
         if (search_string.endswith('.py')):
-            valid_subjects = self.applyFunctionalSearch(search_string)
-        else:
-            valid_subjects = self.applyStringSearch(search_string)
-
-        self.setSubjectDisplayList(valid_subjects)
-        self.fillSubjectListBox()
+            # Functional searches run off the UI thread, so that the window stays responsive.
+            self.functional_search_termination_event = threading.Event()
 
-    def setDefaultListBox(self):
-        self.resetSubjectDisplayList()
-        self.fillSubjectListBox()
+            def functionalSearch(termination_event):
+                valid_subjects = self.applyFunctionalSearch(search_string, termination_event)
+                if(valid_subjects is not None):
+                    # Tk widgets may only be changed from the UI thread.
+                    self.UI.window.after(0, lambda: self.subject_list_box.setIDs(valid_subjects))
 
-    def setSubjectDisplayList(self, subject_ids):
-        self.subject_manager.subject_display_list = []
-        for subject_id in subject_ids:
-            self.subject_manager.subject_display_list.append(self.getFormattedSubjectID(subject_id))
-
-    def resetSubjectDisplayList(self):
-        self.subject_manager.subject_display_list = []
-        for subject_dict in self.subject_manager.subject_dictionaries:
-            self.subject_manager.subject_display_list.append(self.getFormattedSubjectID(subject_dict['subject_id']))
+            self.functional_search_thread = threading.Thread(target=functionalSearch, args=(self.functional_search_termination_event,), daemon=True)
+            self.functional_search_thread.start()
+        else:
+            # The matching subjects are paged in from the subject store as the list box is scrolled.
+            self.subject_list_box.setSource(self.countStringSearch(search_string), lambda offset, limit: self.applyStringSearch(search_string, limit=limit, offset=offset))
 
-    def fillSubjectListBox(self):
-        self.subject_list_box.delete(0, tk.END)
-        for subject_id in self.subject_manager.subject_display_list:
-            self.subject_list_box.insert(tk.END, subject_id)
+    def setDefaultListBox(self):
+        # Every subject in the store is listed, and paged in from the store as the list box is scrolled.
+        self.subject_list_box.setSource(self.subject_manager.subject_store.countSubjects(), lambda offset, limit: self.subject_manager.subject_store.getSubjectIDs(limit=limit, offset=offset))
 
     def selectSubjects(self):
-        self.UI.selected_subjects = []
-
-        for index in self.subject_list_box.curselection():
-            subject_item = self.subject_list_box.get(index)
-            # Get the subject id from the subject item
-            self.UI.selected_subjects.append(self.getSubjectIDFromFormattedSubjectID(subject_item))
+        self.UI.selected_subjects = self.subject_list_box.getSelectedIDs()
 
         if(len(self.UI.selected_subjects) > 0):
             self.UI.current_gif_frames = self.subject_manager.subject_panel.subject_display.getGIFFrames("Ajax_loader_metal_512_modified.gif")
 
+        if(self.subject_list_box.anchor_index is not None):
+            self.prefetchNeighbouringGIFs(self.subject_list_box.anchor_index)
+
         try:
             if(self.subject_manager.click_count == 1):
                 self.UI.select_subjects_thread = threading.Thread(target=self.subject_manager.subject_panel.subject_display.setCurrentGIF, args=(self.UI.selected_subjects[0],))
@@ -590,10 +700,7 @@ class SubjectSelectionContainer:
                 def wait_and_display():
                     self.UI.select_subjects_thread.join()
 
-                    for index in self.subject_list_box.curselection():
-                        subject_item = self.subject_list_box.get(index)
-                        # Get the subject id from the subject item
-                        self.UI.selected_subjects.append(self.getSubjectIDFromFormattedSubjectID(subject_item))
+                    self.UI.selected_subjects = self.subject_list_box.getSelectedIDs()
 
                     self.UI.select_subjects_thread = threading.Thread(target=self.subject_manager.subject_panel.subject_display.setCurrentGIF, args=(self.UI.selected_subjects[0],))
                     self.UI.select_subjects_thread.start()
@@ -605,18 +712,31 @@ class SubjectSelectionContainer:
 
         self.subject_manager.click_count = 0
 
+    def prefetchNeighbouringGIFs(self, index):
+        # The GIFs of the subjects next to the selected one are generated in the background, nearest first, so that
+        # paging through the list box doesn't wait for downloads.
+        global online
+        if(not online):
+            return
+
+        prefetch_count = self.subject_manager.prefetch_count
+        first_index = max(0, index - prefetch_count)
+        page = self.subject_list_box.getIDs(first_index, index + prefetch_count + 1 - first_index)
+
+        subject_ids = []
+        for offset in range(1, prefetch_count + 1):
+            for neighbouring_index in [index + offset, index - offset]:
+                if(0 <= neighbouring_index - first_index < len(page)):
+                    subject_ids.append(page[neighbouring_index - first_index])
+        self.subject_manager.gif_prefetcher.prefetch(subject_ids)
+
     def unselectSubjects(self):
         self.UI.selected_subjects = []
-        self.subject_list_box.selection_clear(0, tk.END)
+        self.subject_list_box.clearSelection()
 
     def getAllSubjects(self):
-        self.UI.selected_subjects = []
-        self.subject_list_box.selection_set(0, tk.END)
-
-        for index in self.subject_list_box.curselection():
-            subject_item = self.subject_list_box.get(index)
-            # Get the subject id from the subject item
-            self.UI.selected_subjects.append(self.getSubjectIDFromFormattedSubjectID(subject_item))
+        self.subject_list_box.selectAll()
+        self.UI.selected_subjects = self.subject_list_box.getSelectedIDs()
 
 class SubjectPanel:
     def __init__(self, subject_manager):
@@ -702,7 +822,7 @@ class SubjectPage:
 
     def showSubjectMetadata(self, subject_id):
         # Get the metadata of the subject
-        subject_dict = self.subject_manager.subjects_dict[subject_id]
+        subject_dict = self.subject_manager.subject_store.getSubject(subject_id)
         subject_metadata = subject_dict['metadata']
 
         self.subject_metadata_scrolled_text.configure(state=tk.NORMAL)
@@ -725,12 +845,18 @@ class SubjectPage:
         self.subject_info_type_radio_button_frame.grid_forget()
 
 class SubjectDisplay:
+    # The number of decoded GIFs kept in memory.
+    frame_cache_size = 32
+
     def __init__(self, subject_manager):
         self.subject_manager = subject_manager
         self.UI = subject_manager.UI
         self.default_canvas_size = (378, 320)
         self.frame_index = 0
         self.displaying = False
+        self.requested_subject_id = None
+        self.frame_cache = OrderedDict()
+        self.frame_cache_lock = threading.Lock()
         self.initializeUIElements()
         self.start_time = None
         self.first_display = False
@@ -833,23 +959,10 @@ class SubjectDisplay:
     def clearCanvas(self):
         self.subject_display_canvas.delete("all")
 
-    def getGIFFrames(self, gif_filepath):
+    def decodeGIFFrames(self, gif_filepath, canvas_size):
+        # Decodes and resizes the frames of a GIF without touching Tk, so that it can run off the UI thread.
         gif = Image.open(gif_filepath)
 
-        def get_gif_fps(gif_image):
-            # Open the GIF file
-            frames = gif_image.n_frames
-
-            # Calculate total duration in milliseconds
-            total_duration = sum([gif_image.info['duration'] for frame in range(frames)])
-
-            # Calculate the average FPS
-            average_fps = frames / (total_duration / 1000)
-
-            return average_fps
-
-        self.UI.current_gif_fps = get_gif_fps(gif)
-
         gif_width, gif_height = gif.width, gif.height
 
         gif_aspect_ratio = gif_width / gif_height
@@ -857,7 +970,7 @@ class SubjectDisplay:
         # Resize the gif to fit the canvas size while maintaining the aspect ratio
 
         # Scale the size of the gif until its width or height matches the canvas width or height
-        canvas_width, canvas_height = self.default_canvas_size
+        canvas_width, canvas_height = canvas_size
 
         # Scale by height
         new_height = canvas_height
@@ -866,29 +979,86 @@ class SubjectDisplay:
         # Get the width and height of the gif
         image_size = (new_width, new_height)
 
+        frames = []
+        total_duration = 0
+        for frame in ImageSequence.Iterator(gif):
+            # The duration of each frame is read after seeking to it. Frames without one are shown for 100 ms, as
+            # browsers do.
+            total_duration += frame.info.get('duration', 0) or 100
+            frames.append(frame.convert("RGBA").resize(image_size, Image.LANCZOS))
+
+        # Calculate the average FPS
+        gif_fps = len(frames) / (total_duration / 1000)
+
+        return frames, gif_fps, image_size
+
+    def getDecodedGIFFrames(self, key, gif_filepath):
+        # The decoded frames of recently viewed GIFs are kept in memory, keyed by subject ID and canvas size, so that
+        # switching between them doesn't decode them again.
+        key = (key, self.default_canvas_size)
+        with self.frame_cache_lock:
+            if(key in self.frame_cache):
+                self.frame_cache.move_to_end(key)
+                return self.frame_cache[key]
+
+        decoded_frames = self.decodeGIFFrames(gif_filepath, self.default_canvas_size)
+
+        with self.frame_cache_lock:
+            self.frame_cache[key] = decoded_frames
+            while(len(self.frame_cache) > self.frame_cache_size):
+                self.frame_cache.popitem(last=False)
+
+        return decoded_frames
+
+    def getCachedGIFFrames(self, key):
+        with self.frame_cache_lock:
+            decoded_frames = self.frame_cache.get((key, self.default_canvas_size), None)
+            if(decoded_frames is not None):
+                self.frame_cache.move_to_end((key, self.default_canvas_size))
+            return decoded_frames
+
+    def showGIFFrames(self, decoded_frames):
+        # The only work left for the Tk thread is sizing the canvas and creating the PhotoImages.
+        frames, gif_fps, image_size = decoded_frames
+        new_width, new_height = image_size
+
+        self.UI.current_gif_fps = gif_fps
+
         # Set the canvas size to the new width and height
         self.subject_display_canvas.config(width=new_width, height=new_height)
 
-        width_diff = new_width - canvas_width
+        width_diff = new_width - self.default_canvas_size[0]
 
         if(width_diff > 0):
             self.UI.window.geometry(f"{self.UI.window.winfo_width() + width_diff}x{self.UI.window.winfo_height()}")
         else:
             self.UI.window.geometry("550x920")
 
-        frames = [ImageTk.PhotoImage(frame.copy().resize(image_size, Image.ANTIALIAS)) for frame in ImageSequence.Iterator(gif)]
+        return [ImageTk.PhotoImage(frame) for frame in frames]
 
-        return frames
+    def getGIFFrames(self, gif_filepath):
+        return self.showGIFFrames(self.getDecodedGIFFrames(gif_filepath, gif_filepath))
 
     def getSubjectGIFFrames(self, subject_id):
-        gif_filepath = self.subject_manager.generateSubjectGIF(subject_id, duration=5)
-        frames = self.getGIFFrames(gif_filepath)
-        return frames
+        decoded_frames = self.getCachedGIFFrames(subject_id)
+        if(decoded_frames is None):
+            gif_filepath = self.subject_manager.generateSubjectGIF(subject_id, duration=5)
+            decoded_frames = self.getDecodedGIFFrames(subject_id, gif_filepath)
+        return decoded_frames
 
     def setCurrentGIF(self, subject_id):
-        self.UI.current_gif_frames = self.getSubjectGIFFrames(subject_id)
-        self.frame_index = 0
-        self.first_display = True
+        self.requested_subject_id = subject_id
+        decoded_frames = self.getSubjectGIFFrames(subject_id)
+
+        def show():
+            # A subject selected after this one replaces it.
+            if(self.requested_subject_id != subject_id):
+                return
+            self.UI.current_gif_frames = self.showGIFFrames(decoded_frames)
+            self.frame_index = 0
+            self.first_display = True
+
+        self.UI.window.after(0, show)
 
     def place(self):
         self.subject_display_frame.grid(row=0, column=1, sticky="nse")
@@ -0,0 +1,260 @@
+import json
+import os
+import sqlite3
+import threading
+
+class SubjectStore:
+    def __init__(self, filename=":memory:"):
+        """
+        Embedded SQLite store of subject dictionaries, indexed by subject ID and searchable by their metadata.
+
+        Parameters
+        ----------
+        filename : str, optional
+            The filename of the SQLite database. By default, the store is kept in memory.
+
+        Notes
+        -----
+        The subject ID, metadata keys, and metadata values of every subject are indexed with an FTS5 trigram index,
+        so that case-insensitive substring searches of three or more characters use the index. Shorter searches, and
+        every search on SQLite builds without FTS5, scan the indexed text instead.
+        """
+
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+
+        with self.lock, self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS subjects (rowid INTEGER PRIMARY KEY, subject_id TEXT UNIQUE NOT NULL, data TEXT NOT NULL)")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS properties (key TEXT PRIMARY KEY, value TEXT)")
+
+            try:
+                self.connection.execute("CREATE VIRTUAL TABLE IF NOT EXISTS subject_search USING fts5(content, tokenize='trigram')")
+                self.full_text_search = True
+            except sqlite3.OperationalError:
+                self.connection.execute("CREATE TABLE IF NOT EXISTS subject_search (rowid INTEGER PRIMARY KEY, content TEXT)")
+                self.full_text_search = False
+
+    @staticmethod
+    def getSearchText(subject_dict):
+        """
+        Returns the text a subject is searched by, which is its subject ID and its metadata keys and values.
+        """
+
+        metadata = subject_dict.get('metadata', {})
+        return "\n".join([str(subject_dict['subject_id'])] + [f"{key}\n{value}" for key, value in metadata.items()])
+
+    def close(self):
+        """
+        Closes the database.
+        """
+
+        with self.lock:
+            self.connection.close()
+
+    def getProperty(self, key):
+        """
+        Returns a property of the store, such as the signature of the file it was loaded from, or None if it isn't set.
+        """
+
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM properties WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def setProperty(self, key, value):
+        """
+        Sets a property of the store.
+        """
+
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO properties (key, value) VALUES (?, ?)", (key, value))
+
+    def deleteRows(self, subject_ids):
+        # Must be called with the lock held and inside a transaction.
+        subject_ids = [(str(subject_id),) for subject_id in subject_ids]
+        self.connection.executemany("DELETE FROM subject_search WHERE rowid = (SELECT rowid FROM subjects WHERE subject_id = ?)", subject_ids)
+        self.connection.executemany("DELETE FROM subjects WHERE subject_id = ?", subject_ids)
+
+    def insertRows(self, subject_dicts):
+        # Must be called with the lock held and inside a transaction, after the subjects were deleted.
+        first_rowid = self.connection.execute("SELECT COALESCE(MAX(rowid), 0) + 1 FROM subjects").fetchone()[0]
+        rows = [(first_rowid + index, subject_dict) for index, subject_dict in enumerate(subject_dicts)]
+
+        self.connection.executemany("INSERT INTO subjects (rowid, subject_id, data) VALUES (?, ?, ?)", ((rowid, str(subject_dict['subject_id']), json.dumps(subject_dict)) for rowid, subject_dict in rows))
+        self.connection.executemany("INSERT INTO subject_search (rowid, content) VALUES (?, ?)", ((rowid, self.getSearchText(subject_dict)) for rowid, subject_dict in rows))
+
+    def replaceSubjects(self, subject_dicts):
+        """
+        Replaces every subject in the store.
+
+        Parameters
+        ----------
+        subject_dicts : Iterable of dict
+            The subject dictionaries, each with a 'subject_id' key.
+        """
+
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM subject_search")
+            self.connection.execute("DELETE FROM subjects")
+            self.insertRows(subject_dicts)
+
+    def putSubjects(self, subject_dicts):
+        """
+        Adds subjects to the store, replacing the subjects with the same IDs.
+
+        Parameters
+        ----------
+        subject_dicts : Iterable of dict
+            The subject dictionaries, each with a 'subject_id' key.
+        """
+
+        subject_dicts = list(subject_dicts)
+        with self.lock, self.connection:
+            self.deleteRows(subject_dict['subject_id'] for subject_dict in subject_dicts)
+            self.insertRows(subject_dicts)
+
+    def removeSubjects(self, subject_ids):
+        """
+        Removes subjects from the store. IDs which aren't in the store are ignored.
+
+        Parameters
+        ----------
+        subject_ids : Iterable of int or str
+            The IDs of the subjects.
+        """
+
+        with self.lock, self.connection:
+            self.deleteRows(subject_ids)
+
+    def getSubject(self, subject_id):
+        """
+        Returns the dictionary of a subject, or None if it isn't in the store.
+        """
+
+        with self.lock:
+            row = self.connection.execute("SELECT data FROM subjects WHERE subject_id = ?", (str(subject_id),)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def hasSubject(self, subject_id):
+        """
+        Checks if a subject is in the store.
+        """
+
+        with self.lock:
+            return self.connection.execute("SELECT 1 FROM subjects WHERE subject_id = ?", (str(subject_id),)).fetchone() is not None
+
+    def countSubjects(self):
+        """
+        Returns the number of subjects in the store.
+        """
+
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM subjects").fetchone()[0]
+
+    def getSubjectIDs(self, limit=None, offset=0):
+        """
+        Returns a page of the IDs of the subjects in the store, sorted by subject ID.
+
+        Parameters
+        ----------
+        limit : int, optional
+            The number of IDs in the page. By default, every ID from the offset onwards is returned.
+        offset : int, optional
+            The number of IDs before the page.
+
+        Returns
+        -------
+        list of str
+            The subject IDs.
+        """
+
+        with self.lock:
+            rows = self.connection.execute("SELECT subject_id FROM subjects ORDER BY subject_id LIMIT ? OFFSET ?", (-1 if limit is None else limit, offset)).fetchall()
+        return [row[0] for row in rows]
+
+    def iterateSubjects(self, batch_size=1000):
+        """
+        Iterates over the dictionaries of the subjects in the store, sorted by subject ID.
+
+        Parameters
+        ----------
+        batch_size : int, optional
+            The number of subjects read from the database at once.
+
+        Yields
+        ------
+        dict
+            A subject dictionary.
+        """
+
+        last_subject_id = ""
+        while(True):
+            with self.lock:
+                rows = self.connection.execute("SELECT subject_id, data FROM subjects WHERE subject_id > ? ORDER BY subject_id LIMIT ?", (last_subject_id, batch_size)).fetchall()
+
+            if(len(rows) == 0):
+                return
+
+            for subject_id, data in rows:
+                yield json.loads(data)
+            last_subject_id = rows[-1][0]
+
+    def getSearchCondition(self, search_string):
+        """
+        Returns the SQL condition on the subject_search table and its parameters which match a search string.
+        """
+
+        if(self.full_text_search and len(search_string) >= 3):
+            return "subject_search MATCH ?", ('"' + search_string.replace('"', '""') + '"',)
+
+        escaped_string = search_string.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return "lower(subject_search.content) LIKE ? ESCAPE '\\'", (f"%{escaped_string}%",)
+
+    def search(self, search_string, limit=None, offset=0):
+        """
+        Returns a page of the IDs of the subjects whose subject ID, metadata keys, or metadata values contain a search
+        string, ignoring case, sorted by subject ID.
+
+        Parameters
+        ----------
+        search_string : str
+            The string to search for.
+        limit : int, optional
+            The number of IDs in the page. By default, every ID from the offset onwards is returned.
+        offset : int, optional
+            The number of IDs before the page.
+
+        Returns
+        -------
+        list of str
+            The IDs of the matching subjects.
+        """
+
+        condition, parameters = self.getSearchCondition(search_string)
+        query = f"SELECT subjects.subject_id FROM subject_search JOIN subjects ON subjects.rowid = subject_search.rowid WHERE {condition} ORDER BY subjects.subject_id LIMIT ? OFFSET ?"
+
+        with self.lock:
+            rows = self.connection.execute(query, parameters + (-1 if limit is None else limit, offset)).fetchall()
+        return [row[0] for row in rows]
+
+    def countSearch(self, search_string):
+        """
+        Returns the number of subjects which match a search string, as searched by SubjectStore.search.
+        """
+
+        condition, parameters = self.getSearchCondition(search_string)
+
+        with self.lock:
+            return self.connection.execute(f"SELECT COUNT(*) FROM subject_search WHERE {condition}", parameters).fetchone()[0]
+
+    @staticmethod
+    def getFileSignature(filename):
+        """
+        Returns a signature of a file which changes whenever the file is rewritten, or None if the file doesn't exist.
+        """
+
+        if(not os.path.isfile(filename)):
+            return None
+
+        file_status = os.stat(filename)
+        return f"{file_status.st_mtime_ns}:{file_status.st_size}"
@@ -0,0 +1,387 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+class UploadJournal:
+    file_extension = ".journal"
+    # The longest time in seconds written entries wait before they are synced to disk.
+    sync_interval = 1.0
+    def __init__(self, manifest_filename, project_id, subject_set_id):
+        """
+        Local record of the progress of uploading a manifest, such that an interrupted upload can resume where it stopped.
+
+        Parameters
+        ----------
+        manifest_filename : str
+            The filename of the manifest being uploaded.
+        project_id : int or str
+            The ID of the project the subjects are created in.
+        subject_set_id : int or str
+            The ID of the subject set the subjects are linked to.
+
+        Notes
+        -----
+        The journal is stored next to the manifest as manifest_filename + ".journal", one JSON entry per line.
+        Each manifest row is keyed by a hash of its contents and its occurrence number, so repeated rows stay distinct.
+        An entry records that a row's subject was created (with its subject ID), that its ID was stamped into its
+        metadata, or that it was linked to a subject set. Created subjects are only reused for the same project and
+        links are only counted for the same subject set. The journal is kept after the upload finishes, so rerunning a
+        finished upload does nothing.
+
+        Entries are flushed as they are written, so they survive the process being killed, and are synced to disk
+        together at most every sync_interval seconds and when the journal is closed (see UploadJournal.close).
+
+        The journal records a signature of the manifest it was last bound to (see UploadJournal.bindManifest). When the
+        manifest is regenerated, the entries of rows which are no longer in it are dropped, so that the subjects of an
+        earlier manifest aren't linked to the subject set or counted as uploaded.
+        """
+
+        self.manifest_filename = manifest_filename
+        self.filename = manifest_filename + self.file_extension
+        self.project_id = str(project_id)
+        self.subject_set_id = str(subject_set_id)
+
+        self.subject_ids = {}
+        self.stamped_row_hashes = set()
+        self.linked_row_hashes = set()
+        self.manifest_signature = None
+
+        # Subjects which have been generated but not yet created, keyed by id() of the subject object.
+        self.pending_row_hashes = {}
+        self.row_occurrences = {}
+
+        self.lock = threading.Lock()
+
+        # Whether the journal file ends in a partially written line, which the next entry must not be appended to.
+        self.partial_line = False
+
+        # The journal file is kept open for appending while entries are written.
+        self.file = None
+        self.last_sync_time = time.monotonic()
+
+        self.load()
+
+    def load(self):
+        """
+        Loads the entries of the journal file, ignoring a partially written last line.
+        """
+
+        if(not os.path.exists(self.filename)):
+            return
+
+        with open(self.filename, "r") as file:
+            for line in file:
+                self.partial_line = not line.endswith("\n")
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if(entry.get("event") == "manifest"):
+                    self.manifest_signature = entry.get("signature")
+                    continue
+
+                row_hash = entry.get("row")
+                if(entry.get("project") != self.project_id):
+                    continue
+
+                if(entry.get("event") == "created"):
+                    self.subject_ids[row_hash] = entry["subject"]
+                elif(entry.get("event") == "stamped"):
+                    self.stamped_row_hashes.add(row_hash)
+                elif(entry.get("event") == "linked" and entry.get("subject_set") == self.subject_set_id):
+                    self.linked_row_hashes.add(row_hash)
+
+    def write(self, entries):
+        """
+        Appends entries to the journal file and flushes them, syncing the journal to disk if sync_interval seconds
+        have passed since it was last synced.
+
+        Parameters
+        ----------
+        entries : list of dict
+            The entries to append.
+        """
+
+        with self.lock:
+            if(self.file is None):
+                self.file = open(self.filename, "a")
+            if(self.partial_line):
+                self.file.write("\n")
+                self.partial_line = False
+            for entry in entries:
+                entry["project"] = self.project_id
+                self.file.write(json.dumps(entry) + "\n")
+            self.file.flush()
+
+            if(time.monotonic() - self.last_sync_time >= self.sync_interval):
+                os.fsync(self.file.fileno())
+                self.last_sync_time = time.monotonic()
+
+    def close(self):
+        """
+        Syncs the written entries to disk and closes the journal file. Writing another entry reopens it.
+        """
+
+        with self.lock:
+            if(self.file is not None):
+                self.file.flush()
+                os.fsync(self.file.fileno())
+                self.file.close()
+                self.file = None
+
+    @staticmethod
+    def getManifestSignature(manifest_filename):
+        """
+        Returns a hash of the contents of a manifest, or None if it doesn't exist.
+        """
+
+        if(not os.path.exists(manifest_filename)):
+            return None
+
+        manifest_hash = hashlib.sha256()
+        with open(manifest_filename, "rb") as file:
+            for block in iter(lambda: file.read(1024 * 1024), b""):
+                manifest_hash.update(block)
+        return manifest_hash.hexdigest()
+
+    def bindManifest(self, data_iterable=None):
+        """
+        Binds the journal to the current contents of the manifest. If the manifest changed since the journal was last
+        bound to it, the entries of rows which are no longer in the manifest are dropped from the journal.
+
+        Parameters
+        ----------
+        data_iterable : Iterable of Data objects, optional
+            The Data objects of the rows of the manifest, in manifest order. By default, the manifest is read.
+
+        Notes
+        -----
+        The subjects of the rows which are still in the manifest, such as the rows a full pipeline uploaded while the
+        manifest was being generated, are kept, and the journal file is rewritten with their entries only.
+        """
+
+        signature = self.getManifestSignature(self.manifest_filename)
+        if(signature is None or signature == self.manifest_signature):
+            return
+
+        if(data_iterable is None):
+            from Dataset import ZooniverseDataset
+            data_iterable = ZooniverseDataset.iterateManifest(self.manifest_filename)
+
+        row_hashes = set(self.iterateRowHashes(data_iterable))
+
+        with self.lock:
+            # The journal file is replaced, so entries are appended to the new file once it's reopened.
+            if(self.file is not None):
+                self.file.close()
+                self.file = None
+
+            kept_lines = []
+            if(os.path.exists(self.filename)):
+                with open(self.filename, "r") as file:
+                    for line in file:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        if(entry.get("row") in row_hashes):
+                            kept_lines.append(json.dumps(entry) + "\n")
+
+            # The journal is replaced in one step, so that an interruption leaves either the old or the new journal.
+            temporary_filename = self.filename + ".tmp"
+            with open(temporary_filename, "w") as file:
+                file.write(json.dumps({"event": "manifest", "signature": signature}) + "\n")
+                file.writelines(kept_lines)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary_filename, self.filename)
+            self.partial_line = False
+
+            self.manifest_signature = signature
+            self.subject_ids = {row_hash: subject_id for row_hash, subject_id in self.subject_ids.items() if row_hash in row_hashes}
+            self.stamped_row_hashes &= row_hashes
+            self.linked_row_hashes &= row_hashes
+
+    @staticmethod
+    def getRowHash(data, occurrence=0):
+        """
+        Hashes a manifest row.
+
+        Parameters
+        ----------
+        data : Data
+            The Data object of the manifest row.
+        occurrence : int, optional
+            How many identical rows came before this one in the manifest.
+
+        Returns
+        -------
+        str
+            The hash of the row.
+        """
+
+        # Hash the values as they are written in a CSV manifest, so a row hashes the same before and after the
+        # manifest is written and read back.
+        row = {}
+        for category, fields in data.getDictionary(reduced=False).items():
+            row[category] = {field_name: ("" if value is None else str(value)) for field_name, value in fields.items()}
+
+        row_hash = hashlib.sha256(json.dumps(row, sort_keys=True).encode("utf-8")).hexdigest()
+        return UploadJournal.getOccurrenceHash(row_hash, occurrence)
+
+    @staticmethod
+    def getOccurrenceHash(row_hash, occurrence):
+        """
+        Returns the hash of a row which came after occurrence identical rows in the manifest.
+        """
+
+        if(occurrence > 0):
+            row_hash = hashlib.sha256(f"{row_hash}:{occurrence}".encode("utf-8")).hexdigest()
+        return row_hash
+
+    @staticmethod
+    def iterateRowHashes(data_iterable):
+        """
+        Hashes the rows of a manifest, as UploadJournal.getNextRowHash does over one pass of the manifest.
+
+        Parameters
+        ----------
+        data_iterable : Iterable of Data objects
+            The Data objects of the rows of the manifest, in manifest order.
+
+        Yields
+        ------
+        str
+            The hash of each row.
+        """
+
+        row_occurrences = {}
+        for data in data_iterable:
+            row_hash = UploadJournal.getRowHash(data)
+            occurrence = row_occurrences.get(row_hash, 0)
+            row_occurrences[row_hash] = occurrence + 1
+            yield UploadJournal.getOccurrenceHash(row_hash, occurrence)
+
+    def getNextRowHash(self, data):
+        """
+        Hashes the next row of the manifest, counting the identical rows which came before it.
+
+        Parameters
+        ----------
+        data : Data
+            The Data object of the manifest row.
+
+        Returns
+        -------
+        str
+            The hash of the row.
+
+        Notes
+        -----
+        The rows must be hashed in manifest order, once per pass over the manifest. Call resetRowOccurrences before
+        another pass.
+        """
+
+        row_hash = self.getRowHash(data)
+        occurrence = self.row_occurrences.get(row_hash, 0)
+        self.row_occurrences[row_hash] = occurrence + 1
+        return self.getOccurrenceHash(row_hash, occurrence)
+
+    def resetRowOccurrences(self):
+        """
+        Resets the counts of identical rows, before another pass over the manifest.
+        """
+
+        self.row_occurrences = {}
+
+    def registerSubject(self, subject, row_hash):
+        """
+        Associates a generated subject with its manifest row until it is created.
+        """
+
+        self.pending_row_hashes[id(subject)] = row_hash
+
+    def popPendingRowHash(self, subject):
+        """
+        Returns the row hash of a generated subject and forgets the association, or None if it was not registered.
+        """
+
+        with self.lock:
+            return self.pending_row_hashes.pop(id(subject), None)
+
+    def isCreated(self, row_hash):
+        """
+        Returns whether the subject of a row was created.
+        """
+
+        return row_hash in self.subject_ids
+
+    def isStamped(self, row_hash):
+        """
+        Returns whether the subject of a row has its ID stamped into its metadata.
+        """
+
+        return row_hash in self.stamped_row_hashes
+
+    def isLinked(self, row_hash):
+        """
+        Returns whether the subject of a row was linked to the subject set.
+        """
+
+        return row_hash in self.linked_row_hashes
+
+    def recordCreated(self, row_hash, subject_id):
+        """
+        Records that the subject of a row was created.
+        """
+
+        self.write([{"event": "created", "row": row_hash, "subject": str(subject_id)}])
+        with self.lock:
+            self.subject_ids[row_hash] = str(subject_id)
+
+    def recordStamped(self, row_hash):
+        """
+        Records that the subject of a row has its ID stamped into its metadata.
+        """
+
+        self.write([{"event": "stamped", "row": row_hash}])
+        with self.lock:
+            self.stamped_row_hashes.add(row_hash)
+
+    def recordLinked(self, row_hashes):
+        """
+        Records that the subjects of rows were linked to the subject set.
+        """
+
+        self.write([{"event": "linked", "row": row_hash, "subject_set": self.subject_set_id} for row_hash in row_hashes])
+        with self.lock:
+            self.linked_row_hashes.update(row_hashes)
+
+    def getUnstampedRows(self):
+        """
+        Returns the row hashes and subject IDs of created subjects which don't have their ID stamped yet.
+
+        Returns
+        -------
+        list of tuples
+            Tuples of the form (row_hash, subject_id).
+        """
+
+        with self.lock:
+            return [(row_hash, subject_id) for row_hash, subject_id in self.subject_ids.items() if row_hash not in self.stamped_row_hashes]
+
+    def getUnlinkedRows(self):
+        """
+        Returns the row hashes and subject IDs of created subjects which aren't linked to the subject set yet.
+
+        Returns
+        -------
+        list of tuples
+            Tuples of the form (row_hash, subject_id).
+        """
+
+        with self.lock:
+            return [(row_hash, subject_id) for row_hash, subject_id in self.subject_ids.items() if row_hash not in self.linked_row_hashes]
@@ -1001,7 +1001,7 @@ class UserInterface:
             top.destroy()
 
             sub_menu = tk.Toplevel(self.window, background=self.background_color_hex)
-            sub_menu.geometry("400x240")
+            sub_menu.geometry(f"400x{180 + 30 * len(input_names)}")
             self.centerWindow(sub_menu)
 
             sub_menu.rowconfigure(list(range(3)), weight=1)
@@ -1043,7 +1043,7 @@ class UserInterface:
         modify_field_value_button.grid(row=1, column=0, pady=10)
 
         # Download Subject Gif
-        download_gif_button = ttk.Button(master=button_frame, text="Download Subject GIF", command=lambda: createActionSubMenu("Download Subject GIF", ["Download Directory", "Speed (ms/frame)"]), style="BW.TButton", takefocus=0)
+        download_gif_button = ttk.Button(master=button_frame, text="Download Subject GIF", command=lambda: createActionSubMenu("Download Subject GIF", ["Download Directory", "Speed (ms/frame)", "ZIP Filename"]), style="BW.TButton", takefocus=0)
         download_gif_button.grid(row=2, column=0, pady=10)
 
         # Remove subjects from subject set
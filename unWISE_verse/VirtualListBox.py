@@ -0,0 +1,231 @@
+import tkinter as tk
+from tkinter import ttk
+
+class VirtualListBox:
+    # The number of rows scrolled by one step of the mouse wheel.
+    wheel_rows = 3
+
+    def __init__(self, master, rows=20, format_row=str, **list_box_kwargs):
+        """
+        List box of IDs which only renders the rows in view, so that it can display any number of IDs.
+
+        Parameters
+        ----------
+        master : tkinter widget
+            The parent of the list box and its scrollbar.
+        rows : int, optional
+            The number of rows in view.
+        format_row : function, optional
+            A function which takes in an ID and returns the text of its row.
+        list_box_kwargs : dict, optional
+            Keyword arguments of the underlying tkinter Listbox, such as its font and width.
+
+        Notes
+        -----
+        The IDs are read from a source, a page at a time, as the list box is scrolled. A source is set with
+        VirtualListBox.setSource, or with VirtualListBox.setIDs for IDs which are already in memory. The selection is
+        a set of IDs, rather than of rows, so it is kept while the list box is scrolled and when its source changes.
+        """
+
+        self.rows = rows
+        self.format_row = format_row
+
+        self.list_box = tk.Listbox(master=master, height=rows, selectmode=tk.EXTENDED, exportselection=False, activestyle="none", takefocus=0, **list_box_kwargs)
+        self.scrollbar = ttk.Scrollbar(master, orient="vertical", command=self.yview)
+
+        self.row_count = 0
+        self.get_rows = lambda offset, limit: []
+        self.top = 0
+        self.visible_ids = []
+
+        # The selected IDs, in the order they were selected, and the index of the row the selection was made from.
+        self.selected_ids = {}
+        self.anchor_index = None
+
+        # The bindings replace those of the Listbox class, which only know about the rows in view.
+        self.list_box.bind("<Button-1>", self.onClick)
+        self.list_box.bind("<Control-Button-1>", self.onControlClick)
+        self.list_box.bind("<Shift-Button-1>", self.onShiftClick)
+        self.list_box.bind("<B1-Motion>", self.onDrag)
+        self.list_box.bind("<MouseWheel>", self.onMouseWheel)
+        self.list_box.bind("<Button-4>", self.onMouseWheel)
+        self.list_box.bind("<Button-5>", self.onMouseWheel)
+
+        self.render()
+
+    def bind(self, sequence, function):
+        self.list_box.bind(sequence, function)
+
+    def setSource(self, row_count, get_rows):
+        """
+        Sets the IDs the list box displays, and scrolls to the top.
+
+        Parameters
+        ----------
+        row_count : int
+            The number of IDs.
+        get_rows : function
+            A function which takes in an offset and a limit and returns that page of the IDs.
+        """
+
+        self.row_count = row_count
+        self.get_rows = get_rows
+        self.top = 0
+        self.anchor_index = None
+        self.render()
+
+    def setIDs(self, ids):
+        """
+        Sets the IDs the list box displays from a list, and scrolls to the top.
+        """
+
+        ids = list(ids)
+        self.setSource(len(ids), lambda offset, limit: ids[offset:offset + limit])
+
+    def size(self):
+        return self.row_count
+
+    def getIDs(self, offset, limit):
+        """
+        Returns a page of the IDs the list box displays, clipped to the IDs which exist.
+        """
+
+        if(offset < 0):
+            limit += offset
+            offset = 0
+        limit = min(limit, self.row_count - offset)
+
+        if(limit <= 0):
+            return []
+        return [str(row_id) for row_id in self.get_rows(offset, limit)]
+
+    def render(self):
+        """
+        Redraws the rows in view and the scrollbar.
+        """
+
+        self.top = max(0, min(self.top, self.row_count - self.rows))
+        self.visible_ids = self.getIDs(self.top, self.rows)
+
+        self.list_box.delete(0, tk.END)
+        if(len(self.visible_ids) > 0):
+            self.list_box.insert(tk.END, *[self.format_row(row_id) for row_id in self.visible_ids])
+
+        for row, row_id in enumerate(self.visible_ids):
+            if(row_id in self.selected_ids):
+                self.list_box.selection_set(row)
+
+        if(self.row_count == 0):
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.top / self.row_count, (self.top + len(self.visible_ids)) / self.row_count)
+
+    def scrollTo(self, top):
+        top = max(0, min(top, self.row_count - self.rows))
+        if(top != self.top):
+            self.top = top
+            self.render()
+
+    def yview(self, *args):
+        # Called by the scrollbar, with the same arguments as the yview method of a Listbox.
+        if(args[0] == "moveto"):
+            self.scrollTo(int(float(args[1]) * self.row_count))
+        elif(args[0] == "scroll"):
+            amount = int(args[1])
+            if(args[2] == "pages"):
+                amount *= self.rows
+            self.scrollTo(self.top + amount)
+
+    def onMouseWheel(self, event):
+        if(event.num == 4 or event.delta > 0):
+            self.scrollTo(self.top - self.wheel_rows)
+        else:
+            self.scrollTo(self.top + self.wheel_rows)
+        return "break"
+
+    def getEventIndex(self, event):
+        # Returns the index of the row under the mouse, or None if no rows are displayed.
+        if(len(self.visible_ids) == 0):
+            return None
+        return self.top + self.list_box.nearest(event.y)
+
+    def onClick(self, event):
+        index = self.getEventIndex(event)
+        if(index is not None):
+            self.anchor_index = index
+            self.selected_ids = dict.fromkeys(self.getIDs(index, 1))
+            self.render()
+        return "break"
+
+    def onControlClick(self, event):
+        index = self.getEventIndex(event)
+        if(index is not None):
+            self.anchor_index = index
+            for row_id in self.getIDs(index, 1):
+                if(row_id in self.selected_ids):
+                    self.selected_ids.pop(row_id)
+                else:
+                    self.selected_ids[row_id] = None
+            self.render()
+        return "break"
+
+    def onShiftClick(self, event):
+        index = self.getEventIndex(event)
+        if(index is not None):
+            if(self.anchor_index is None):
+                self.anchor_index = index
+            self.selectRange(self.anchor_index, index)
+        return "break"
+
+    def onDrag(self, event):
+        if(self.anchor_index is None):
+            return "break"
+
+        # Dragging past the top or bottom of the list box scrolls it.
+        if(event.y < 0):
+            self.scrollTo(self.top - 1)
+        elif(event.y > self.list_box.winfo_height()):
+            self.scrollTo(self.top + 1)
+
+        index = self.getEventIndex(event)
+        if(index is not None):
+            self.selectRange(self.anchor_index, index)
+        return "break"
+
+    def selectRange(self, first_index, last_index):
+        """
+        Selects the IDs between two indices, inclusive, in place of the current selection.
+        """
+
+        first_index, last_index = sorted((first_index, last_index))
+        self.selected_ids = dict.fromkeys(self.getIDs(first_index, last_index - first_index + 1))
+        self.render()
+
+    def selectAll(self):
+        """
+        Selects every ID the list box displays.
+        """
+
+        self.selected_ids = dict.fromkeys(self.getIDs(0, self.row_count))
+        self.render()
+
+    def clearSelection(self):
+        self.selected_ids = {}
+        self.anchor_index = None
+        self.render()
+
+    def deselect(self, ids):
+        """
+        Removes IDs from the selection, such as the IDs of subjects which were deleted.
+        """
+
+        for row_id in ids:
+            self.selected_ids.pop(str(row_id), None)
+        self.render()
+
+    def getSelectedIDs(self):
+        """
+        Returns the selected IDs, in the order they were selected.
+        """
+
+        return list(self.selected_ids)